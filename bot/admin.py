@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import TelegramUser, BlogPost
+from .models import TelegramUser, BlogPost, ArchivedPost, LinkPreview, TagSubscription, SitemapChunk
 
 @admin.register(TelegramUser)
 class TelegramUserAdmin(admin.ModelAdmin):
@@ -10,5 +10,31 @@ class TelegramUserAdmin(admin.ModelAdmin):
 
 @admin.register(BlogPost)
 class BlogPostAdmin(admin.ModelAdmin):
-    list_display = ('author', 'status', 'created_at')
-    list_filter = ('status',)
+    list_display = ('author', 'status', 'created_at', 'deleted_at')
+    list_filter = ('status', ('deleted_at', admin.EmptyFieldListFilter))
+
+    def get_queryset(self, request):
+        # Admin ko soft-deleted posts bhi dikhne chahiye (restore karne ke liye)
+        return BlogPost.all_objects.select_related('author')
+
+@admin.register(ArchivedPost)
+class ArchivedPostAdmin(admin.ModelAdmin):
+    list_display = ('author', 'original_id', 'created_at', 'archived_at')
+    search_fields = ('content',)
+
+@admin.register(LinkPreview)
+class LinkPreviewAdmin(admin.ModelAdmin):
+    list_display = ('url', 'title', 'ok', 'fetched_at')
+    list_filter = ('ok',)
+    search_fields = ('url', 'title')
+
+@admin.register(TagSubscription)
+class TagSubscriptionAdmin(admin.ModelAdmin):
+    list_display = ('tag', 'user', 'created_at')
+    search_fields = ('tag',)
+    list_select_related = ('user',)
+
+@admin.register(SitemapChunk)
+class SitemapChunkAdmin(admin.ModelAdmin):
+    list_display = ('index', 'url_count', 'updated_at')
+    readonly_fields = ('index', 'xml', 'url_count', 'updated_at')
@@ -0,0 +1,113 @@
+from dataclasses import dataclass
+from typing import Any, Optional
+
+# =====================================================
+# CALLBACK DATA ROUTING (inline buttons)
+# =====================================================
+# Naya format: "<version>:<code>:<arg>:<arg>" e.g. "1:vp:42" (Telegram limit 64 bytes).
+# Purane buttons ("viewpost_42") chat history me pade hain, isliye legacy format bhi parse hota hai.
+
+VERSION = "1"
+SEP = ":"
+MAX_CALLBACK_BYTES = 64
+
+# action -> short code. Codes kabhi reuse/change mat karna, purane buttons toot jaayenge.
+ACTION_CODES = {
+    'cancel': 'x',
+    'confirm': 'cf',
+    'pendpage': 'pp',
+    'bulkvip': 'bv',
+    'bulkold': 'bo',
+    'bulkpage': 'bp',
+    'bulkpick': 'bk',
+    'bulkgo': 'bg',
+    'manageuser': 'mu',
+    'viewuser': 'vu',
+    'msguser': 'mg',
+    'userapprove': 'ua',
+    'userblock': 'ub',
+    'viewpost': 'vp',
+    'reqdel': 'rd',
+    'confirmdel': 'cd',
+    'keep': 'kp',
+    'send': 'sn',
+    'approve': 'ap',
+    'reject': 'rj',
+    'discard': 'dc',
+    'withdraw': 'wd',
+    'admindel': 'ad',
+    'remark': 'rm',
+    'schedule': 'sc',
+    'adminedit': 'ae',
+    'edituser': 'eu',
+}
+CODE_ACTIONS = {code: action for action, code in ACTION_CODES.items()}
+
+
+def cb(action, *args):
+    """Build compact callback_data for an inline button."""
+    data = SEP.join([VERSION, ACTION_CODES[action], *map(str, args)])
+    if len(data.encode()) > MAX_CALLBACK_BYTES:
+        raise ValueError(f"callback_data too long: {data!r}")
+    return data
+
+
+def parse(data):
+    """callback_data -> (action, args). Unknown code par action None."""
+    if data.startswith(VERSION + SEP):
+        parts = data.split(SEP)
+        return CODE_ACTIONS.get(parts[1]), parts[2:]
+    # Legacy: "action_arg_arg"
+    parts = data.split('_')
+    return parts[0], parts[1:]
+
+
+# =====================================================
+# ROUTE TABLE
+# =====================================================
+
+@dataclass(frozen=True)
+class Route:
+    handler: Any
+    perm: Optional[str] = None      # None | 'admin' | 'owner' (post author)
+    prefetch: Optional[str] = None  # None | 'post' (post + author, 1 query) | 'user'
+    args: tuple = (int,)            # Zaroori args ke types (pehla int = target_id)
+
+    def coerce_args(self, raw):
+        """Raw string args -> typed list. Kam ya galat args par ValueError (handler tak nahi pahunchte)."""
+        if len(raw) < len(self.args):
+            raise ValueError(f"expected {len(self.args)} args, got {len(raw)}")
+        return [kind(value) for kind, value in zip(self.args, raw)] + list(raw[len(self.args):])
+
+
+ROUTES = {}
+
+
+def route(action, perm=None, prefetch=None, args=(int,)):
+    """Decorator: handler ko `action` ke liye register karo (permission, prefetch aur args ke saath)."""
+    if action not in ACTION_CODES:
+        raise KeyError(f"Unknown callback action {action!r}")
+    if perm == 'owner' and prefetch != 'post':
+        raise ValueError("'owner' routes need prefetch='post'")
+    if prefetch and args[:1] != (int,):
+        raise ValueError("prefetch routes need an int target id")
+
+    def decorator(fn):
+        ROUTES[action] = Route(fn, perm, prefetch, tuple(args))
+        return fn
+    return decorator
+
+
+@dataclass
+class Call:
+    """Ek button press ka context jo route handler ko milta hai."""
+    query: Any
+    user_id: int
+    is_admin: bool
+    args: list
+    post: Any = None
+    user: Any = None
+
+    @property
+    def target_id(self):
+        return self.args[0]  # Dispatcher Route.args se pehle hi int bana chuka hai
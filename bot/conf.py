@@ -0,0 +1,55 @@
+from dataclasses import dataclass
+from functools import lru_cache
+
+from decouple import config
+
+# =====================================================
+# BOT SETTINGS (env se ek hi baar resolve)
+# =====================================================
+# Handlers me baar baar config('ADMIN_ID') karna har call par env/.env lookup + cast hai.
+# Yahan sab ek frozen object me aa jaata hai; process restart par hi badalta hai.
+
+
+@dataclass(frozen=True)
+class BotSettings:
+    admin_id: str
+    token: str
+    base_url: str
+    website_url: str
+    admin_digest_seconds: int
+    admin_digest_max: int
+    bulk_reject_days: int
+    drafts_per_minute: float
+    draft_burst: int
+    commands_per_minute: float
+    command_burst: int
+    outbox_global_rate: float
+    outbox_chat_rate: float
+    outbox_max_retries: int
+
+    def is_admin(self, user_id):
+        return str(user_id) == self.admin_id
+
+
+@lru_cache(maxsize=None)
+def get_settings():
+    return BotSettings(
+        admin_id=str(config('ADMIN_ID')),
+        # Web process ko token nahi chahiye; run_bot khud check karta hai
+        token=config('TELEGRAM_TOKEN', default=''),
+        # Offline load test ke liye fake API par point kar sakte hain (python manage.py fake_telegram)
+        base_url=config('TELEGRAM_BASE_URL', default='https://api.telegram.org/bot'),
+        website_url=config('WEBSITE_URL', default='https://chatpress-web.onrender.com'),
+        # 0 = har submission par alag alert
+        admin_digest_seconds=config('ADMIN_DIGEST_SECONDS', default=0, cast=int),
+        # Itni submissions jama ho jaayein to window khatam hone ka wait nahi
+        admin_digest_max=config('ADMIN_DIGEST_MAX', default=25, cast=int),
+        bulk_reject_days=config('BULK_REJECT_DAYS', default=7, cast=int),
+        drafts_per_minute=config('DRAFTS_PER_MINUTE', default=5, cast=float),
+        draft_burst=config('DRAFT_BURST', default=5, cast=int),
+        commands_per_minute=config('COMMANDS_PER_MINUTE', default=20, cast=float),
+        command_burst=config('COMMAND_BURST', default=10, cast=int),
+        outbox_global_rate=config('OUTBOX_GLOBAL_RATE', default=25, cast=float),
+        outbox_chat_rate=config('OUTBOX_CHAT_RATE', default=1, cast=float),
+        outbox_max_retries=config('OUTBOX_MAX_RETRIES', default=5, cast=int),
+    )
@@ -0,0 +1,260 @@
+import json
+import random
+import threading
+import time
+from collections import Counter, defaultdict, deque
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import parse_qs
+
+# =====================================================
+# FAKE TELEGRAM BOT API (offline load testing)
+# =====================================================
+# run_bot ko TELEGRAM_BASE_URL=http://127.0.0.1:8081/bot se yahan point karo. Server har
+# outbound call record karta hai, getUpdates par synthetic updates deta hai aur
+# `error_rate` ke hisaab se 429 (Too Many Requests) bhi simulate karta hai.
+
+BOT_USER = {'id': 1000000, 'is_bot': True, 'first_name': 'FakeRealmBot', 'username': 'fake_realm_bot'}
+
+# Ye methods chat ko "reply" maane jaate hain (latency measure karne ke liye)
+REPLY_METHODS = {'sendMessage', 'editMessageText', 'sendPhoto'}
+# Sirf inhi par 429 inject hota hai (real API me bhi flood limits yahin lagti hain)
+LIMITED_METHODS = {'sendMessage', 'editMessageText', 'sendPhoto'}
+
+
+class FakeBotAPI:
+    def __init__(self, host='127.0.0.1', port=8081, error_rate=0.0, retry_after=1, max_poll_timeout=10):
+        self.error_rate = error_rate
+        self.retry_after = retry_after
+        self.max_poll_timeout = max_poll_timeout
+
+        self.calls = []                      # (timestamp, method, params)
+        self.method_counts = Counter()
+        self.throttled = Counter()           # method -> 429s served
+        self.latencies = []                  # update inject -> first reply (seconds)
+        self.keyboards = {}                  # chat_id -> last inline keyboard (list of callback_data)
+
+        self._updates = []
+        self._next_update_id = 1
+        self._next_message_id = 1
+        self._awaiting_reply = defaultdict(deque)  # chat_id -> inject timestamps
+        self._cond = threading.Condition()
+
+        api = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                api._handle(self)
+
+            do_GET = do_POST
+
+            def log_message(self, *args):
+                pass  # Load test me har request print nahi karni
+
+        self.server = ThreadingHTTPServer((host, port), Handler)
+        self.server.daemon_threads = True
+
+    @property
+    def base_url(self):
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}/bot"
+
+    def start(self):
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+
+    # =====================================================
+    # UPDATE INJECTION
+    # =====================================================
+
+    def _push(self, chat_id, payload):
+        with self._cond:
+            update = {'update_id': self._next_update_id, **payload}
+            self._next_update_id += 1
+            self._updates.append(update)
+            self._awaiting_reply[chat_id].append(time.monotonic())
+            self._cond.notify_all()
+        return update
+
+    def _user(self, user_id):
+        return {'id': user_id, 'is_bot': False, 'first_name': f"Load{user_id}", 'username': f"load{user_id}"}
+
+    def inject_text(self, user_id, text):
+        msg = {
+            'message_id': self._new_message_id(),
+            'date': int(time.time()),
+            'chat': {'id': user_id, 'type': 'private'},
+            'from': self._user(user_id),
+            'text': text,
+        }
+        if text.startswith('/'):
+            command = text.split()[0]
+            msg['entities'] = [{'type': 'bot_command', 'offset': 0, 'length': len(command)}]
+        return self._push(user_id, {'message': msg})
+
+    def inject_callback(self, user_id, data):
+        message = {
+            'message_id': self._new_message_id(),
+            'date': int(time.time()),
+            'chat': {'id': user_id, 'type': 'private'},
+            'from': BOT_USER,
+            'text': '…',
+        }
+        payload = {
+            'callback_query': {
+                'id': str(random.getrandbits(48)),
+                'from': self._user(user_id),
+                'chat_instance': str(user_id),
+                'message': message,
+                'data': data,
+            }
+        }
+        return self._push(user_id, payload)
+
+    def _new_message_id(self):
+        with self._cond:
+            self._next_message_id += 1
+            return self._next_message_id
+
+    # =====================================================
+    # REQUEST HANDLING
+    # =====================================================
+
+    def _params(self, request):
+        length = int(request.headers.get('Content-Length') or 0)
+        body = request.rfile.read(length) if length else b''
+        ctype = request.headers.get('Content-Type', '')
+        if 'application/json' in ctype:
+            return json.loads(body or b'{}')
+        if 'multipart/form-data' in ctype:
+            return {}  # Files ka content record nahi karte
+        return {k: v[0] for k, v in parse_qs(body.decode()).items()}
+
+    def _handle(self, request):
+        method = request.path.rsplit('/', 1)[-1]
+        params = self._params(request)
+        now = time.monotonic()
+        with self._cond:
+            self.calls.append((now, method, params))
+            self.method_counts[method] += 1
+
+        if method in LIMITED_METHODS and self.error_rate and random.random() < self.error_rate:
+            with self._cond:
+                self.throttled[method] += 1
+            return self._reply(request, {
+                'ok': False, 'error_code': 429,
+                'description': f"Too Many Requests: retry after {self.retry_after}",
+                'parameters': {'retry_after': self.retry_after},
+            }, status=429)
+
+        handler = getattr(self, f"api_{method}", None)
+        result = handler(params) if handler else True
+        if method in REPLY_METHODS:
+            self._record_reply(params, now)
+        return self._reply(request, {'ok': True, 'result': result})
+
+    def _reply(self, request, payload, status=200):
+        body = json.dumps(payload).encode()
+        request.send_response(status)
+        request.send_header('Content-Type', 'application/json')
+        request.send_header('Content-Length', str(len(body)))
+        request.end_headers()
+        request.wfile.write(body)
+
+    def _record_reply(self, params, now):
+        chat_id = _int(params.get('chat_id'))
+        markup = params.get('reply_markup')
+        with self._cond:
+            if chat_id is not None and self._awaiting_reply.get(chat_id):
+                self.latencies.append(now - self._awaiting_reply[chat_id].popleft())
+            if chat_id is not None and markup:
+                markup = json.loads(markup) if isinstance(markup, str) else markup
+                buttons = [b.get('callback_data') for row in markup.get('inline_keyboard', []) for b in row]
+                self.keyboards[chat_id] = [b for b in buttons if b]
+
+    # --- Bot API methods ---
+    def api_getMe(self, params):
+        return BOT_USER
+
+    def api_getUpdates(self, params):
+        offset = _int(params.get('offset')) or 0
+        limit = min(_int(params.get('limit')) or 100, 100)
+        timeout = min(float(params.get('timeout') or 0), self.max_poll_timeout)
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            # Confirmed updates hata do (offset se pehle waale)
+            self._updates = [u for u in self._updates if u['update_id'] >= offset]
+            while not self._updates and time.monotonic() < deadline:
+                self._cond.wait(deadline - time.monotonic())
+            return self._updates[:limit]
+
+    def api_sendMessage(self, params):
+        return self._message(params)
+
+    def api_editMessageText(self, params):
+        return self._message(params, message_id=_int(params.get('message_id')))
+
+    def api_getUserProfilePhotos(self, params):
+        return {'total_count': 0, 'photos': []}
+
+    def _message(self, params, message_id=None):
+        chat_id = _int(params.get('chat_id')) or 0
+        return {
+            'message_id': message_id or self._new_message_id(),
+            'date': int(time.time()),
+            'chat': {'id': chat_id, 'type': 'private'},
+            'from': BOT_USER,
+            'text': params.get('text', ''),
+        }
+
+    # =====================================================
+    # REPORT
+    # =====================================================
+
+    def report(self, started_at):
+        elapsed = max(time.monotonic() - started_at, 1e-9)
+        with self._cond:
+            calls = list(self.calls)
+            latencies = sorted(self.latencies)
+
+        sends = [(ts, p) for ts, m, p in calls if m == 'sendMessage' and ts >= started_at]
+        # Flood check: kisi bhi chat ko 1 second window me max kitne messages gaye
+        per_chat = defaultdict(list)
+        for ts, p in sends:
+            per_chat[p.get('chat_id')].append(ts)
+        worst_burst = 0
+        for stamps in per_chat.values():
+            window = deque()
+            for ts in stamps:
+                window.append(ts)
+                while ts - window[0] > 1.0:
+                    window.popleft()
+                worst_burst = max(worst_burst, len(window))
+
+        return {
+            'elapsed_s': round(elapsed, 2),
+            'updates_injected': self._next_update_id - 1,
+            'replies': len(latencies),
+            'reply_p50_ms': _pct(latencies, 50),
+            'reply_p95_ms': _pct(latencies, 95),
+            'send_message_per_s': round(len(sends) / elapsed, 2),
+            'max_msgs_per_chat_per_s': worst_burst,
+            'throttled_429': sum(self.throttled.values()),
+            'methods': dict(self.method_counts),
+        }
+
+
+def _int(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _pct(values, pct):
+    if not values:
+        return None
+    idx = min(len(values) - 1, int(round(pct / 100 * (len(values) - 1))))
+    return round(values[idx] * 1000, 1)
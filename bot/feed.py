@@ -0,0 +1,80 @@
+from decouple import config
+from django.conf import settings
+from django.core.cache import cache
+
+from .models import BlogPost
+from .previews import preview_queryset
+
+# =====================================================
+# HOMEPAGE FEED CACHE
+# =====================================================
+# Home feed (posts + link previews) Django cache me rehta hai. Publish/delete par
+# invalidate, aur bot ka warm-up job expire hone se pehle dobara bhar deta hai.
+# Bot aur web alag processes hain: warm-up/invalidation tabhi web tak pahunchte hain
+# jab CACHES shared ho (DB_CACHE=True). LocMem par bot ka invalidate gunicorn workers tak
+# nahi pahunchta (deleted post TTL tak dikhta rehta), isliye wahan feed cache band hai.
+
+FEED_CACHE_KEY = 'feed:home'
+FEED_CACHE_SECONDS = config('FEED_CACHE_SECONDS', default=30, cast=int)  # 0 = off
+LOCAL_CACHES = (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+)
+
+
+def feed_queryset():
+    # Pinned posts sabse upar, fir baaki latest posts
+    return BlogPost.objects.filter(status='PUBLISHED').select_related('author').order_by('-is_pinned', '-created_at')
+
+
+def build_home_feed():
+    """DB se (posts, previews) - link preview cards sirf DB se, koi bahar fetch nahi."""
+    posts = list(feed_queryset())
+    previews = {p.url: p for p in preview_queryset(posts)}
+    return posts, previews
+
+
+async def abuild_home_feed():
+    posts = [post async for post in feed_queryset()]
+    previews = {p.url: p async for p in preview_queryset(posts)}
+    return posts, previews
+
+
+def cache_enabled():
+    return bool(FEED_CACHE_SECONDS) and cache_is_shared()
+
+
+def home_feed():
+    if not cache_enabled():
+        return build_home_feed()
+    feed = cache.get(FEED_CACHE_KEY)
+    if feed is None:
+        feed = build_home_feed()
+        cache.set(FEED_CACHE_KEY, feed, FEED_CACHE_SECONDS)
+    return feed
+
+
+async def ahome_feed():
+    # ASGI views ke liye (thread hop ke bina async ORM)
+    if not cache_enabled():
+        return await abuild_home_feed()
+    feed = await cache.aget(FEED_CACHE_KEY)
+    if feed is None:
+        feed = await abuild_home_feed()
+        await cache.aset(FEED_CACHE_KEY, feed, FEED_CACHE_SECONDS)
+    return feed
+
+
+def warm_feed():
+    """Cache ko taaza feed se bharo (web ka agla request DB tak nahi jaata). Returns post count."""
+    feed = build_home_feed()
+    cache.set(FEED_CACHE_KEY, feed, FEED_CACHE_SECONDS)
+    return len(feed[0])
+
+
+def invalidate_feed():
+    cache.delete(FEED_CACHE_KEY)
+
+
+def cache_is_shared():
+    return settings.CACHES['default']['BACKEND'] not in LOCAL_CACHES
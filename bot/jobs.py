@@ -0,0 +1,193 @@
+import os
+import re
+import logging
+from datetime import datetime, timedelta
+
+from decouple import config
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .feed import invalidate_feed
+from .models import TelegramUser, BlogPost, ArchivedPost, LinkPreview
+from .moderation import publish_posts
+from .unfurl import UNFURL_TTL_DAYS, UNFURL_RETRY_HOURS
+
+logger = logging.getLogger(__name__)
+
+# =====================================================
+# BACKGROUND JOBS (run_bot ke JobQueue se chalte hain)
+# =====================================================
+# Scheduled posts DB me (status=SCHEDULED + publish_at) rehte hain, isliye restart ke
+# baad bhi kuch nahi khota: publish job har minute due posts utha leta hai.
+
+PUBLISH_CHECK_SECONDS = config('PUBLISH_CHECK_SECONDS', default=60, cast=int)
+CLEANUP_INTERVAL_SECONDS = config('CLEANUP_INTERVAL_SECONDS', default=6 * 3600, cast=int)
+FEED_WARM_SECONDS = config('FEED_WARM_SECONDS', default=25, cast=int)  # 0 = off (FEED_CACHE_SECONDS se kam rakho)
+DRAFT_TTL_DAYS = config('DRAFT_TTL_DAYS', default=30, cast=int)
+REJECTED_TTL_DAYS = config('REJECTED_TTL_DAYS', default=30, cast=int)
+DELETED_RETENTION_DAYS = config('DELETED_RETENTION_DAYS', default=7, cast=int)
+ARCHIVE_AFTER_DAYS = config('ARCHIVE_AFTER_DAYS', default=365, cast=int)
+MEDIA_GRACE_HOURS = 24  # Naye uploads ko orphan mat samjho (save abhi chal raha ho sakta hai)
+BATCH_SIZE = 500
+
+_WHEN_PATTERN = re.compile(r'^(\d+)\s*([mhd])$')
+
+
+def parse_when(text):
+    """'30m' / '2h' / '1d' / 'YYYY-MM-DD HH:MM' (local time) -> aware datetime, warna None."""
+    text = text.strip().lower()
+    match = _WHEN_PATTERN.match(text)
+    if match:
+        amount, unit = int(match.group(1)), match.group(2)
+        delta = {'m': timedelta(minutes=amount), 'h': timedelta(hours=amount), 'd': timedelta(days=amount)}[unit]
+        return timezone.now() + delta
+    try:
+        naive = datetime.strptime(text, '%Y-%m-%d %H:%M')
+    except ValueError:
+        return None
+    return timezone.make_aware(naive)
+
+
+def publish_due_posts():
+    """Jin SCHEDULED posts ka time aa gaya unhe publish karo. Returns (post_ids, [(author, count)])."""
+    ids = list(
+        BlogPost.objects.filter(status='SCHEDULED', publish_at__lte=timezone.now())
+        .values_list('id', flat=True)[:BATCH_SIZE]
+    )
+    if not ids:
+        return [], []
+    return ids, publish_posts(ids, statuses=('SCHEDULED',))
+
+
+def _purge_in_batches(qs):
+    # Ek bada DELETE table lock na kare, isliye BATCH_SIZE rows ek baar me
+    total = 0
+    while True:
+        ids = list(qs.values_list('id', flat=True)[:BATCH_SIZE])
+        if not ids:
+            return total
+        BlogPost.all_objects.filter(id__in=ids).delete()
+        total += len(ids)
+
+
+def purge_stale_drafts(days=DRAFT_TTL_DAYS):
+    """Purane (abandoned) DRAFT rows hatao - `days` se koi change nahi (remark waale drafts abhi taaze hain)."""
+    cutoff = timezone.now() - timedelta(days=days)
+    return _purge_in_batches(BlogPost.all_objects.filter(status='DRAFT', updated_at__lt=cutoff))
+
+
+def purge_rejected_and_deleted(rejected_days=REJECTED_TTL_DAYS, deleted_days=DELETED_RETENTION_DAYS):
+    """Purane REJECTED posts aur retention ke baad soft-deleted rows permanently hatao."""
+    now = timezone.now()
+    rejected = _purge_in_batches(
+        BlogPost.all_objects.filter(status='REJECTED', updated_at__lt=now - timedelta(days=rejected_days))
+    )
+    deleted = _purge_in_batches(BlogPost.all_objects.filter(deleted_at__lt=now - timedelta(days=deleted_days)))
+    return rejected + deleted
+
+
+def archive_old_posts(days=ARCHIVE_AFTER_DAYS):
+    """Purane published posts ArchivedPost me shift karo (pinned posts feed me hi rehte hain)."""
+    cutoff = timezone.now() - timedelta(days=days)
+    total = 0
+    while True:
+        with transaction.atomic():
+            batch = list(
+                BlogPost.objects.select_for_update()
+                .filter(status='PUBLISHED', is_pinned=False, created_at__lt=cutoff)
+                .order_by('id')[:BATCH_SIZE]
+            )
+            if not batch:
+                return total
+            ArchivedPost.objects.bulk_create([
+                ArchivedPost(
+                    original_id=p.id, author_id=p.author_id, content=p.content, image=p.image.name,
+                    is_anonymous=p.is_anonymous, is_pinned=p.is_pinned,
+                    is_announcement=p.is_announcement, created_at=p.created_at, updated_at=p.updated_at,
+                )
+                for p in batch
+            ], ignore_conflicts=True)
+            BlogPost.all_objects.filter(id__in=[p.id for p in batch]).delete()
+        invalidate_feed()
+        total += len(batch)
+
+
+def _url_in_use(url):
+    # Koi live published ya archived post abhi bhi ye link dikhata hai?
+    return (
+        BlogPost.objects.filter(status='PUBLISHED', content__contains=url).exists()
+        or ArchivedPost.objects.filter(content__contains=url).exists()
+    )
+
+
+def expire_previews(days=UNFURL_TTL_DAYS, retry_hours=UNFURL_RETRY_HOURS):
+    """
+    Purane previews (ok: `days`, failed: `retry_hours`) sambhalo. Returns (deleted, urls_to_refetch).
+
+    Jo link kisi post me abhi bhi hai uska row rehta hai (card gayab na ho) aur URL dobara
+    fetch ke liye lauta diya jaata hai; baaki rows hata do (thumbnails purge_orphaned_media saaf karta hai).
+    """
+    now = timezone.now()
+    expired = LinkPreview.objects.filter(
+        Q(ok=True, fetched_at__lt=now - timedelta(days=days)) |
+        Q(ok=False, fetched_at__lt=now - timedelta(hours=retry_hours))
+    ).order_by('fetched_at').values_list('id', 'url')[:BATCH_SIZE]
+
+    refetch, unused = [], []
+    for preview_id, url in expired:
+        (refetch if _url_in_use(url) else unused).append((preview_id, url))
+    deleted, _ = LinkPreview.objects.filter(id__in=[pid for pid, _ in unused]).delete()
+    return deleted, [url for _, url in refetch]
+
+
+# (model, file field) jo media/ ki files refer karte hain
+MEDIA_REFERENCES = (
+    (BlogPost.all_objects, 'image'),
+    (ArchivedPost.objects, 'image'),
+    (TelegramUser.objects, 'profile_pic'),
+    (LinkPreview.objects, 'image'),
+)
+
+
+def _is_referenced(name):
+    return any(manager.filter(**{field: name}).exists() for manager, field in MEDIA_REFERENCES)
+
+
+def purge_orphaned_media():
+    """posts/, avatars/ aur previews/ me woh files hatao jinhe koi row refer nahi karti."""
+    referenced = set()
+    for manager, field in MEDIA_REFERENCES:
+        referenced |= set(manager.exclude(**{field: ''}).exclude(**{field: None}).values_list(field, flat=True))
+    cutoff = timezone.now() - timedelta(hours=MEDIA_GRACE_HOURS)
+
+    removed = 0
+    for folder in ('posts', 'avatars', 'previews'):
+        for name in _walk(folder):
+            if name in referenced:
+                continue
+            try:
+                if default_storage.get_modified_time(name) > cutoff:
+                    continue
+                # Content-addressed files reuse hoti hain: snapshot ke baad koi naya row
+                # isi file ko point kar raha ho to mat hatao (delete se theek pehle check)
+                if _is_referenced(name):
+                    continue
+                default_storage.delete(name)
+                removed += 1
+            except OSError:
+                logger.warning("Could not remove orphaned media %s", name, exc_info=True)
+    return removed
+
+
+def _walk(folder):
+    try:
+        dirs, files = default_storage.listdir(folder)
+    except FileNotFoundError:
+        return
+    for f in files:
+        yield f"{folder}/{f}"
+    for d in dirs:
+        yield from _walk(os.path.join(folder, d))
+
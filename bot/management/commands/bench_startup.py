@@ -0,0 +1,80 @@
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# Fresh interpreter me wahi chalta hai jo `manage.py run_bot` polling se pehle karta hai
+BOOT_CODE = """
+import os, django
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'core.settings')
+django.setup()
+import bot.management.commands.run_bot
+"""
+
+
+class Command(BaseCommand):
+    help = 'Measures run_bot cold-start import time with `python -X importtime`'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--runs', type=int, default=5)
+        parser.add_argument('--top', type=int, default=15, help='Slowest top-level imports to show')
+        parser.add_argument('--record', default='', help='Append the result as a JSON line to this file')
+        parser.add_argument('--max-ms', type=float, default=0, help='Fail if median wall time is above this')
+
+    def handle(self, *args, **opts):
+        walls, imports, modules = [], [], {}
+        for _ in range(opts['runs']):
+            start = time.perf_counter()
+            proc = subprocess.run(
+                [sys.executable, '-X', 'importtime', '-c', BOOT_CODE],
+                cwd=settings.BASE_DIR, env=os.environ.copy(), capture_output=True, text=True,
+            )
+            walls.append((time.perf_counter() - start) * 1000)
+            if proc.returncode:
+                raise CommandError(proc.stderr.strip().splitlines()[-1])
+
+            top_level = _parse_importtime(proc.stderr)
+            imports.append(sum(top_level.values()) / 1000)
+            for name, us in top_level.items():
+                modules.setdefault(name, []).append(us / 1000)
+
+        slowest = sorted(((statistics.median(v), k) for k, v in modules.items()), reverse=True)[:opts['top']]
+        result = {
+            'at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'runs': opts['runs'],
+            'wall_ms': round(statistics.median(walls), 1),
+            'import_ms': round(statistics.median(imports), 1),
+            'top': {name: round(ms, 1) for ms, name in slowest},
+        }
+
+        self.stdout.write(f"wall (median): {result['wall_ms']} ms | imports: {result['import_ms']} ms")
+        for name, ms in result['top'].items():
+            self.stdout.write(f"  {ms:>8.1f} ms  {name}")
+
+        if opts['record']:
+            with open(opts['record'], 'a') as f:
+                f.write(json.dumps(result) + '\n')
+        if opts['max_ms'] and result['wall_ms'] > opts['max_ms']:
+            raise CommandError(f"Cold start {result['wall_ms']} ms > budget {opts['max_ms']} ms")
+
+
+def _parse_importtime(stderr):
+    """`import time: self | cumulative | name` lines -> {top-level module: cumulative us}."""
+    top_level = {}
+    for line in stderr.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        parts = line[len('import time:'):].split('|')
+        if len(parts) != 3 or not parts[1].strip().isdigit():
+            continue  # Header line
+        name = parts[2].rstrip()
+        # Nested imports extra indent ke saath aate hain; sirf top-level gino (double count nahi)
+        if name.startswith('  '):
+            continue
+        top_level[name.strip()] = top_level.get(name.strip(), 0) + int(parts[1])
+    return top_level
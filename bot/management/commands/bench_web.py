@@ -0,0 +1,122 @@
+import http.client
+import json
+import os
+import signal
+import subprocess
+import sys
+import threading
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# Load mix: (path, weight). Seeded dataset ke tags par (seed_realm dekho)
+PATHS = [('/', 6), ('/tag/cultivation/', 3), ('/api/search/?q=dantian', 1)]
+
+
+class Command(BaseCommand):
+    help = 'Compares WSGI (gthread) vs ASGI (uvicorn) gunicorn profiles: throughput and p95 latency'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--profiles', default='wsgi,asgi')
+        parser.add_argument('--port', type=int, default=8765)
+        parser.add_argument('--concurrency', type=int, default=16, help='Parallel keep-alive clients')
+        parser.add_argument('--duration', type=float, default=20, help='Seconds per profile')
+        parser.add_argument('--warmup', type=float, default=3)
+        parser.add_argument('--workers', type=int, default=2, help='WEB_CONCURRENCY for both profiles')
+
+    def handle(self, *args, **opts):
+        results = {}
+        for profile in opts['profiles'].split(','):
+            self.stdout.write(f"--- {profile} ---")
+            server = self.start_server(profile, opts)
+            try:
+                self.run_load(opts, opts['warmup'])  # Connections/caches garam karo
+                results[profile] = self.run_load(opts, opts['duration'])
+            finally:
+                server.send_signal(signal.SIGTERM)
+                server.wait(timeout=30)
+            self.stdout.write(json.dumps(results[profile]))
+
+        self.stdout.write(f"\n{'profile':<8}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'errors':>8}")
+        for profile, r in results.items():
+            self.stdout.write(f"{profile:<8}{r['rps']:>10}{r['p50_ms']:>10}{r['p95_ms']:>10}{r['errors']:>8}")
+
+    def start_server(self, profile, opts):
+        env = {
+            **os.environ,
+            'WEB_PROFILE': profile,
+            'PORT': str(opts['port']),
+            'WEB_CONCURRENCY': str(opts['workers']),
+        }
+        server = subprocess.Popen(
+            [sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py'],
+            cwd=settings.BASE_DIR, env=env,
+        )
+        deadline = time.monotonic() + 30
+        while time.monotonic() < deadline:
+            if server.poll() is not None:
+                raise CommandError(f"gunicorn ({profile}) exited with {server.returncode}")
+            try:
+                conn = http.client.HTTPConnection('127.0.0.1', opts['port'], timeout=5)
+                conn.request('GET', '/', headers={'Host': 'localhost'})
+                conn.getresponse().read()
+                return server
+            except OSError:
+                time.sleep(0.3)
+        server.kill()
+        raise CommandError(f"gunicorn ({profile}) did not start on port {opts['port']}")
+
+    def run_load(self, opts, duration):
+        paths = [path for path, weight in PATHS for _ in range(weight)]
+        latencies = []
+        errors = [0]
+        lock = threading.Lock()
+        stop_at = time.monotonic() + duration
+
+        def client(offset):
+            conn = http.client.HTTPConnection('127.0.0.1', opts['port'], timeout=30)
+            i = offset
+            while time.monotonic() < stop_at:
+                path = paths[i % len(paths)]
+                i += 1
+                start = time.perf_counter()
+                try:
+                    conn.request('GET', path, headers={'Host': 'localhost'})
+                    resp = conn.getresponse()
+                    resp.read()
+                    ok = resp.status == 200
+                except (OSError, http.client.HTTPException):
+                    ok = False
+                    conn.close()  # Agli request naya connection kholegi
+                elapsed = time.perf_counter() - start
+                with lock:
+                    if ok:
+                        latencies.append(elapsed)
+                    else:
+                        errors[0] += 1
+            conn.close()
+
+        started = time.monotonic()
+        threads = [threading.Thread(target=client, args=(n,)) for n in range(opts['concurrency'])]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        elapsed = time.monotonic() - started
+
+        latencies.sort()
+        return {
+            'requests': len(latencies),
+            'errors': errors[0],
+            'rps': round(len(latencies) / elapsed, 1),
+            'p50_ms': _pct(latencies, 50),
+            'p95_ms': _pct(latencies, 95),
+        }
+
+
+def _pct(values, pct):
+    if not values:
+        return None
+    idx = min(len(values) - 1, int(round(pct / 100 * (len(values) - 1))))
+    return round(values[idx] * 1000, 1)
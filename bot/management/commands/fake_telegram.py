@@ -0,0 +1,75 @@
+import json
+import random
+import time
+
+from django.core.management.base import BaseCommand
+
+from bot.conf import get_settings
+from bot.models import TelegramUser
+from bot.fake_telegram import FakeBotAPI
+
+# Synthetic traffic ka mix (weights)
+ACTIONS = [('text', 50), ('press', 20), ('drafts', 15), ('myposts', 10), ('start', 5)]
+FIRST_USER_ID = 900000000
+
+
+class Command(BaseCommand):
+    help = 'Runs a fake Telegram Bot API server and replays synthetic traffic (offline load test)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--port', type=int, default=8081)
+        parser.add_argument('--users', type=int, default=50, help='Synthetic users')
+        parser.add_argument('--rate', type=float, default=10, help='Updates per second')
+        parser.add_argument('--duration', type=float, default=30, help='Seconds of traffic')
+        parser.add_argument('--drain', type=float, default=10, help='Seconds to wait for replies after traffic stops')
+        parser.add_argument('--error-rate', type=float, default=0.0, help='Fraction of sends answered with 429')
+        parser.add_argument('--retry-after', type=int, default=1)
+        parser.add_argument('--seed-users', action='store_true', help='Create approved TelegramUser rows for the synthetic users')
+        parser.add_argument('--broadcast', default='', help='Admin sends this /broadcast and confirms it')
+
+    def handle(self, *args, **opts):
+        api = FakeBotAPI(port=opts['port'], error_rate=opts['error_rate'], retry_after=opts['retry_after']).start()
+        user_ids = [FIRST_USER_ID + i for i in range(opts['users'])]
+
+        if opts['seed_users']:
+            for uid in user_ids:
+                TelegramUser.objects.update_or_create(
+                    telegram_id=str(uid), defaults={'first_name': f"Load{uid}", 'is_approved': True}
+                )
+
+        self.stdout.write(self.style.SUCCESS(f"Fake Bot API on {api.base_url}"))
+        self.stdout.write(f"Start the bot with: TELEGRAM_BASE_URL={api.base_url} python manage.py run_bot")
+        self.stdout.write("Waiting for the bot to poll...")
+        while not api.method_counts['getUpdates']:
+            time.sleep(0.2)
+
+        started = time.monotonic()
+        admin_id = int(get_settings().admin_id)
+        broadcast_pending = bool(opts['broadcast'])
+        if broadcast_pending:
+            api.inject_text(admin_id, f"/broadcast {opts['broadcast']}")
+
+        names, weights = zip(*ACTIONS)
+        interval = 1.0 / opts['rate']
+        next_at = started
+        while time.monotonic() - started < opts['duration']:
+            # Admin ka confirm button aate hi daba do
+            if broadcast_pending and api.keyboards.get(admin_id):
+                api.inject_callback(admin_id, api.keyboards.pop(admin_id)[0])
+                broadcast_pending = False
+
+            uid = random.choice(user_ids)
+            action = random.choices(names, weights)[0]
+            if action == 'press' and api.keyboards.get(uid):
+                api.inject_callback(uid, random.choice(api.keyboards[uid]))
+            elif action in ('drafts', 'myposts', 'start'):
+                api.inject_text(uid, f"/{action}")
+            else:
+                api.inject_text(uid, f"Load test scroll {random.randint(1, 10 ** 6)} #loadtest")
+
+            next_at += interval
+            time.sleep(max(0.0, next_at - time.monotonic()))
+
+        time.sleep(opts['drain'])
+        self.stdout.write(json.dumps(api.report(started), indent=2))
+        api.stop()
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from bot import sitemap
+from bot.models import SitemapChunk
+
+
+class Command(BaseCommand):
+    help = 'Rebuilds changed sitemap chunks from published and archived posts'
+
+    def handle(self, *args, **opts):
+        changed = sitemap.rebuild_all()
+        total = SitemapChunk.objects.count()
+        self.stdout.write(f"Sitemap: {changed} chunk(s) updated, {total} total")
@@ -1,22 +1,44 @@
-import requests
 import time
 import os
+import html
+import logging
 import threading
-from http.server import HTTPServer, BaseHTTPRequestHandler
 
-from django.core.management.base import BaseCommand
+from django.core.management.base import BaseCommand, CommandError
 from django.core.files.base import ContentFile
+from django.utils import timezone
 from asgiref.sync import sync_to_async
-from decouple import config
 
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
-from telegram.ext import ApplicationBuilder, ContextTypes, CommandHandler, MessageHandler, CallbackQueryHandler, filters
-from telegram.error import BadRequest
+from telegram.ext import ApplicationBuilder, ApplicationHandlerStop, ContextTypes, CommandHandler, MessageHandler, CallbackQueryHandler, filters
+from telegram.error import TelegramError
 
 from bot.models import TelegramUser, BlogPost
+from bot.outbox import Outbox
+from bot.unfurl import Unfurler
+from bot import moderation, jobs, callbacks, user_cache, subscriptions, sitemap, feed
+from bot.callbacks import cb, route, Call
+from bot.cache import TTLCache
+from bot.conf import get_settings
+from bot.ratelimit import make_limiter
+from bot.tracing import traced, TracedRequest
+from bot import tracing, metrics
+
+logger = logging.getLogger(__name__)
+
+# Env ek hi baar padho (bot/conf.py)
+SETTINGS = get_settings()
 
 # --- GLOBAL STATE (For Multi-step flows like Broadcast/Edit) ---
 USER_STATE = {}
+BULK_SELECTION = {}  # admin_id -> set of post ids (multi-select approve)
+
+PENDING_PAGE_SIZE = 8
+
+# --- SPAM THROTTLE (per telegram_id) ---
+DRAFT_LIMITER = make_limiter('draft', SETTINGS.drafts_per_minute, SETTINGS.draft_burst)
+COMMAND_LIMITER = make_limiter('command', SETTINGS.commands_per_minute, SETTINGS.command_burst)
+THROTTLE_WARNED = TTLCache(maxsize=10000, ttl=60)  # "Slow down" sirf ek baar per minute
 
 class Command(BaseCommand):
     help = 'Runs the Telegram Bot'
@@ -25,19 +47,23 @@ class Command(BaseCommand):
         # =====================================================
         # 1. DUMMY SERVER (Keeps Render Awake)
         # =====================================================
-        class SimpleHTTP(BaseHTTPRequestHandler):
-            def do_GET(self):
-                self.send_response(200)
-                self.end_headers()
-                self.wfile.write(b'I am alive! Bot is running.')
-            def do_HEAD(self):
-                self.send_response(200)
-                self.end_headers()
-
+        # http.server / requests yahan import nahi: startup par sirf bot chahiye,
+        # ye dono threads me baad me load hote hain (cold start par pehla reply jaldi)
         def start_dummy_server():
+            from http.server import HTTPServer, BaseHTTPRequestHandler
+
+            class SimpleHTTP(BaseHTTPRequestHandler):
+                def do_GET(self):
+                    self.send_response(200)
+                    self.end_headers()
+                    self.wfile.write(b'I am alive! Bot is running.')
+                def do_HEAD(self):
+                    self.send_response(200)
+                    self.end_headers()
+
             port = int(os.environ.get("PORT", 10000))
             server = HTTPServer(('0.0.0.0', port), SimpleHTTP)
-            print(f"🌍 Dummy server running on port {port}")
+            logger.info("🌍 Dummy server running on port %s", port)
             server.serve_forever()
 
         # 🔥 CRITICAL START COMMAND
@@ -47,33 +73,54 @@ class Command(BaseCommand):
         # 2. WATCHDOG (Monitors Website)
         # =====================================================
         def start_watchdog():
-            admin_id = str(config('ADMIN_ID'))
-            website_url = "https://chatpress-web.onrender.com" 
-            bot_token = config('TELEGRAM_TOKEN')
-            
-            print("🐶 Watchdog started...")
+            logger.info("🐶 Watchdog started...")
             
             while True:
                 time.sleep(300) # Check every 5 mins
+                import requests  # Pehli check tak bot already chal raha hota hai
                 try:
-                    response = requests.get(website_url, timeout=30)
+                    response = requests.get(SETTINGS.website_url, timeout=30)
                     if response.status_code != 200:
                         raise Exception(f"Status: {response.status_code}")
                 except Exception as e:
+                    logger.warning("Watchdog: website check failed: %s", e)
                     # Notify Admin (No HTML parse mode to avoid errors on raw exception text)
                     try:
-                        requests.get(f"https://api.telegram.org/bot{bot_token}/sendMessage?chat_id={admin_id}&text=🚨 **ALERT: WEBSITE DOWN!** \n\nError: {str(e)}\n\nhttps://stats.uptimerobot.com/U6FUKEOUqh\n\nhttps://dashboard.render.com/web/srv-d5tmh0vfte5s73fkfuog")
-                    except: pass
+                        requests.get(f"{SETTINGS.base_url}{SETTINGS.token}/sendMessage?chat_id={SETTINGS.admin_id}&text=🚨 **ALERT: WEBSITE DOWN!** \n\nError: {str(e)}\n\nhttps://stats.uptimerobot.com/U6FUKEOUqh\n\nhttps://dashboard.render.com/web/srv-d5tmh0vfte5s73fkfuog", timeout=30)
+                    except requests.RequestException:
+                        logger.exception("Watchdog: could not alert admin")
 
         threading.Thread(target=start_watchdog, daemon=True).start()
 
         # =====================================================
         # 3. BOT APPLICATION
         # =====================================================
-        token = config('TELEGRAM_TOKEN')
-        application = ApplicationBuilder().token(token).build()
+        if not SETTINGS.token:
+            raise CommandError("TELEGRAM_TOKEN is not set")
+        # Submissions jo agle digest me jaayengi
+        self.digest_post_ids = []
+
+        # Outbound notifications queue (rate limited, retries on 429)
+        self.outbox = Outbox(
+            global_rate=SETTINGS.outbox_global_rate,
+            chat_rate=SETTINGS.outbox_chat_rate,
+            max_retries=SETTINGS.outbox_max_retries,
+        )
+        # Link previews (approve ke baad background me fetch)
+        self.unfurler = Unfurler()
+        application = (
+            ApplicationBuilder().token(SETTINGS.token)
+            .base_url(SETTINGS.base_url)
+            .request(TracedRequest(connection_pool_size=256))
+            .post_init(self.post_init)
+            .post_stop(self.post_stop)
+            .build()
+        )
 
         # --- Handlers ---
+        # Throttle (group -1: baaki sab handlers se pehle chalta hai)
+        application.add_handler(MessageHandler(filters.COMMAND, self.throttle_commands), group=-1)
+
         # Public
         application.add_handler(CommandHandler('start', self.start))
         application.add_handler(CommandHandler('help', self.start))
@@ -83,24 +130,104 @@ class Command(BaseCommand):
         # User
         application.add_handler(CommandHandler('drafts', self.my_drafts)) 
         application.add_handler(CommandHandler('myposts', self.my_published)) 
+        application.add_handler(CommandHandler('follow', self.follow_tags))
+        application.add_handler(CommandHandler('unfollow', self.unfollow_tags))
 
         # Admin
         application.add_handler(CommandHandler('pending', self.admin_pending))
         application.add_handler(CommandHandler('users', self.admin_users_list))
         application.add_handler(CommandHandler('broadcast', self.admin_broadcast))
         application.add_handler(CommandHandler('notify', self.admin_notify_user))
+        application.add_handler(CommandHandler('stats', self.admin_stats))
         
         # Core
         application.add_handler(MessageHandler(filters.TEXT | filters.PHOTO, self.handle_message))
         application.add_handler(CallbackQueryHandler(self.handle_button))
+        application.add_error_handler(self.on_error)
 
         self.stdout.write(self.style.SUCCESS('Bot started polling...'))
         application.run_polling()
 
+    # ==========================
+    # LIFECYCLE
+    # ==========================
+
+    async def post_init(self, application):
+        self.outbox.start(application.bot)
+        self.unfurler.start()
+
+        # Background jobs (scheduled publish, cleanup, feed warm-up)
+        jq = application.job_queue
+        if jq is None:
+            logger.warning("⚠️ JobQueue unavailable (pip install APScheduler) - background jobs disabled")
+            return
+        jq.run_repeating(self.job_publish_due, interval=jobs.PUBLISH_CHECK_SECONDS, first=5, name='publish_due')
+        jq.run_repeating(self.job_cleanup, interval=jobs.CLEANUP_INTERVAL_SECONDS, first=120, name='cleanup')
+        # Warm-up sirf shared cache par (LocMem par feed cache hi band hai)
+        if jobs.FEED_WARM_SECONDS and feed.cache_enabled():
+            jq.run_repeating(self.job_warm_feed, interval=jobs.FEED_WARM_SECONDS, first=30, name='warm_feed')
+
+    async def post_stop(self, application):
+        # Application.shutdown() se pehle: bot ka HTTP client abhi band nahi hua, outbox drain ho sakta hai
+        await self.unfurler.stop()
+        await self.outbox.stop()
+
+    async def on_error(self, update, context: ContextTypes.DEFAULT_TYPE):
+        # Handler ka koi bhi unhandled exception yahan aata hai (trace line me error class already hai)
+        logger.error("Unhandled error (%s)", "handler" if update else "polling/job", exc_info=context.error)
+
+    # ==========================
+    # BACKGROUND JOBS
+    # ==========================
+
+    @traced
+    async def job_publish_due(self, context: ContextTypes.DEFAULT_TYPE):
+        post_ids, results = await sync_to_async(jobs.publish_due_posts)()
+        await self.after_publish(post_ids, results)
+
+    @traced
+    async def job_cleanup(self, context: ContextTypes.DEFAULT_TYPE):
+        drafts = await sync_to_async(jobs.purge_stale_drafts)()
+        purged = await sync_to_async(jobs.purge_rejected_and_deleted)()
+        archived = await sync_to_async(jobs.archive_old_posts)()
+        previews, refetch = await sync_to_async(jobs.expire_previews)()
+        self.unfurler.refresh(refetch)  # Live posts ke purane/failed previews background me dobara
+        media = await sync_to_async(jobs.purge_orphaned_media)()
+        # Incremental updates ke baad bhi drift (admin se hard delete etc.) ho to yahan theek
+        chunks = await sync_to_async(sitemap.rebuild_all)()
+        if drafts or purged or archived or previews or refetch or media or chunks:
+            logger.info("🧹 Cleanup: %s stale drafts, %s rejected/deleted purged, %s archived, %s unused previews removed, %s previews refetching, %s orphaned files removed, %s sitemap chunks fixed", drafts, purged, archived, previews, len(refetch), media, chunks)
+
+    @traced
+    async def job_warm_feed(self, context: ContextTypes.DEFAULT_TYPE):
+        await sync_to_async(feed.warm_feed)()
+
+    # ==========================
+    # THROTTLING
+    # ==========================
+
+    async def allowed(self, limiter, update: Update, kind):
+        user_id = update.effective_user.id
+        if SETTINGS.is_admin(user_id): return True
+        ok = await sync_to_async(limiter.allow)(user_id) if limiter.blocking else limiter.allow(user_id)
+        if ok: return True
+
+        metrics.incr(f'throttle.{kind}.rejected')
+        # Reply bhi quota khaata hai, isliye warning sirf ek baar
+        if THROTTLE_WARNED.get(user_id) is None:
+            THROTTLE_WARNED.set(user_id, True)
+            await update.message.reply_text("⏳ Slow down! Too many messages, try again in a minute.")
+        return False
+
+    async def throttle_commands(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        if not await self.allowed(COMMAND_LIMITER, update, 'command'):
+            raise ApplicationHandlerStop
+
     # ==========================
     # COMMAND FUNCTIONS
     # ==========================
 
+    @traced
     async def rules(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         rules_text = (
             "<b>📜 Posting Guidelines:</b>\n"
@@ -112,9 +239,10 @@ class Command(BaseCommand):
         )
         await update.message.reply_text(rules_text, parse_mode='HTML')
 
+    @traced
     async def start(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         user = update.effective_user
-        admin_id = str(config('ADMIN_ID'))
+        admin_id = SETTINGS.admin_id
         
         if context.args and context.args[0] == 'web_post':
             await update.message.reply_text("👋 <b>Welcome from the Web Realm!</b>\nSend your text/photo.", parse_mode='HTML')
@@ -134,14 +262,13 @@ class Command(BaseCommand):
                     def save_avatar():
                         tg_user.profile_pic.save(f"{user.id}_avatar.jpg", ContentFile(file_byte_array), save=True)
                     await sync_to_async(save_avatar)()
-            except: pass
+            except (TelegramError, OSError):
+                logger.warning("Avatar download failed for %s", user.id, exc_info=True)
 
             # Notify Admin
-            kb = [[InlineKeyboardButton("✅ Approve", callback_data=f"userapprove_{tg_user.id}"),
-                   InlineKeyboardButton("❌ Block", callback_data=f"userblock_{tg_user.id}")]]
-            try:
-                await context.bot.send_message(chat_id=admin_id, text=f"🚨 <b>New User!</b>\nName: {user.first_name}", reply_markup=InlineKeyboardMarkup(kb), parse_mode='HTML')
-            except: pass
+            kb = [[InlineKeyboardButton("✅ Approve", callback_data=cb('userapprove', tg_user.id)),
+                   InlineKeyboardButton("❌ Block", callback_data=cb('userblock', tg_user.id))]]
+            self.outbox.send(admin_id, f"🚨 <b>New User!</b>\nName: {user.first_name}", reply_markup=InlineKeyboardMarkup(kb), parse_mode='HTML')
 
         status = "Approved ✅" if tg_user.is_approved else "Pending ⏳"
         menu = (
@@ -150,30 +277,66 @@ class Command(BaseCommand):
             "/drafts - View Drafts\n"
             "/myposts - View Published\n"
             "/anon - Toggle Anonymous\n"
+            "/follow #tag - Get new posts for a tag\n"
             "/rules - Guidelines"
         )
         if str(user.id) == admin_id:
-            menu += "\n\n<b>👮‍♂️ Admin:</b>\n/pending, /users, /broadcast, /notify"
+            menu += "\n\n<b>👮‍♂️ Admin:</b>\n/pending, /users, /broadcast, /notify, /stats"
 
         await update.message.reply_text(menu, parse_mode='HTML')
 
+    @traced
     async def toggle_anon(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         user = update.effective_user
-        try:
-            tg_user = await sync_to_async(TelegramUser.objects.get)(telegram_id=user.id)
-            tg_user.is_anonymous_mode = not tg_user.is_anonymous_mode
-            await sync_to_async(tg_user.save)()
-            state = "👻 ON" if tg_user.is_anonymous_mode else "👤 OFF"
-            await update.message.reply_text(f"Anonymous Mode: {state}")
-        except: pass
+        tg_user = await sync_to_async(user_cache.get_user)(user.id)
+        if tg_user is None: return
+        # Sirf ek UPDATE, read cache se
+        anon = not tg_user.is_anonymous_mode
+        await sync_to_async(TelegramUser.objects.filter(id=tg_user.id).update)(is_anonymous_mode=anon)
+        user_cache.invalidate(user.id)
+        state = "👻 ON" if anon else "👤 OFF"
+        await update.message.reply_text(f"Anonymous Mode: {state}")
+
+    # --- TAG SUBSCRIPTIONS ---
+    @traced
+    async def follow_tags(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        tg_user = await sync_to_async(user_cache.get_user)(update.effective_user.id)
+        if tg_user is None: return
+        if not tg_user.is_approved:
+            await update.message.reply_text("🚫 Not approved.")
+            return
+        tags = [t for t in map(subscriptions.normalize_tag, context.args) if t]
+
+        if not tags:
+            current = await sync_to_async(subscriptions.followed_tags)(tg_user.id)
+            listing = " ".join(f"#{t}" for t in current) if current else "nothing yet"
+            await update.message.reply_text(f"🔔 Following: {listing}\n\nUsage: /follow #tag [#tag ...]\n/unfollow #tag")
+            return
+
+        added = await sync_to_async(subscriptions.follow)(tg_user.id, tags)
+        if added:
+            await update.message.reply_text(f"🔔 Following {' '.join('#' + t for t in added)}. New posts with these tags will be sent here.")
+        else:
+            await update.message.reply_text(f"ℹ️ Nothing new to follow (max {subscriptions.MAX_FOLLOWS} tags).")
+
+    @traced
+    async def unfollow_tags(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        tg_user = await sync_to_async(user_cache.get_user)(update.effective_user.id)
+        if tg_user is None: return
+        tags = [t for t in map(subscriptions.normalize_tag, context.args) if t]
+        if not tags:
+            await update.message.reply_text("⚠️ Usage: /unfollow #tag [#tag ...]")
+            return
+        removed = await sync_to_async(subscriptions.unfollow)(tg_user.id, tags)
+        await update.message.reply_text(f"🔕 Unfollowed {removed} tag(s).")
 
     # --- LIST VIEW: DRAFTS ---
+    @traced
     async def my_drafts(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         user = update.effective_user
-        try:
-            tg_user = await sync_to_async(TelegramUser.objects.get)(telegram_id=user.id)
-            drafts = await sync_to_async(list)(BlogPost.objects.filter(author=tg_user, status__in=['DRAFT', 'PENDING', 'REJECTED']).order_by('-created_at'))
-        except: return
+        tg_user = await sync_to_async(user_cache.get_user)(user.id)
+        if tg_user is None: return
+        drafts = await sync_to_async(list)(BlogPost.objects.filter(author_id=tg_user.id, status__in=['DRAFT', 'PENDING', 'SCHEDULED', 'REJECTED']).order_by('-created_at'))
 
         if not drafts:
             await update.message.reply_text("📭 No drafts found.")
@@ -181,20 +344,20 @@ class Command(BaseCommand):
 
         keyboard = []
         for post in drafts:
-            icon = "📝" if post.status == 'DRAFT' else ("⏳" if post.status == 'PENDING' else "❌")
+            icon = {'DRAFT': "📝", 'PENDING': "⏳", 'SCHEDULED': "⏰"}.get(post.status, "❌")
             # Limit button text length
             btn_text = f"{icon} {post.content[:20]}..."
-            keyboard.append([InlineKeyboardButton(btn_text, callback_data=f"viewpost_{post.id}")])
+            keyboard.append([InlineKeyboardButton(btn_text, callback_data=cb('viewpost', post.id))])
 
         await update.message.reply_text("📂 <b>Your Drafts:</b>", reply_markup=InlineKeyboardMarkup(keyboard), parse_mode='HTML')
 
     # --- LIST VIEW: PUBLISHED ---
+    @traced
     async def my_published(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         user = update.effective_user
-        try:
-            tg_user = await sync_to_async(TelegramUser.objects.get)(telegram_id=user.id)
-            posts = await sync_to_async(list)(BlogPost.objects.filter(author=tg_user, status='PUBLISHED').order_by('-created_at'))
-        except: return
+        tg_user = await sync_to_async(user_cache.get_user)(user.id)
+        if tg_user is None: return
+        posts = await sync_to_async(list)(BlogPost.objects.filter(author_id=tg_user.id, status='PUBLISHED').order_by('-created_at'))
 
         if not posts:
             await update.message.reply_text("📭 No published posts.")
@@ -203,31 +366,135 @@ class Command(BaseCommand):
         keyboard = []
         for post in posts:
             btn_text = f"✅ {post.content[:20]}..."
-            keyboard.append([InlineKeyboardButton(btn_text, callback_data=f"viewpost_{post.id}")])
+            keyboard.append([InlineKeyboardButton(btn_text, callback_data=cb('viewpost', post.id))])
 
         await update.message.reply_text("🌟 <b>Published Scrolls:</b>", reply_markup=InlineKeyboardMarkup(keyboard), parse_mode='HTML')
 
     # --- ADMIN: PENDING LIST ---
+    @traced
     async def admin_pending(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         user = update.effective_user
-        if str(user.id) != str(config('ADMIN_ID')): return
+        if not SETTINGS.is_admin(user.id): return
 
-        pending = await sync_to_async(list)(BlogPost.objects.filter(status='PENDING').select_related('author').order_by('created_at'))
-        if not pending: 
+        total, keyboard = await sync_to_async(self.pending_keyboard)(0)
+        if not total: 
             await update.message.reply_text("✅ No pending approvals.")
             return
 
+        await update.message.reply_text(f"🚨 <b>Pending: {total}</b>", reply_markup=InlineKeyboardMarkup(keyboard), parse_mode='HTML')
+
+    def pending_keyboard(self, page, selected=None):
+        # Ek page ke pending posts + ⬅️/➡️ buttons (bada backlog ek keyboard me nahi aata)
+        # `selected` diya ho to multi-select mode: post tap karne par tick/untick
+        qs = BlogPost.objects.filter(status='PENDING')
+        total = qs.count()
+        start = page * PENDING_PAGE_SIZE
+        posts = qs.select_related('author').order_by('created_at')[start:start + PENDING_PAGE_SIZE]
+        page_prefix = "pendpage" if selected is None else "bulkpage"
+
         keyboard = []
-        for post in pending:
-            btn_text = f"⏳ {post.author.first_name}: {post.content[:15]}..."
-            keyboard.append([InlineKeyboardButton(btn_text, callback_data=f"viewpost_{post.id}")])
-            
-        await update.message.reply_text(f"🚨 <b>Pending: {len(pending)}</b>", reply_markup=InlineKeyboardMarkup(keyboard), parse_mode='HTML')
+        for post in posts:
+            if selected is None:
+                btn_text = f"⏳ {post.author.first_name}: {post.content[:15]}..."
+                keyboard.append([InlineKeyboardButton(btn_text, callback_data=cb('viewpost', post.id))])
+            else:
+                tick = "✅" if post.id in selected else "⬜"
+                btn_text = f"{tick} {post.author.first_name}: {post.content[:15]}..."
+                keyboard.append([InlineKeyboardButton(btn_text, callback_data=cb('bulkpick', post.id, page))])
+
+        nav = []
+        if page > 0:
+            nav.append(InlineKeyboardButton("⬅️ Prev", callback_data=cb(page_prefix, page - 1)))
+        if start + PENDING_PAGE_SIZE < total:
+            nav.append(InlineKeyboardButton("➡️ Next", callback_data=cb(page_prefix, page + 1)))
+        if nav:
+            keyboard.append(nav)
+
+        # Bulk actions
+        if selected is None:
+            if total:
+                keyboard.append([InlineKeyboardButton("⭐ Approve VIPs", callback_data=cb('bulkvip')),
+                                 InlineKeyboardButton("☑️ Select", callback_data=cb('bulkpage', 0))])
+                keyboard.append([InlineKeyboardButton(f"🧹 Reject > {SETTINGS.bulk_reject_days}d old", callback_data=cb('bulkold'))])
+        else:
+            keyboard.append([InlineKeyboardButton(f"🚀 Approve {len(selected)}", callback_data=cb('bulkgo')),
+                             InlineKeyboardButton("❌ Cancel", callback_data=cb('cancel'))])
+        return total, keyboard
+
+    async def after_publish(self, post_ids, results):
+        # Har publish path (approve, bulk, scheduled) yahi call karta hai
+        self.notify_published(results)
+        if not results: return
+        self.unfurler.submit(post_ids)
+        followers = await sync_to_async(subscriptions.tag_subscribers)(post_ids)
+        self.notify_followers(followers)
+
+    def notify_followers(self, followers):
+        # Ek user = ek message; Outbox per-chat + global rate limit sambhalta hai
+        for telegram_id, matches in followers:
+            lines = []
+            for post, tags in matches[:5]:
+                author = "Hidden Cultivator" if post.is_anonymous else post.author.first_name
+                snippet = html.escape((post.content or '')[:80])
+                lines.append(f"{' '.join('#' + t for t in tags)} • <b>{html.escape(author or '')}</b>: {snippet}")
+            if len(matches) > 5:
+                lines.append(f"…and {len(matches) - 5} more")
+            head = "🔔 <b>New scroll in a tag you follow</b>" if len(matches) == 1 else f"🔔 <b>{len(matches)} new scrolls in tags you follow</b>"
+            self.outbox.send(telegram_id, f"{head}\n\n" + "\n".join(lines) + f"\n\n🌐 {SETTINGS.website_url}", parse_mode='HTML')
+        if followers:
+            metrics.incr('fanout.notified', len(followers))
+
+    def notify_published(self, results):
+        # Har author ko ek hi message, chahe kitne bhi posts publish hue hon
+        for author, n in results:
+            head = "🎉 <b>Published!</b>" if n == 1 else f"🎉 <b>{n} posts published!</b>"
+            self.outbox.send(author.telegram_id, f"{head}\nRank: {author.get_rank()}", parse_mode='HTML')
+
+    def notify_rejected(self, results):
+        for author, ids in results:
+            head = "❌ <b>Post Rejected.</b>" if len(ids) == 1 else f"❌ <b>{len(ids)} posts rejected.</b>"
+            id_text = ", ".join(f"#{pid}" for pid in ids[:20]) + (f" (+{len(ids) - 20} more)" if len(ids) > 20 else "")
+            self.outbox.send(author.telegram_id, f"{head}\nID: {id_text}\nCheck /drafts.", parse_mode='HTML')
+
+    # --- ADMIN: SUBMISSION DIGEST (JobQueue) ---
+    def queue_digest(self, context, post_id):
+        self.digest_post_ids.append(post_id)
+        scheduled = context.job_queue.get_jobs_by_name('admin_digest')
+        if len(self.digest_post_ids) >= SETTINGS.admin_digest_max:
+            # Batch bhar gaya: window ka wait kiye bina abhi bhejo
+            for job in scheduled:
+                job.schedule_removal()
+            context.job_queue.run_once(self.flush_digest, when=0, name='admin_digest')
+        elif not scheduled:
+            # Window ka pehla submission hi job schedule karta hai, baaki bas list me judte hain
+            context.job_queue.run_once(self.flush_digest, when=SETTINGS.admin_digest_seconds, name='admin_digest')
+
+    @traced
+    async def flush_digest(self, context: ContextTypes.DEFAULT_TYPE):
+        post_ids, self.digest_post_ids = self.digest_post_ids, []
+        if not post_ids: return
+
+        # Jo beech me withdraw ho gaye wo digest me na aayein
+        new_posts = await sync_to_async(list)(
+            BlogPost.objects.filter(id__in=post_ids, status='PENDING').select_related('author').order_by('created_at')
+        )
+        if not new_posts: return
+        total, keyboard = await sync_to_async(self.pending_keyboard)(0)
+
+        lines = [f"• {p.author.first_name}: {p.content[:40]}..." for p in new_posts[:10]]
+        if len(new_posts) > 10:
+            lines.append(f"…and {len(new_posts) - 10} more")
+        self.outbox.send(
+            SETTINGS.admin_id,
+            f"🗞️ <b>Submission Digest</b>\nNew: {len(new_posts)} | Pending: {total}\n\n" + "\n".join(lines),
+            reply_markup=InlineKeyboardMarkup(keyboard), parse_mode='HTML'
+        )
 
     # --- ADMIN: USER LIST ---
+    @traced
     async def admin_users_list(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         user = update.effective_user
-        if str(user.id) != str(config('ADMIN_ID')): return
+        if not SETTINGS.is_admin(user.id): return
 
         users = await sync_to_async(list)(TelegramUser.objects.all().order_by('-id'))
         
@@ -235,14 +502,15 @@ class Command(BaseCommand):
         for u in users:
             status = "✅" if u.is_approved else "⏳"
             btn_text = f"{status} {u.first_name} | {u.get_rank()}"
-            keyboard.append([InlineKeyboardButton(btn_text, callback_data=f"manageuser_{u.id}")])
+            keyboard.append([InlineKeyboardButton(btn_text, callback_data=cb('manageuser', u.id))])
             
         await update.message.reply_text(f"👥 <b>Users: {len(users)}</b>", reply_markup=InlineKeyboardMarkup(keyboard), parse_mode='HTML')
 
     # --- ADMIN: BROADCAST (With Confirm) ---
+    @traced
     async def admin_broadcast(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         user = update.effective_user
-        if str(user.id) != str(config('ADMIN_ID')): return
+        if not SETTINGS.is_admin(user.id): return
 
         msg = " ".join(context.args)
         if not msg:
@@ -252,30 +520,46 @@ class Command(BaseCommand):
         count = await sync_to_async(TelegramUser.objects.count)()
         USER_STATE[user.id] = {'action': 'CONFIRM_BROADCAST', 'msg': msg}
         
-        kb = [[InlineKeyboardButton("✅ Yes, Send", callback_data="confirm_broadcast"),
-               InlineKeyboardButton("❌ Cancel", callback_data="cancel_action")]]
+        kb = [[InlineKeyboardButton("✅ Yes, Send", callback_data=cb('confirm', 'broadcast')),
+               InlineKeyboardButton("❌ Cancel", callback_data=cb('cancel'))]]
         
         await update.message.reply_text(f"📢 <b>Confirm Broadcast?</b>\n\nMsg: {msg}\nTo: {count} Users", reply_markup=InlineKeyboardMarkup(kb), parse_mode='HTML')
 
     # --- ADMIN: NOTIFY (With Confirm) ---
+    @traced
     async def admin_notify_user(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         user = update.effective_user
-        if str(user.id) != str(config('ADMIN_ID')): return
+        if not SETTINGS.is_admin(user.id): return
 
         try:
             target_id = context.args[0]
             msg = " ".join(context.args[1:])
             USER_STATE[user.id] = {'action': 'CONFIRM_NOTIFY', 'target_id': target_id, 'msg': msg}
             
-            kb = [[InlineKeyboardButton("✅ Send", callback_data="confirm_notify"),
-                   InlineKeyboardButton("❌ Cancel", callback_data="cancel_action")]]
+            kb = [[InlineKeyboardButton("✅ Send", callback_data=cb('confirm', 'notify')),
+                   InlineKeyboardButton("❌ Cancel", callback_data=cb('cancel'))]]
             await update.message.reply_text(f"🔔 <b>Confirm DM?</b>\n\nTo ID: {target_id}\nMsg: {msg}", reply_markup=InlineKeyboardMarkup(kb), parse_mode='HTML')
-        except:
+        except IndexError:
             await update.message.reply_text("⚠️ Usage: /notify [user_id] [message]")
 
+    # --- ADMIN: BOT STATS (Outbox delivery metrics) ---
+    @traced
+    async def admin_stats(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        user = update.effective_user
+        if not SETTINGS.is_admin(user.id): return
+
+        stats = metrics.snapshot()
+        sent = stats.get('outbox.sent', 0)
+        avg_latency = stats.get('outbox.latency_ms', 0) // sent if sent else 0
+        lines = [f"{name}: {value}" for name, value in sorted(stats.items()) if name != 'outbox.latency_ms']
+        lines.append(f"outbox.avg_latency_ms: {avg_latency}")
+        lines.append(f"outbox.depth: {self.outbox.depth()}")
+        await update.message.reply_text("📊 <b>Bot Stats</b>\n\n" + "\n".join(lines), parse_mode='HTML')
+
     # ==========================
     # MESSAGE HANDLER
     # ==========================
+    @traced
     async def handle_message(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         user = update.effective_user
         text = update.message.text or update.message.caption or ""
@@ -293,8 +577,9 @@ class Command(BaseCommand):
                     post.status = 'DRAFT'
                     await sync_to_async(post.save)()
                     await update.message.reply_text("✅ Post returned with remark.")
-                    await context.bot.send_message(post.author.telegram_id, f"↩️ <b>Post Returned:</b>\nRemark: {text}", parse_mode='HTML')
-                except: pass
+                    self.outbox.send(post.author.telegram_id, f"↩️ <b>Post Returned:</b>\nRemark: {text}", parse_mode='HTML')
+                except BlogPost.DoesNotExist:
+                    await update.message.reply_text("❌ Post not found.")
             
             elif action == 'ADMIN_EDIT':
                 target_id = state['target_id']
@@ -303,7 +588,8 @@ class Command(BaseCommand):
                     post.content = text
                     await sync_to_async(post.save)()
                     await update.message.reply_text("✅ Post updated.")
-                except: pass
+                except BlogPost.DoesNotExist:
+                    await update.message.reply_text("❌ Post not found.")
 
             elif action == 'USER_EDIT':
                 target_id = state['target_id']
@@ -314,24 +600,42 @@ class Command(BaseCommand):
                     await sync_to_async(post.save)()
                     await update.message.reply_text("✅ Draft updated.")
                     # Show the updated draft with Send button
-                    kb = [[InlineKeyboardButton("🚀 Send", callback_data=f"send_{post.id}")]]
+                    kb = [[InlineKeyboardButton("🚀 Send", callback_data=cb('send', post.id))]]
                     await update.message.reply_text(f"📄 <b>Preview:</b>\n{post.content[:100]}...", reply_markup=InlineKeyboardMarkup(kb), parse_mode='HTML')
-                except: pass
+                except BlogPost.DoesNotExist:
+                    await update.message.reply_text("❌ Post not found.")
             
+            elif action == 'SCHEDULE_POST':
+                target_id = state['target_id']
+                when = jobs.parse_when(text)
+                if when is None or when <= timezone.now():
+                    await update.message.reply_text("⚠️ Use 30m / 2h / 1d or a future YYYY-MM-DD HH:MM. Tap ⏰ Schedule again.")
+                elif await sync_to_async(moderation.schedule_post)(target_id, when):
+                    local = timezone.localtime(when).strftime('%d %b %H:%M')
+                    await update.message.reply_text(f"⏰ Post {target_id} scheduled for {local}.")
+                    post = await sync_to_async(BlogPost.objects.select_related('author').get)(id=target_id)
+                    self.outbox.send(post.author.telegram_id, f"⏰ <b>Post #{post.id} approved!</b>\nGoes live on {local}.", parse_mode='HTML')
+                else:
+                    await update.message.reply_text("⚠️ Post is no longer pending.")
+
             elif action == 'DM_USER':
                 target_id = state['target_id']
                 try:
                     await context.bot.send_message(chat_id=target_id, text=f"🔔 <b>Admin Message:</b>\n\n{text}", parse_mode='HTML')
                     await update.message.reply_text("✅ Sent.")
-                except: await update.message.reply_text("❌ Failed.")
+                except TelegramError as e:
+                    logger.info("DM to %s failed: %s", target_id, e)
+                    await update.message.reply_text("❌ Failed.")
 
             del USER_STATE[user.id]
             return
 
         # 2. New Post Creation
-        try:
-            tg_user = await sync_to_async(TelegramUser.objects.get)(telegram_id=user.id)
-        except:
+        if not await self.allowed(DRAFT_LIMITER, update, 'draft'):
+            return
+
+        tg_user = await sync_to_async(user_cache.get_user)(user.id)
+        if tg_user is None:
             await update.message.reply_text("/start first.")
             return
 
@@ -344,235 +648,325 @@ class Command(BaseCommand):
             return
 
         new_post = await sync_to_async(BlogPost.objects.create)(
-            author=tg_user, content=text, image=None, status='DRAFT', is_anonymous=tg_user.is_anonymous_mode
+            author_id=tg_user.id, content=text, image=None, status='DRAFT', is_anonymous=tg_user.is_anonymous_mode
         )
         
         if tg_user.is_anonymous_mode:
-            tg_user.is_anonymous_mode = False
-            await sync_to_async(tg_user.save)()
+            await sync_to_async(TelegramUser.objects.filter(id=tg_user.id).update)(is_anonymous_mode=False)
+            user_cache.invalidate(user.id)
 
-        kb = [[InlineKeyboardButton("🚀 Send", callback_data=f"send_{new_post.id}"),
-               InlineKeyboardButton("🗑️ Discard", callback_data=f"discard_{new_post.id}")]]
+        kb = [[InlineKeyboardButton("🚀 Send", callback_data=cb('send', new_post.id)),
+               InlineKeyboardButton("🗑️ Discard", callback_data=cb('discard', new_post.id))]]
         await update.message.reply_text(f"📝 <b>Draft Created:</b>\n{text[:100]}...", reply_markup=InlineKeyboardMarkup(kb), parse_mode='HTML')
 
     # ==========================
     # CALLBACK QUERY (BUTTONS)
     # ==========================
+    # Dispatch ek dict lookup hai (bot.callbacks.ROUTES); har route apni permission aur
+    # DB prefetch khud declare karta hai, taaki sirf zaroori query chale.
+
+    @traced
     async def handle_button(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         query = update.callback_query
         await query.answer()
-        
-        data = query.data.split('_')
-        action = data[0]
-        # Handle cases where data might not have a second part (like 'cancel_action')
-        target_id = data[1] if len(data) > 1 else None
-        
-        admin_id = str(config('ADMIN_ID'))
+
+        action, args = callbacks.parse(query.data)
+        route = callbacks.ROUTES.get(action)
+        if route is None: return
+        tracing.rename(f"button.{action}")
+
         user_id = query.from_user.id
+        is_admin = SETTINGS.is_admin(user_id)
+        if route.perm == 'admin' and not is_admin: return
 
-        # --- CANCEL ---
-        if action == "cancel":
-            if user_id in USER_STATE: del USER_STATE[user_id]
-            await query.edit_message_text("❌ Cancelled.")
+        try:
+            # Har route ke args yahin validate (malformed/legacy payload handler tak na pahunche)
+            call = Call(query=query, user_id=user_id, is_admin=is_admin, args=route.coerce_args(args))
+        except ValueError:
+            logger.info("Bad callback payload %r", query.data)
+            await query.edit_message_text("⚠️ This button is no longer valid.")
             return
 
-        # --- CONFIRM ACTIONS (Broadcast/Notify) ---
-        if action == "confirm":
-            state = USER_STATE.get(user_id)
-            if not state: 
-                await query.edit_message_text("❌ Session expired.")
-                return
-
-            if target_id == "broadcast" and str(user_id) == admin_id:
-                msg = state['msg']
-                users = await sync_to_async(list)(TelegramUser.objects.all())
-                c = 0
-                for u in users:
-                    try:
-                        await context.bot.send_message(u.telegram_id, f"📢 <b>Announcement:</b>\n\n{msg}", parse_mode='HTML')
-                        c += 1
-                    except: pass
-                await query.edit_message_text(f"✅ Sent to {c} users.")
-            
-            elif target_id == "notify" and str(user_id) == admin_id:
-                tid = state['target_id']
-                msg = state['msg']
-                try:
-                    await context.bot.send_message(tid, f"🔔 <b>Admin Message:</b>\n\n{msg}", parse_mode='HTML')
-                    await query.edit_message_text("✅ Message Sent.")
-                except: await query.edit_message_text("❌ Failed.")
-            
-            if user_id in USER_STATE: del USER_STATE[user_id]
+        try:
+            if route.prefetch == 'post':
+                call.post = await sync_to_async(BlogPost.objects.select_related('author').get)(id=call.target_id)
+            elif route.prefetch == 'user':
+                call.user = await sync_to_async(TelegramUser.objects.get)(id=call.target_id)
+        except (BlogPost.DoesNotExist, TelegramUser.DoesNotExist):
+            await query.edit_message_text("❌ Not found.")
             return
 
-        # --- MANAGE USER (From List) ---
-        if action == "manageuser":
-            if str(user_id) != admin_id: return
-            try:
-                u = await sync_to_async(TelegramUser.objects.get)(id=target_id)
-                kb = [
-                    [InlineKeyboardButton("📜 View Posts", callback_data=f"viewuser_{u.id}")],
-                    [InlineKeyboardButton("🗣️ Message", callback_data=f"msguser_{u.id}")],
-                    [InlineKeyboardButton("✅ Approve", callback_data=f"userapprove_{u.id}"),
-                     InlineKeyboardButton("🚫 Block", callback_data=f"userblock_{u.id}")]
-                ]
-                await query.edit_message_text(
-                    f"👤 <b>Manage: {u.first_name}</b>\nStatus: {'✅ Approved' if u.is_approved else '⏳ Pending'}", 
-                    reply_markup=InlineKeyboardMarkup(kb), parse_mode='HTML'
-                )
-            except: pass
+        if route.perm == 'owner' and str(call.post.author.telegram_id) != str(user_id): return
+
+        await route.handler(self, call, context)
+
+    # --- CANCEL ---
+    @route('cancel', args=())
+    async def on_cancel(self, call, context):
+        USER_STATE.pop(call.user_id, None)
+        BULK_SELECTION.pop(call.user_id, None)
+        await call.query.edit_message_text("❌ Cancelled.")
+
+    # --- CONFIRM ACTIONS (Broadcast/Notify) ---
+    @route('confirm', perm='admin', args=(str,))
+    async def on_confirm(self, call, context):
+        state = USER_STATE.pop(call.user_id, None)
+        if not state:
+            await call.query.edit_message_text("❌ Session expired.")
             return
 
-        # --- VIEW POST (From List) ---
-        if action == "viewpost":
+        if call.args[0] == "broadcast":
+            msg = state['msg']
+            user_ids = await sync_to_async(list)(TelegramUser.objects.values_list('telegram_id', flat=True))
+            for tid in user_ids:
+                self.outbox.send(tid, f"📢 <b>Announcement:</b>\n\n{msg}", parse_mode='HTML')
+            await call.query.edit_message_text(f"📤 Queued for {len(user_ids)} users. (/stats for delivery)")
+
+        elif call.args[0] == "notify":
             try:
-                post = await sync_to_async(BlogPost.objects.select_related('author').get)(id=target_id)
-            except:
-                await query.edit_message_text("❌ Post not found.")
-                return
-
-            keyboard = []
-            # Logic: If Owner viewing
-            if str(post.author.telegram_id) == str(user_id):
-                if post.status == 'DRAFT':
-                    keyboard = [
-                        [InlineKeyboardButton("🚀 Send", callback_data=f"send_{post.id}")],
-                        [InlineKeyboardButton("✏️ Edit", callback_data=f"edituser_{post.id}"),
-                         InlineKeyboardButton("🗑️ Delete", callback_data=f"discard_{post.id}")]
-                    ]
-                elif post.status == 'PENDING':
-                    keyboard = [[InlineKeyboardButton("🔙 Withdraw", callback_data=f"withdraw_{post.id}")]]
-                elif post.status == 'REJECTED':
-                    keyboard = [[InlineKeyboardButton("✏️ Edit", callback_data=f"edituser_{post.id}"),
-                                 InlineKeyboardButton("🗑️ Delete", callback_data=f"discard_{post.id}")]]
-                elif post.status == 'PUBLISHED':
-                    keyboard = [[InlineKeyboardButton("🗑️ Request Delete", callback_data=f"reqdel_{post.id}")]]
-            
-            # Logic: If Admin viewing
-            elif str(user_id) == admin_id:
-                if post.status == 'PENDING':
-                    keyboard = [
-                        [InlineKeyboardButton("✅ Approve", callback_data=f"approve_{post.id}"),
-                         InlineKeyboardButton("❌ Reject", callback_data=f"reject_{post.id}")],
-                        [InlineKeyboardButton("✏️ Edit", callback_data=f"adminedit_{post.id}"),
-                         InlineKeyboardButton("↩️ Remark", callback_data=f"remark_{post.id}")]
-                    ]
-                else:
-                    keyboard = [[InlineKeyboardButton("❌ Force Delete", callback_data=f"admindel_{post.id}")]]
-
-            # Show Content
-            remark_txt = f"\n\n👮 <b>Remark:</b> {post.admin_remark}" if post.admin_remark else ""
-            await query.edit_message_text(
-                f"📄 <b>Post ID: {post.id}</b>\nStatus: {post.status}\n\n{post.content}{remark_txt}",
-                reply_markup=InlineKeyboardMarkup(keyboard), parse_mode='HTML'
-            )
+                await context.bot.send_message(state['target_id'], f"🔔 <b>Admin Message:</b>\n\n{state['msg']}", parse_mode='HTML')
+                await call.query.edit_message_text("✅ Message Sent.")
+            except TelegramError as e:
+                logger.info("DM to %s failed: %s", state['target_id'], e)
+                await call.query.edit_message_text("❌ Failed.")
+
+    # --- PENDING LIST PAGES (From /pending & Digest) ---
+    @route('pendpage', perm='admin')
+    async def on_pending_page(self, call, context):
+        total, keyboard = await sync_to_async(self.pending_keyboard)(call.target_id)
+        await call.query.edit_message_text(f"🚨 <b>Pending: {total}</b>", reply_markup=InlineKeyboardMarkup(keyboard), parse_mode='HTML')
+
+    # --- BULK MODERATION ---
+    @route('bulkvip', perm='admin', args=())
+    async def on_bulk_vip(self, call, context):
+        ids = await sync_to_async(moderation.vip_pending_ids)()
+        results = await sync_to_async(moderation.publish_posts)(ids)
+        await self.after_publish(ids, results)
+        await call.query.edit_message_text(f"⭐ Published {sum(n for _, n in results)} VIP posts.")
+
+    @route('bulkold', perm='admin', args=())
+    async def on_bulk_old(self, call, context):
+        ids = await sync_to_async(moderation.stale_pending_ids)(SETTINGS.bulk_reject_days)
+        results = await sync_to_async(moderation.reject_posts)(ids)
+        self.notify_rejected(results)
+        await call.query.edit_message_text(f"🧹 Rejected {sum(len(ids) for _, ids in results)} posts older than {SETTINGS.bulk_reject_days} days.")
+
+    @route('bulkpage', perm='admin')
+    @route('bulkpick', perm='admin', args=(int, int))
+    async def on_bulk_select(self, call, context):
+        selected = BULK_SELECTION.setdefault(call.user_id, set())
+        page = call.target_id
+        if len(call.args) > 1:  # bulkpick: post_id, page
+            selected.symmetric_difference_update({call.target_id})
+            page = call.args[1]
+        total, keyboard = await sync_to_async(self.pending_keyboard)(page, selected)
+        await call.query.edit_message_text(f"☑️ <b>Select posts</b> ({len(selected)}/{total})", reply_markup=InlineKeyboardMarkup(keyboard), parse_mode='HTML')
+
+    @route('bulkgo', perm='admin', args=())
+    async def on_bulk_go(self, call, context):
+        ids = BULK_SELECTION.pop(call.user_id, set())
+        results = await sync_to_async(moderation.publish_posts)(list(ids))
+        await self.after_publish(ids, results)
+        await call.query.edit_message_text(f"✅ Published {sum(n for _, n in results)} posts.")
+
+    # --- MANAGE USER (From List) ---
+    @route('manageuser', perm='admin', prefetch='user')
+    async def on_manage_user(self, call, context):
+        u = call.user
+        kb = [
+            [InlineKeyboardButton("📜 View Posts", callback_data=cb('viewuser', u.id))],
+            [InlineKeyboardButton("🗣️ Message", callback_data=cb('msguser', u.id))],
+            [InlineKeyboardButton("✅ Approve", callback_data=cb('userapprove', u.id)),
+             InlineKeyboardButton("🚫 Block", callback_data=cb('userblock', u.id))]
+        ]
+        await call.query.edit_message_text(
+            f"👤 <b>Manage: {u.first_name}</b>\nStatus: {'✅ Approved' if u.is_approved else '⏳ Pending'}",
+            reply_markup=InlineKeyboardMarkup(kb), parse_mode='HTML'
+        )
+
+    @route('viewuser', perm='admin')
+    async def on_view_user(self, call, context):
+        posts = await sync_to_async(list)(
+            BlogPost.objects.filter(author_id=call.target_id).only('id', 'status', 'content').order_by('-created_at')[:PENDING_PAGE_SIZE * 2]
+        )
+        if not posts:
+            await call.query.edit_message_text("📭 No posts.")
             return
+        keyboard = [[InlineKeyboardButton(f"{p.status[:1]} {p.content[:20]}...", callback_data=cb('viewpost', p.id))] for p in posts]
+        await call.query.edit_message_text("📜 <b>User Posts:</b>", reply_markup=InlineKeyboardMarkup(keyboard), parse_mode='HTML')
 
-        # --- STANDARD ACTIONS ---
-        
-        # Get Post Object for actions below
-        try:
-            post = await sync_to_async(BlogPost.objects.select_related('author').get)(id=target_id)
-        except: return 
+    # --- VIEW POST (From List) ---
+    @route('viewpost', prefetch='post')
+    async def on_view_post(self, call, context):
+        post = call.post
+        keyboard = []
+        # Logic: If Owner viewing
+        if str(post.author.telegram_id) == str(call.user_id):
+            if post.status == 'DRAFT':
+                keyboard = [
+                    [InlineKeyboardButton("🚀 Send", callback_data=cb('send', post.id))],
+                    [InlineKeyboardButton("✏️ Edit", callback_data=cb('edituser', post.id)),
+                     InlineKeyboardButton("🗑️ Delete", callback_data=cb('discard', post.id))]
+                ]
+            elif post.status in ('PENDING', 'SCHEDULED'):
+                keyboard = [[InlineKeyboardButton("🔙 Withdraw", callback_data=cb('withdraw', post.id))]]
+            elif post.status == 'REJECTED':
+                keyboard = [[InlineKeyboardButton("✏️ Edit", callback_data=cb('edituser', post.id)),
+                             InlineKeyboardButton("🗑️ Delete", callback_data=cb('discard', post.id))]]
+            elif post.status == 'PUBLISHED':
+                keyboard = [[InlineKeyboardButton("🗑️ Request Delete", callback_data=cb('reqdel', post.id))]]
+
+        # Logic: If Admin viewing
+        elif call.is_admin:
+            if post.status == 'PENDING':
+                keyboard = [
+                    [InlineKeyboardButton("✅ Approve", callback_data=cb('approve', post.id)),
+                     InlineKeyboardButton("❌ Reject", callback_data=cb('reject', post.id))],
+                    [InlineKeyboardButton("✏️ Edit", callback_data=cb('adminedit', post.id)),
+                     InlineKeyboardButton("↩️ Remark", callback_data=cb('remark', post.id))],
+                    [InlineKeyboardButton("⏰ Schedule", callback_data=cb('schedule', post.id))]
+                ]
+            elif post.status == 'SCHEDULED':
+                keyboard = [
+                    [InlineKeyboardButton("✅ Publish Now", callback_data=cb('approve', post.id)),
+                     InlineKeyboardButton("⏰ Reschedule", callback_data=cb('schedule', post.id))],
+                    [InlineKeyboardButton("❌ Force Delete", callback_data=cb('admindel', post.id))]
+                ]
+            else:
+                keyboard = [[InlineKeyboardButton("❌ Force Delete", callback_data=cb('admindel', post.id))]]
 
-        if action == "reqdel":
-            if str(post.author.telegram_id) != str(user_id): return
-            await query.edit_message_text("✅ Deletion requested sent to Admin.")
-            
-            # Admin gets 2 buttons: Delete OR Keep
-            kb = [
-                [InlineKeyboardButton("🗑️ Confirm Delete", callback_data=f"confirmdel_{post.id}")],
-                [InlineKeyboardButton("🛡️ Deny (Keep)", callback_data=f"keep_{post.id}")]
-            ]
-            try:
-                await context.bot.send_message(
-                    chat_id=admin_id,
-                    text=f"🗑️ <b>Delete Request!</b>\nUser: {post.author.first_name}\n\n{post.content[:100]}...",
-                    reply_markup=InlineKeyboardMarkup(kb), parse_mode='HTML'
-                )
-            except: pass
-
-        elif action == "confirmdel":
-            if str(user_id) != admin_id: return
-            auth_id = post.author.telegram_id
-            pid = post.id
-            await sync_to_async(post.delete)()
-            await query.edit_message_text(f"🗑️ Deleted Post {pid}.")
-            try:
-                await context.bot.send_message(auth_id, f"🗑️ <b>Your Post #{pid} was deleted by Admin.</b>", parse_mode='HTML')
-            except: pass
+        # Dusron ke unpublished posts koi aur na dekhe
+        elif post.status != 'PUBLISHED':
+            await call.query.edit_message_text("❌ Not found.")
+            return
 
-        elif action == "keep":
-            if str(user_id) != admin_id: return
-            await query.edit_message_text("🛡️ Request Denied. Post Kept.")
-            try:
-                await context.bot.send_message(post.author.telegram_id, f"🛡️ <b>Deletion Denied.</b>\nAdmin decided to keep Post #{post.id}.", parse_mode='HTML')
-            except: pass
-
-        elif action == "send":
-            post.status = 'PENDING'
-            await sync_to_async(post.save)()
-            await query.edit_message_text("✅ Sent to Admin.")
-            # Notify Admin (HTML Fix)
-            kb = [[InlineKeyboardButton("🔍 View", callback_data=f"viewpost_{post.id}")]]
-            try:
-                await context.bot.send_message(
-                    admin_id, 
-                    f"🚨 <b>New Post Submission!</b>\nUser: {post.author.first_name}\n\n{post.content[:50]}...", 
-                    reply_markup=InlineKeyboardMarkup(kb), parse_mode='HTML'
-                )
-            except: pass
-
-        elif action == "approve":
-            post.status = 'PUBLISHED'
-            post.admin_remark = None
-            if "#pinned" in post.content.lower(): post.is_pinned = True
-            if "#announce" in post.content.lower(): post.is_announcement = True
-            post.author.post_count += 1
-            await sync_to_async(post.author.save)()
-            await sync_to_async(post.save)()
-            await query.edit_message_text(f"✅ Published {post.id}")
-            try:
-                await context.bot.send_message(post.author.telegram_id, f"🎉 <b>Published!</b>\nRank: {await sync_to_async(post.author.get_rank)()}", parse_mode='HTML')
-            except: pass
+        # Show Content
+        remark_txt = f"\n\n👮 <b>Remark:</b> {post.admin_remark}" if post.admin_remark else ""
+        if post.status == 'SCHEDULED' and post.publish_at:
+            remark_txt += f"\n\n⏰ <b>Goes live:</b> {timezone.localtime(post.publish_at).strftime('%d %b %H:%M')}"
+        await call.query.edit_message_text(
+            f"📄 <b>Post ID: {post.id}</b>\nStatus: {post.status}\n\n{post.content}{remark_txt}",
+            reply_markup=InlineKeyboardMarkup(keyboard), parse_mode='HTML'
+        )
 
-        elif action == "reject":
-            post.status = 'REJECTED'
-            await sync_to_async(post.save)()
-            await query.edit_message_text(f"❌ Rejected {post.id}")
-            try:
-                await context.bot.send_message(post.author.telegram_id, f"❌ <b>Post Rejected.</b>\nID: {post.id}\nCheck /drafts.", parse_mode='HTML')
-            except: pass
-
-        elif action == "discard" or action == "withdraw":
-            await sync_to_async(post.delete)()
-            await query.edit_message_text("🗑️ Deleted.")
-
-        elif action == "admindel":
-            if str(user_id) != admin_id: return
-            await sync_to_async(post.delete)()
-            await query.edit_message_text("🗑️ Deleted by Admin.")
-
-        # --- STATE ACTIONS ---
-        elif action == "remark":
-            USER_STATE[user_id] = {'action': 'ADD_REMARK', 'target_id': post.id}
-            await query.edit_message_text("💬 Enter remark:")
-        elif action == "adminedit":
-            USER_STATE[user_id] = {'action': 'ADMIN_EDIT', 'target_id': post.id}
-            await query.edit_message_text("✏️ Enter new text:")
-        elif action == "edituser":
-            USER_STATE[user_id] = {'action': 'USER_EDIT', 'target_id': post.id}
-            await context.bot.send_message(user_id, "📝 Send new text:")
-        elif action == "msguser":
-            USER_STATE[user_id] = {'action': 'DM_USER', 'target_id': post.author.telegram_id}
-            await query.edit_message_text("✍️ Enter message:")
-
-        # --- USER APPROVAL ---
-        elif action == "userapprove":
-            try:
-                u = await sync_to_async(TelegramUser.objects.get)(id=target_id)
-                u.is_approved = True
-                await sync_to_async(u.save)()
-                await query.edit_message_text(f"✅ Approved {u.first_name}")
-                await context.bot.send_message(u.telegram_id, "🎉 <b>Approved!</b> You can post now.", parse_mode='HTML')
-            except: pass
+    # --- DELETE REQUESTS ---
+    @route('reqdel', perm='owner', prefetch='post')
+    async def on_request_delete(self, call, context):
+        post = call.post
+        await call.query.edit_message_text("✅ Deletion requested sent to Admin.")
+
+        # Admin gets 2 buttons: Delete OR Keep
+        kb = [
+            [InlineKeyboardButton("🗑️ Confirm Delete", callback_data=cb('confirmdel', post.id))],
+            [InlineKeyboardButton("🛡️ Deny (Keep)", callback_data=cb('keep', post.id))]
+        ]
+        self.outbox.send(
+            SETTINGS.admin_id,
+            f"🗑️ <b>Delete Request!</b>\nUser: {post.author.first_name}\n\n{post.content[:100]}...",
+            reply_markup=InlineKeyboardMarkup(kb), parse_mode='HTML'
+        )
+
+    @route('confirmdel', perm='admin', prefetch='post')
+    async def on_confirm_delete(self, call, context):
+        auth_id = call.post.author.telegram_id
+        pid = call.post.id
+        await sync_to_async(moderation.soft_delete_posts)([pid])
+        await call.query.edit_message_text(f"🗑️ Deleted Post {pid}.")
+        self.outbox.send(auth_id, f"🗑️ <b>Your Post #{pid} was deleted by Admin.</b>", parse_mode='HTML')
+
+    @route('keep', perm='admin', prefetch='post')
+    async def on_keep(self, call, context):
+        await call.query.edit_message_text("🛡️ Request Denied. Post Kept.")
+        self.outbox.send(call.post.author.telegram_id, f"🛡️ <b>Deletion Denied.</b>\nAdmin decided to keep Post #{call.post.id}.", parse_mode='HTML')
+
+    # --- STANDARD ACTIONS ---
+    @route('send', perm='owner', prefetch='post')
+    async def on_send(self, call, context):
+        post = call.post
+        post.status = 'PENDING'
+        await sync_to_async(post.save)(update_fields=['status'])
+        await call.query.edit_message_text("✅ Sent to Admin.")
+        # Digest mode: alert ek summary me club ho jaayega
+        if SETTINGS.admin_digest_seconds and context.job_queue:
+            self.queue_digest(context, post.id)
+            return
+        # Notify Admin (HTML Fix)
+        kb = [[InlineKeyboardButton("🔍 View", callback_data=cb('viewpost', post.id))]]
+        self.outbox.send(
+            SETTINGS.admin_id,
+            f"🚨 <b>New Post Submission!</b>\nUser: {post.author.first_name}\n\n{post.content[:50]}...",
+            reply_markup=InlineKeyboardMarkup(kb), parse_mode='HTML'
+        )
+
+    @route('approve', perm='admin')
+    async def on_approve(self, call, context):
+        pid = call.target_id
+        results = await sync_to_async(moderation.publish_posts)([pid], statuses=('PENDING', 'SCHEDULED'))
+        if not results:
+            await call.query.edit_message_text(f"⚠️ Post {pid} is no longer pending.")
+            return
+        await call.query.edit_message_text(f"✅ Published {pid}")
+        await self.after_publish([pid], results)
+
+    @route('reject', perm='admin')
+    async def on_reject(self, call, context):
+        pid = call.target_id
+        results = await sync_to_async(moderation.reject_posts)([pid])
+        if not results:
+            await call.query.edit_message_text(f"⚠️ Post {pid} is no longer pending.")
+            return
+        await call.query.edit_message_text(f"❌ Rejected {pid}")
+        self.notify_rejected(results)
+
+    @route('discard', perm='owner', prefetch='post')
+    @route('withdraw', perm='owner', prefetch='post')
+    async def on_discard(self, call, context):
+        await sync_to_async(moderation.soft_delete_posts)([call.post.id])
+        await call.query.edit_message_text("🗑️ Deleted.")
+
+    @route('admindel', perm='admin')
+    async def on_admin_delete(self, call, context):
+        await sync_to_async(moderation.soft_delete_posts)([call.target_id])
+        await call.query.edit_message_text("🗑️ Deleted by Admin.")
+
+    # --- STATE ACTIONS ---
+    @route('remark', perm='admin')
+    async def on_remark(self, call, context):
+        USER_STATE[call.user_id] = {'action': 'ADD_REMARK', 'target_id': call.target_id}
+        await call.query.edit_message_text("💬 Enter remark:")
+
+    @route('schedule', perm='admin')
+    async def on_schedule(self, call, context):
+        USER_STATE[call.user_id] = {'action': 'SCHEDULE_POST', 'target_id': call.target_id}
+        await call.query.edit_message_text("⏰ When? (30m / 2h / 1d / YYYY-MM-DD HH:MM)")
+
+    @route('adminedit', perm='admin')
+    async def on_admin_edit(self, call, context):
+        USER_STATE[call.user_id] = {'action': 'ADMIN_EDIT', 'target_id': call.target_id}
+        await call.query.edit_message_text("✏️ Enter new text:")
+
+    @route('edituser', perm='owner', prefetch='post')
+    async def on_user_edit(self, call, context):
+        USER_STATE[call.user_id] = {'action': 'USER_EDIT', 'target_id': call.post.id}
+        await context.bot.send_message(call.user_id, "📝 Send new text:")
+
+    @route('msguser', perm='admin', prefetch='user')
+    async def on_message_user(self, call, context):
+        USER_STATE[call.user_id] = {'action': 'DM_USER', 'target_id': call.user.telegram_id}
+        await call.query.edit_message_text("✍️ Enter message:")
+
+    # --- USER APPROVAL ---
+    @route('userapprove', perm='admin', prefetch='user')
+    async def on_user_approve(self, call, context):
+        u = call.user
+        u.is_approved = True
+        await sync_to_async(u.save)(update_fields=['is_approved'])
+        await call.query.edit_message_text(f"✅ Approved {u.first_name}")
+        self.outbox.send(u.telegram_id, "🎉 <b>Approved!</b> You can post now.", parse_mode='HTML')
+
+    @route('userblock', perm='admin', prefetch='user')
+    async def on_user_block(self, call, context):
+        u = call.user
+        u.is_approved = False
+        await sync_to_async(u.save)(update_fields=['is_approved'])
+        await call.query.edit_message_text(f"🚫 Blocked {u.first_name}")
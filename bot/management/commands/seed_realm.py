@@ -0,0 +1,50 @@
+import random
+
+from django.core.management.base import BaseCommand
+
+from bot.models import TelegramUser, BlogPost
+
+# Seeded users ki telegram_id is prefix se shuru hoti hai (aasani se hata sakte hain)
+SEED_PREFIX = 'seed-'
+TAGS = ['cultivation', 'breakthrough', 'sect', 'alchemy', 'tribulation', 'loadtest']
+WORDS = ('qi dantian sword elder disciple pill formation heaven realm meridian '
+         'spirit stone array tribulation lightning mountain sect manual').split()
+
+
+class Command(BaseCommand):
+    help = 'Seeds fake users and published posts (for web load tests)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=50)
+        parser.add_argument('--posts', type=int, default=300)
+        parser.add_argument('--clear', action='store_true', help='Only delete previously seeded data')
+
+    def handle(self, *args, **opts):
+        old = TelegramUser.objects.filter(telegram_id__startswith=SEED_PREFIX)
+        deleted, _ = old.delete()  # Posts cascade ho jaate hain
+        if deleted:
+            self.stdout.write(f"Removed {deleted} seeded rows")
+        if opts['clear']:
+            return
+
+        rnd = random.Random(42)  # Har run par same dataset (comparison fair rahe)
+        users = TelegramUser.objects.bulk_create([
+            TelegramUser(
+                telegram_id=f"{SEED_PREFIX}{i}", first_name=f"Seed{i}", username=f"seed{i}",
+                is_approved=True, is_vip=(i % 10 == 0), post_count=rnd.randint(0, 120),
+            )
+            for i in range(opts['users'])
+        ])
+        # bulk_create sqlite/postgres dono par PKs set karta hai
+        posts = []
+        for i in range(opts['posts']):
+            words = ' '.join(rnd.choices(WORDS, k=rnd.randint(15, 80)))
+            posts.append(BlogPost(
+                author=rnd.choice(users),
+                content=f"{words.capitalize()}. #{rnd.choice(TAGS)} #{rnd.choice(TAGS)}",
+                status='PUBLISHED',
+                is_anonymous=(i % 7 == 0),
+                is_pinned=(i == 0),
+            ))
+        BlogPost.objects.bulk_create(posts, batch_size=500)
+        self.stdout.write(self.style.SUCCESS(f"Seeded {len(users)} users, {len(posts)} published posts"))
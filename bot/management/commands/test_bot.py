@@ -1,5 +1,5 @@
 from django.core.management.base import BaseCommand
-from decouple import config
+from bot.conf import get_settings
 import asyncio
 from telegram import Bot
 
@@ -7,7 +7,7 @@ class Command(BaseCommand):
     help = 'Tests the Telegram Bot Connection'
 
     def handle(self, *args, **kwargs):
-        token = config('TELEGRAM_TOKEN')
+        token = get_settings().token
 
         async def main():
             bot = Bot(token=token)
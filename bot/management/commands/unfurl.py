@@ -0,0 +1,111 @@
+import asyncio
+import threading
+import time
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+from django.core.management.base import BaseCommand, CommandError
+
+from bot import unfurl
+from bot.unfurl import Unfurler
+
+# --- Local stub site (--stub): har case ke liye ek path ---
+STUB_ARTICLE = b"""<!doctype html><html><head>
+<meta charset="utf-8"><title>Fallback title</title>
+<meta property="og:title" content="The Nine Heavens Manual">
+<meta property="og:description" content="A cultivator&#39;s guide to breaking through.">
+<meta property="og:site_name" content="Stub Sect">
+<meta property="og:image" content="/thumb.png">
+</head><body>""" + b"<p>filler</p>" * 100 + b"</body></html>"
+# 1x1 transparent PNG
+STUB_PNG = bytes.fromhex(
+    '89504e470d0a1a0a0000000d4948445200000001000000010806000000'
+    '1f15c4890000000d49444154789c6360000002000100e221bc330000000049454e44ae426082'
+)
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        path = self.path.split('?')[0]
+        if path == '/article':
+            return self._send(200, 'text/html; charset=utf-8', STUB_ARTICLE)
+        if path == '/thumb.png':
+            return self._send(200, 'image/png', STUB_PNG)
+        if path == '/redirect':
+            self.send_response(302)
+            self.send_header('Location', '/article')
+            self.end_headers()
+            return
+        if path == '/huge':
+            # Head chhota, body bahut badi: size cap ke baad padhna band
+            body = b'<html><head><title>Huge page</title></head><body>' + b'x' * (unfurl.UNFURL_MAX_BYTES * 4)
+            return self._send(200, 'text/html', body)
+        if path == '/slow':
+            time.sleep(unfurl.UNFURL_TIMEOUT * 3)
+            return self._send(200, 'text/html', b'<title>Too late</title>')
+        if path == '/file.zip':
+            return self._send(200, 'application/zip', b'PK\x03\x04')
+        return self._send(404, 'text/plain', b'not found')
+
+    def _send(self, status, ctype, body):
+        self.send_response(status)
+        self.send_header('Content-Type', ctype)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        try:
+            self.wfile.write(body)
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # Client ne cap ke baad connection chhod diya
+
+    def log_message(self, *args):
+        pass
+
+
+class Command(BaseCommand):
+    help = 'Fetches link previews for URLs (or runs the unfurl pipeline against a local stub site with --stub)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('urls', nargs='*')
+        parser.add_argument('--stub', action='store_true', help='Start a local stub site and unfurl its test pages')
+
+    def handle(self, *args, **opts):
+        urls = opts['urls']
+        server = None
+        if opts['stub']:
+            server = ThreadingHTTPServer(('127.0.0.1', 0), StubHandler)
+            server.daemon_threads = True
+            threading.Thread(target=server.serve_forever, daemon=True).start()
+            base = f"http://127.0.0.1:{server.server_address[1]}"
+            urls = [f"{base}{path}" for path in ('/article', '/redirect', '/huge', '/slow', '/file.zip', '/missing')]
+        if not urls:
+            raise CommandError("Give some URLs or use --stub")
+
+        results = asyncio.run(self.run(urls, stub=bool(server)))
+        for url, preview in results:
+            status = 'ok' if preview.ok else 'failed'
+            self.stdout.write(f"[{status:<6}] {url}")
+            if preview.ok:
+                self.stdout.write(f"         {preview.title} | {preview.site_name} | thumbnail: {preview.image.name or '-'}")
+        if server:
+            server.shutdown()
+
+    async def run(self, urls, stub=False):
+        if stub:
+            # Pehle SSRF guard: default (public-only) unfurler loopback URL block kare
+            guarded = Unfurler(allow_private=False)
+            guarded.start()
+            try:
+                blocked = await guarded.unfurl(urls[0])
+            finally:
+                await guarded.stop()
+            self.stdout.write(f"SSRF guard blocks loopback: {not blocked.ok}")
+
+        # Stub site 127.0.0.1 par hai, isliye wahan private addresses allow
+        unfurler = Unfurler(allow_private=True) if stub else Unfurler()
+        unfurler.start()
+        try:
+            started = time.monotonic()
+            previews = await asyncio.gather(*(unfurler.unfurl(url) for url in urls))
+            self.stdout.write(f"Unfurled {len(urls)} URLs in {time.monotonic() - started:.2f}s")
+            return list(zip(urls, previews))
+        finally:
+            await unfurler.stop()
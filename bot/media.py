@@ -0,0 +1,153 @@
+import mimetypes
+import os
+import re
+import stat
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.exceptions import SuspiciousFileOperation
+from django.http import FileResponse, HttpResponse
+from django.utils._os import safe_join
+from django.utils.http import http_date, parse_etags
+
+# =====================================================
+# MEDIA SERVING (/media/)
+# =====================================================
+# WhiteNoise ki tarah middleware: URL routing, session, CSRF, auth kuch nahi chalta.
+# Content-addressed files (bot/storage.py) ka naam hi sha256 hai -> ETag free me aur
+# 1 saal immutable cache. Purane naam waali files ko chhota cache + mtime/size ETag.
+# Gunicorn (WSGI) par FileResponse wsgi.file_wrapper -> os.sendfile (zero-copy) use karta hai.
+# Sync + async dono: ASGI profile par baaki requests ke liye thread hop nahi hota.
+
+HASHED_NAME = re.compile(r'^[0-9a-f]{64}$')
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+IMMUTABLE_CACHE = 'public, max-age=31536000, immutable'
+LEGACY_CACHE = 'public, max-age=3600'
+
+
+class MediaMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.prefix = settings.MEDIA_URL
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def _media_name(self, request):
+        if request.method in ('GET', 'HEAD') and request.path.startswith(self.prefix):
+            return request.path[len(self.prefix):]
+        return None
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        name = self._media_name(request)
+        if name is not None:
+            return serve_media(request, name)
+        return self.get_response(request)
+
+    async def __acall__(self, request):
+        name = self._media_name(request)
+        if name is not None:
+            # stat/open disk I/O hai: sirf media requests thread me jaati hain
+            return await sync_to_async(serve_media)(request, name)
+        return await self.get_response(request)
+
+
+def serve_media(request, name):
+    try:
+        path = safe_join(settings.MEDIA_ROOT, name)
+        st = os.stat(path)
+    except (SuspiciousFileOperation, OSError, ValueError):
+        return HttpResponse(status=404)
+    if not stat.S_ISREG(st.st_mode):
+        return HttpResponse(status=404)
+
+    stem = os.path.splitext(os.path.basename(path))[0]
+    if HASHED_NAME.match(stem):
+        etag, cache_control = f'"{stem}"', IMMUTABLE_CACHE
+    else:
+        etag, cache_control = f'"{int(st.st_mtime):x}-{st.st_size:x}"', LEGACY_CACHE
+    headers = {
+        'ETag': etag,
+        'Cache-Control': cache_control,
+        'Last-Modified': http_date(st.st_mtime),
+        'Accept-Ranges': 'bytes',
+    }
+
+    if _etag_matches(request.headers.get('If-None-Match'), etag):
+        return HttpResponse(status=304, headers=headers)
+
+    size = st.st_size
+    byte_range = None
+    # If-Range: file badal gayi ho to poori file bhejo
+    if request.headers.get('If-Range', etag) == etag:
+        byte_range = _parse_range(request.headers.get('Range'), size)
+    if byte_range is False:
+        return HttpResponse(status=416, headers={**headers, 'Content-Range': f"bytes */{size}"})
+
+    content_type = mimetypes.guess_type(path)[0] or 'application/octet-stream'
+    f = open(path, 'rb')
+    if byte_range is None:
+        response = FileResponse(f, content_type=content_type)
+    else:
+        start, end = byte_range
+        f.seek(start)
+        response = FileResponse(_RangeFile(f, end - start + 1), content_type=content_type, status=206)
+        response['Content-Length'] = end - start + 1
+        response['Content-Range'] = f"bytes {start}-{end}/{size}"
+    for key, value in headers.items():
+        response[key] = value
+    return response
+
+
+def _etag_matches(header, etag):
+    # If-None-Match: ETags ki list ya '*'; weak comparison (W/ prefix ignore)
+    etags = parse_etags(header or '')
+    return '*' in etags or etag in (e.removeprefix('W/') for e in etags)
+
+
+def _parse_range(header, size):
+    """None = poori file, False = unsatisfiable (416), warna (start, end) inclusive."""
+    match = RANGE_RE.match(header or '')
+    if not match or size == 0:
+        return None  # Multi-range / galat header: ignore karke 200
+    first, last = match.groups()
+    if not first:
+        if not last or int(last) == 0:
+            return False
+        return max(0, size - int(last)), size - 1  # "bytes=-500": last 500 bytes
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or start > end:
+        return False
+    return start, end
+
+
+class _RangeFile:
+    """
+    File ka sirf [position, position + length) hissa padhta hai.
+
+    fileno() asli file ka hai: gunicorn sendfile current offset + Content-Length se
+    utne hi bytes bhejta hai, baaki servers read() se.
+    """
+
+    def __init__(self, f, length):
+        self._f = f
+        self._remaining = length
+
+    def read(self, size=-1):
+        if size < 0 or size > self._remaining:
+            size = self._remaining
+        data = self._f.read(size)
+        self._remaining -= len(data)
+        return data
+
+    def fileno(self):
+        return self._f.fileno()
+
+    def close(self):
+        self._f.close()
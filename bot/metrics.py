@@ -0,0 +1,16 @@
+import threading
+from collections import Counter
+
+# Process-wide counters (bot ke /stats command me dikhte hain)
+_COUNTERS = Counter()
+_LOCK = threading.Lock()
+
+
+def incr(name, amount=1):
+    with _LOCK:
+        _COUNTERS[name] += amount
+
+
+def snapshot():
+    with _LOCK:
+        return dict(_COUNTERS)
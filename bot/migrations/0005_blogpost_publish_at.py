@@ -0,0 +1,18 @@
+# Generated by Django 6.0.1 on 2026-10-19 17:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bot', '0004_blogpost_admin_remark'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='blogpost',
+            name='publish_at',
+            field=models.DateTimeField(blank=True, db_index=True, null=True),
+        ),
+    ]
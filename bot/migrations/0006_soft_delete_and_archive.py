@@ -0,0 +1,34 @@
+# Generated by Django 6.0.1 on 2026-10-19 18:02
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bot', '0005_blogpost_publish_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='blogpost',
+            name='deleted_at',
+            field=models.DateTimeField(blank=True, db_index=True, null=True),
+        ),
+        migrations.CreateModel(
+            name='ArchivedPost',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('original_id', models.BigIntegerField(unique=True)),
+                ('content', models.TextField(blank=True, null=True)),
+                ('image', models.ImageField(blank=True, null=True, upload_to='posts/')),
+                ('is_anonymous', models.BooleanField(default=False)),
+                ('is_pinned', models.BooleanField(default=False)),
+                ('is_announcement', models.BooleanField(default=False)),
+                ('created_at', models.DateTimeField(db_index=True)),
+                ('archived_at', models.DateTimeField(auto_now_add=True)),
+                ('author', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_posts', to='bot.telegramuser')),
+            ],
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 6.0.1 on 2026-10-19 18:40
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bot', '0006_soft_delete_and_archive'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LinkPreview',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('url', models.CharField(max_length=500, unique=True)),
+                ('ok', models.BooleanField(default=True)),
+                ('title', models.CharField(blank=True, max_length=300)),
+                ('description', models.TextField(blank=True)),
+                ('site_name', models.CharField(blank=True, max_length=100)),
+                ('image', models.ImageField(blank=True, null=True, upload_to='previews/')),
+                ('fetched_at', models.DateTimeField(db_index=True, default=django.utils.timezone.now)),
+            ],
+        ),
+    ]
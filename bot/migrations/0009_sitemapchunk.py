@@ -0,0 +1,23 @@
+# Generated by Django 6.0.1 on 2026-10-19 19:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bot', '0008_tagsubscription'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SitemapChunk',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('index', models.PositiveIntegerField(unique=True)),
+                ('xml', models.TextField()),
+                ('url_count', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 6.0.1 on 2026-10-19 20:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bot', '0010_blogpost_updated_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='archivedpost',
+            name='updated_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
@@ -1,5 +1,6 @@
 from django.db import models
-from decouple import config  # Admin ID check karne ke liye
+from django.utils import timezone
+from bot.conf import get_settings  # Admin ID check karne ke liye
 
 class TelegramUser(models.Model):
     RANK_CHOICES = [
@@ -27,7 +28,7 @@ class TelegramUser(models.Model):
 
     def get_rank(self):
         # 1. Check for Realm Master (Admin)
-        if self.telegram_id == config('ADMIN_ID'):
+        if self.telegram_id == get_settings().admin_id:
             return "👑 Realm Master"
         
         # 2. Check Cultivation
@@ -40,7 +41,7 @@ class TelegramUser(models.Model):
         return "Immortal Realm 🐲"
 
     def get_stars(self):
-        if self.telegram_id == config('ADMIN_ID'): return 3 # ⭐⭐⭐
+        if self.telegram_id == get_settings().admin_id: return 3 # ⭐⭐⭐
         if self.is_moderator: return 2 # ⭐⭐
         if self.is_vip: return 1 # ⭐
         return 0 # No star
@@ -48,6 +49,18 @@ class TelegramUser(models.Model):
     def __str__(self):
         return f"{self.first_name} ({self.username})"
 
+class PostQuerySet(models.QuerySet):
+    def soft_delete(self):
+        # Row rehti hai (restore/audit ke liye), bas feed aur bot se gayab
+        now = timezone.now()
+        return self.update(deleted_at=now, updated_at=now)
+
+
+class LivePostManager(models.Manager.from_queryset(PostQuerySet)):
+    def get_queryset(self):
+        return super().get_queryset().filter(deleted_at__isnull=True)
+
+
 class BlogPost(models.Model):
     author = models.ForeignKey(TelegramUser, on_delete=models.CASCADE)
     content = models.TextField(blank=True, null=True)
@@ -60,5 +73,65 @@ class BlogPost(models.Model):
     admin_remark = models.TextField(blank=True, null=True)  # <--- Add this
     is_pinned = models.BooleanField(default=False)
     is_announcement = models.BooleanField(default=False)
+    publish_at = models.DateTimeField(blank=True, null=True, db_index=True)  # status SCHEDULED ke liye
     created_at = models.DateTimeField(auto_now_add=True)
-    # New Field for Admin Feedback
\ No newline at end of file
+    # Aakhri change (status, remark, edit). .update() auto_now nahi chalata, wahan khud set karo
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+    deleted_at = models.DateTimeField(blank=True, null=True, db_index=True)  # Soft delete
+    # New Field for Admin Feedback
+
+    objects = LivePostManager()  # Default: soft-deleted rows nahi dikhte
+    all_objects = PostQuerySet.as_manager()
+
+
+class ArchivedPost(models.Model):
+    # Purane published posts yahan shift hote hain taaki BlogPost table (aur feed) chhoti rahe
+    original_id = models.BigIntegerField(unique=True)
+    author = models.ForeignKey(TelegramUser, on_delete=models.CASCADE, related_name='archived_posts')
+    content = models.TextField(blank=True, null=True)
+    image = models.ImageField(upload_to='posts/', blank=True, null=True)
+    is_anonymous = models.BooleanField(default=False)
+    is_pinned = models.BooleanField(default=False)
+    is_announcement = models.BooleanField(default=False)
+    created_at = models.DateTimeField(db_index=True)
+    updated_at = models.DateTimeField(blank=True, null=True)  # BlogPost ka aakhri change (sitemap lastmod)
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+
+class LinkPreview(models.Model):
+    # Post ke links ka Open Graph data (approve par bot fetch karta hai, feed sirf DB se padhta hai)
+    url = models.CharField(max_length=500, unique=True)
+    ok = models.BooleanField(default=True)  # False = fetch fail hua (TTL tak dobara try nahi)
+    title = models.CharField(max_length=300, blank=True)
+    description = models.TextField(blank=True)
+    site_name = models.CharField(max_length=100, blank=True)
+    image = models.ImageField(upload_to='previews/', blank=True, null=True)  # Thumbnail ki local copy
+    fetched_at = models.DateTimeField(default=timezone.now, db_index=True)
+
+    def __str__(self):
+        return self.url
+
+
+class TagSubscription(models.Model):
+    # /follow #tag: naya post is tag ke saath publish ho to sirf inhi users ko notification
+    user = models.ForeignKey(TelegramUser, on_delete=models.CASCADE, related_name='subscriptions')
+    tag = models.CharField(max_length=50, db_index=True)  # lowercase, bina '#'
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [models.UniqueConstraint(fields=['user', 'tag'], name='unique_tag_subscription')]
+
+    def __str__(self):
+        return f"{self.user_id} -> #{self.tag}"
+
+
+class SitemapChunk(models.Model):
+    # sitemap-<index>.xml ka ready XML. Post ids ki range (index * size se) ek chunk me,
+    # isliye naya/delete post sirf apna chunk dobara banata hai (bot/sitemap.py)
+    index = models.PositiveIntegerField(unique=True)
+    xml = models.TextField()
+    url_count = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"sitemap-{self.index}.xml ({self.url_count} urls)"
@@ -0,0 +1,105 @@
+from collections import Counter, defaultdict
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import Case, When, Value, F
+from django.utils import timezone
+
+from .feed import invalidate_feed
+from .models import TelegramUser, BlogPost
+from .search import SEARCH_CACHE
+from .sitemap import refresh_for_posts as refresh_sitemap
+from .user_cache import invalidate as invalidate_user
+
+# =====================================================
+# BULK MODERATION (single UPDATE per action)
+# =====================================================
+
+
+def _lock_pending(post_ids, statuses=('PENDING',)):
+    # Sirf wahi rows jo abhi bhi PENDING hain (double-approve se bachne ke liye lock)
+    return list(
+        BlogPost.objects.select_for_update()
+        .filter(id__in=post_ids, status__in=statuses)
+        .values_list('id', 'author_id')
+    )
+
+
+def _authors(per_author):
+    # {author_id: x} -> [(TelegramUser, x)] - ek hi query me saare authors
+    users = TelegramUser.objects.in_bulk(list(per_author))
+    return [(users[a], n) for a, n in per_author.items() if a in users]
+
+
+def publish_posts(post_ids, statuses=('PENDING',)):
+    """Publish the given PENDING (or `statuses`) posts. Returns [(author, published_count)]."""
+    with transaction.atomic():
+        rows = _lock_pending(post_ids, statuses)
+        if not rows:
+            return []
+        ids = [pid for pid, _ in rows]
+
+        BlogPost.objects.filter(id__in=ids).update(
+            status='PUBLISHED',
+            updated_at=timezone.now(),
+            admin_remark=None,
+            publish_at=None,
+            is_pinned=Case(When(content__icontains='#pinned', then=Value(True)), default=F('is_pinned')),
+            is_announcement=Case(When(content__icontains='#announce', then=Value(True)), default=F('is_announcement')),
+        )
+
+        # Counter updates: same count waale authors ek UPDATE me
+        per_author = Counter(author_id for _, author_id in rows)
+        by_count = defaultdict(list)
+        for author_id, n in per_author.items():
+            by_count[n].append(author_id)
+        for n, author_ids in by_count.items():
+            TelegramUser.objects.filter(id__in=author_ids).update(post_count=F('post_count') + n)
+
+    SEARCH_CACHE.clear()  # .update() par signals nahi chalte
+    invalidate_feed()
+    refresh_sitemap(ids)
+    results = _authors(per_author)
+    invalidate_user(*(author.telegram_id for author, _ in results))  # post_count/rank badla
+    return results
+
+
+def reject_posts(post_ids):
+    """Reject the given PENDING posts. Returns [(author, [rejected_post_ids])]."""
+    with transaction.atomic():
+        rows = _lock_pending(post_ids)
+        if not rows:
+            return []
+        BlogPost.objects.filter(id__in=[pid for pid, _ in rows]).update(status='REJECTED', updated_at=timezone.now())
+    per_author = defaultdict(list)  # Author ko pata chale kaunsa post reject hua
+    for pid, author_id in sorted(rows):
+        per_author[author_id].append(pid)
+    return _authors(per_author)
+
+
+def vip_pending_ids():
+    return list(
+        BlogPost.objects.filter(status='PENDING', author__is_vip=True, author__is_approved=True)
+        .values_list('id', flat=True)
+    )
+
+
+def stale_pending_ids(days):
+    cutoff = timezone.now() - timedelta(days=days)
+    return list(BlogPost.objects.filter(status='PENDING', created_at__lt=cutoff).values_list('id', flat=True))
+
+
+def schedule_post(post_id, when):
+    """PENDING post ko `when` par publish hone ke liye park karo. True agar schedule hua."""
+    return BlogPost.objects.filter(id=post_id, status__in=('PENDING', 'SCHEDULED')).update(
+        status='SCHEDULED', publish_at=when, updated_at=timezone.now()
+    ) > 0
+
+
+def soft_delete_posts(post_ids):
+    """Posts ko soft-delete karo (feed se turant gayab, purge job baad me hataega)."""
+    count = BlogPost.objects.filter(id__in=post_ids).soft_delete()
+    SEARCH_CACHE.clear()
+    invalidate_feed()
+    refresh_sitemap(post_ids)
+    return count
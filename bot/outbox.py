@@ -0,0 +1,194 @@
+import asyncio
+import logging
+import random
+import time
+from collections import deque
+from dataclasses import dataclass, field
+
+from telegram.error import RetryAfter, TimedOut, NetworkError, Forbidden, BadRequest
+
+from . import metrics
+from .ratelimit import TokenBucket
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class OutboundMessage:
+    chat_id: str
+    text: str
+    kwargs: dict = field(default_factory=dict)
+    attempts: int = 0
+    queued_at: float = field(default_factory=time.monotonic)
+
+
+class Outbox:
+    """
+    Background queue for bot -> user notifications.
+
+    Handlers sirf `send()` karte hain aur turant return ho jaate hain; ek worker task
+    global + per-chat token buckets ke hisaab se messages bhejta hai, 429 (RetryAfter)
+    aur network errors par backoff ke saath retry karta hai.
+
+    Har chat ki apni FIFO line hai: retry/wait wala message line ke aage hi rehta hai,
+    to ek chat ke messages kabhi aage-peeche nahi hote. Ready queue me chat ids jaate hain.
+    """
+
+    def __init__(self, global_rate=25, chat_rate=1.0, chat_burst=3, max_retries=5, base_backoff=1.0):
+        # Telegram limits: ~30 msg/sec overall, ~1 msg/sec per chat
+        self.global_bucket = TokenBucket(global_rate, global_rate)
+        self.chat_rate = chat_rate
+        self.chat_burst = chat_burst
+        self.max_retries = max_retries
+        self.base_backoff = base_backoff
+        self._chat_buckets = {}
+        self._paused_until = 0.0
+        self._lines = {}  # chat_id -> deque[OutboundMessage]
+        self._delayed = {}  # chat_id -> TimerHandle (retry/bucket wait)
+        self._undelivered = 0
+        self._idle = None
+        self._queue = None
+        self._worker = None
+        self._bot = None
+
+    # --- Lifecycle (Application.post_init / post_stop se call hota hai) ---
+    # post_stop: bot ka HTTP client abhi khula hai, to drain ke messages sach me jaate hain
+    def start(self, bot):
+        self._bot = bot
+        self._queue = asyncio.Queue()
+        self._idle = asyncio.Event()
+        self._idle.set()
+        self._worker = asyncio.create_task(self._run())
+
+    async def stop(self, timeout=5.0):
+        if not self._worker:
+            return
+        # Queue + pending retries dono ko thoda time do nikalne ka
+        try:
+            await asyncio.wait_for(self._idle.wait(), timeout)
+        except asyncio.TimeoutError:
+            logger.warning(
+                "Outbox stopped with %s undelivered messages (%s chats waiting on retry)",
+                self._undelivered, len(self._delayed),
+            )
+            metrics.incr('outbox.dropped', self._undelivered)
+        for handle in self._delayed.values():
+            handle.cancel()
+        self._delayed.clear()
+        self._worker.cancel()
+        self._worker = None
+
+    # --- Public API ---
+    def send(self, chat_id, text, **kwargs):
+        """Fire-and-forget: message queue me daalo, delivery background me hogi."""
+        if self._queue is None:
+            logger.warning("Outbox not started, dropping message to %s", chat_id)
+            metrics.incr('outbox.dropped')
+            return
+        chat_id = str(chat_id)
+        line = self._lines.get(chat_id)
+        if line is None:
+            # Naya chat: line banao aur ready queue me daalo
+            line = self._lines[chat_id] = deque()
+            self._queue.put_nowait(chat_id)
+        line.append(OutboundMessage(chat_id, text, kwargs))
+        self._undelivered += 1
+        self._idle.clear()
+        metrics.incr('outbox.queued')
+
+    def depth(self):
+        return self._undelivered
+
+    # --- Internals ---
+    def _chat_bucket(self, chat_id):
+        bucket = self._chat_buckets.get(chat_id)
+        if bucket is None:
+            if len(self._chat_buckets) > 10000:
+                # Purane (full, idle) buckets hata do taaki dict na phoole
+                self._chat_buckets = {k: b for k, b in self._chat_buckets.items() if b.wait_time(b.capacity) > 0}
+            bucket = self._chat_buckets[chat_id] = TokenBucket(self.chat_rate, self.chat_burst)
+        return bucket
+
+    def _requeue(self, chat_id, delay):
+        # Chat ki line `delay` ke baad wapas ready queue me (handle stop() ke liye yaad rakho)
+        def wake():
+            self._delayed.pop(chat_id, None)
+            self._queue.put_nowait(chat_id)
+        self._delayed[chat_id] = asyncio.get_running_loop().call_later(delay, wake)
+
+    def _advance(self, chat_id):
+        # Line ka pehla message khatam (sent / give up): baaki ho to round-robin me peeche, warna line band
+        line = self._lines.get(chat_id)
+        if line:
+            line.popleft()
+            self._undelivered -= 1
+            if not self._undelivered:
+                self._idle.set()
+        if line:
+            self._queue.put_nowait(chat_id)
+        else:
+            self._lines.pop(chat_id, None)
+
+    async def _run(self):
+        while True:
+            chat_id = await self._queue.get()
+            try:
+                line = self._lines[chat_id]
+                # Ek busy chat baaki sab ko block na kare: uski line baad me wapas aayegi
+                wait = self._chat_bucket(chat_id).wait_time()
+                if wait > 0:
+                    self._requeue(chat_id, wait)
+                    continue
+
+                wait = max(self.global_bucket.wait_time(), self._paused_until - time.monotonic())
+                if wait > 0:
+                    await asyncio.sleep(wait)
+                self.global_bucket.try_acquire()
+                self._chat_bucket(chat_id).try_acquire()
+
+                retry_delay = await self._deliver(line[0])
+                if retry_delay is not None:
+                    self._requeue(chat_id, retry_delay)  # Message line ke aage hi rehta hai
+                    continue
+                self._advance(chat_id)
+            except Exception:
+                # Message chhod do, warna ye chat hamesha atki rahegi aur stop() poora timeout wait karega
+                logger.exception("Outbox worker error for %s", chat_id)
+                metrics.incr('outbox.failed')
+                self._advance(chat_id)
+            finally:
+                self._queue.task_done()
+
+    async def _deliver(self, msg):
+        """Returns retry delay (seconds) ya None agar message ka kaam khatam (sent / give up)."""
+        msg.attempts += 1
+        try:
+            await self._bot.send_message(chat_id=msg.chat_id, text=msg.text, **msg.kwargs)
+        except RetryAfter as e:
+            retry_after = e.retry_after
+            delay = retry_after.total_seconds() if hasattr(retry_after, 'total_seconds') else float(retry_after)
+            metrics.incr('outbox.rate_limited')
+            # Flood control: jab tak Telegram bole tab tak saare sends ruk jaayein
+            self._paused_until = max(self._paused_until, time.monotonic() + delay)
+            return self._retry(msg, delay)
+        except (Forbidden, BadRequest) as e:
+            # User ne bot block kiya / chat invalid - retry ka fayda nahi
+            metrics.incr('outbox.failed')
+            logger.info("Outbox: giving up on %s: %s", msg.chat_id, e)
+        except (TimedOut, NetworkError) as e:
+            return self._retry(msg, self.base_backoff * (2 ** (msg.attempts - 1)) + random.uniform(0, 0.5), e)
+        except Exception:
+            metrics.incr('outbox.failed')
+            logger.exception("Outbox: unexpected error sending to %s", msg.chat_id)
+        else:
+            metrics.incr('outbox.sent')
+            metrics.incr('outbox.latency_ms', int((time.monotonic() - msg.queued_at) * 1000))
+        return None
+
+    def _retry(self, msg, delay, error=None):
+        if msg.attempts >= self.max_retries:
+            metrics.incr('outbox.failed')
+            logger.warning("Outbox: dropping message to %s after %s attempts (%s)", msg.chat_id, msg.attempts, error)
+            return None
+        metrics.incr('outbox.retried')
+        return delay
@@ -0,0 +1,31 @@
+import re
+
+from .models import LinkPreview
+
+# =====================================================
+# LINK PREVIEW LOOKUPS (feed / templates)
+# =====================================================
+# Sirf DB se padhna: web workers aur django.setup() httpx/httpcore import na karein.
+# Fetching wala hissa bot.unfurl me hai (sirf bot process use karta hai).
+
+URL_RE = re.compile(r'https?://[^\s]+')
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.gif', '.webp')
+
+
+def is_image_url(url):
+    return url.lower().endswith(IMAGE_EXTENSIONS)
+
+
+def extract_urls(text):
+    """Post text -> non-image URLs (unique, order same)."""
+    urls = []
+    for url in URL_RE.findall(text or ''):
+        if not is_image_url(url) and url not in urls and len(url) <= 500:
+            urls.append(url)
+    return urls
+
+
+def preview_queryset(posts):
+    """In posts ke links ke ready previews (feed ke liye ek query)."""
+    urls = {url for post in posts for url in extract_urls(post.content)}
+    return LinkPreview.objects.filter(url__in=urls, ok=True)
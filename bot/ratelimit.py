@@ -0,0 +1,106 @@
+import time
+import threading
+
+from decouple import config
+
+
+class TokenBucket:
+    """Classic token bucket: `rate` tokens per second, burst up to `capacity`."""
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def try_acquire(self, amount=1):
+        self._refill()
+        if self.tokens >= amount:
+            self.tokens -= amount
+            return True
+        return False
+
+    def wait_time(self, amount=1):
+        # Kitne seconds baad `amount` tokens available honge
+        self._refill()
+        if self.tokens >= amount:
+            return 0.0
+        return (amount - self.tokens) / self.rate
+
+
+class KeyedRateLimiter:
+    """
+    Per-key token buckets (e.g. per telegram_id), in-memory.
+
+    Idle keys `ttl` seconds baad hata diye jaate hain aur map `maxsize` se bada nahi hota,
+    taaki flood karne waale hazaron naye IDs memory na kha jaayein.
+    """
+
+    blocking = False
+
+    def __init__(self, rate, capacity, ttl=600, maxsize=10000):
+        self.rate = rate
+        self.capacity = capacity
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def allow(self, key):
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                if len(self._buckets) >= self.maxsize:
+                    self._evict(now)
+                bucket = self._buckets[key] = TokenBucket(self.rate, self.capacity)
+            return bucket.try_acquire()
+
+    def _evict(self, now):
+        self._buckets = {k: b for k, b in self._buckets.items() if now - b.updated < self.ttl}
+        # Phir bhi full? Sabse purane aadhe hata do
+        if len(self._buckets) >= self.maxsize:
+            keep = sorted(self._buckets.items(), key=lambda kv: kv[1].updated)[self.maxsize // 2:]
+            self._buckets = dict(keep)
+
+
+class CacheRateLimiter:
+    """
+    Shared backend: Django cache me fixed-window counters.
+
+    Multiple bot processes ke beech limit share karni ho to CACHES me Redis/DB cache
+    configure karo; default LocMemCache sirf ek process tak hi dikhta hai.
+    """
+
+    blocking = True  # Cache backend network/DB call kar sakta hai
+
+    def __init__(self, name, rate, capacity):
+        self.name = name
+        # `capacity` tokens per window, window itna lamba ki average `rate` bane
+        self.limit = capacity
+        self.window = max(1, int(round(capacity / rate)))
+
+    def allow(self, key):
+        from django.core.cache import cache
+
+        window_key = f"rl:{self.name}:{key}:{int(time.time()) // self.window}"
+        cache.add(window_key, 0, timeout=self.window + 1)
+        try:
+            count = cache.incr(window_key)
+        except ValueError:  # Beech me expire ho gaya
+            cache.set(window_key, 1, timeout=self.window + 1)
+            count = 1
+        return count <= self.limit
+
+
+def make_limiter(name, per_minute, burst):
+    """RATE_LIMIT_BACKEND=memory (default) | cache"""
+    rate = per_minute / 60.0
+    if config('RATE_LIMIT_BACKEND', default='memory') == 'cache':
+        return CacheRateLimiter(name, rate, burst)
+    return KeyedRateLimiter(rate, burst)
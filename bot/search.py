@@ -0,0 +1,71 @@
+from decouple import config
+from django.db.models import Q
+
+from .cache import TTLCache
+from .models import BlogPost
+
+# Autocomplete ke liye hard limit (client kuch bhi maange, isse zyada nahi milega)
+SEARCH_MAX_RESULTS = config('SEARCH_MAX_RESULTS', default=8, cast=int)
+SNIPPET_LENGTH = 120
+
+# Recent queries ka cache (per-process). Publish/unpublish par signal se clear hota hai,
+# lekin sirf usi process me: bot alag process me publish karta hai, to web ka cache
+# SEARCH_CACHE_TTL seconds tak purane results de sakta hai. Yahi staleness window hai.
+SEARCH_CACHE = TTLCache(
+    maxsize=config('SEARCH_CACHE_SIZE', default=256, cast=int),
+    ttl=config('SEARCH_CACHE_TTL', default=30, cast=int),
+)
+
+
+def _snippet(text):
+    text = " ".join((text or "").split())
+    if len(text) <= SNIPPET_LENGTH:
+        return text
+    return text[:SNIPPET_LENGTH].rstrip() + "…"
+
+
+def match_q(query):
+    # Author naam se match sirf non-anonymous posts par (warna match hi author bata deta)
+    return Q(content__icontains=query) | (Q(is_anonymous=False) & (
+        Q(author__first_name__icontains=query) |
+        Q(author__username__icontains=query)
+    ))
+
+
+def search_posts(query, limit=SEARCH_MAX_RESULTS):
+    """Top matches as small dicts (id, snippet, author, rank) - cached per (query, limit)."""
+    query = " ".join(query.split()).lower()
+    limit = max(1, min(limit, SEARCH_MAX_RESULTS))
+    if not query:
+        return []
+
+    key = (query, limit)
+    results = SEARCH_CACHE.get(key)
+    if results is not None:
+        return results
+
+    posts = (
+        BlogPost.objects.filter(status='PUBLISHED')
+        .filter(match_q(query))
+        .select_related('author')
+        .only('id', 'content', 'is_anonymous', 'is_pinned', 'created_at',
+              'author__telegram_id', 'author__first_name', 'author__post_count')
+        .order_by('-is_pinned', '-created_at')[:limit]
+    )
+
+    results = []
+    for post in posts:
+        # Anonymous post ka author kabhi bahar na jaaye
+        if post.is_anonymous:
+            author, rank = "Hidden Cultivator", "???"
+        else:
+            author, rank = post.author.first_name, post.author.get_rank()
+        results.append({
+            'id': post.id,
+            'snippet': _snippet(post.content),
+            'author': author,
+            'rank': rank,
+        })
+
+    SEARCH_CACHE.set(key, results)
+    return results
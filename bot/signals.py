@@ -0,0 +1,48 @@
+from django.db.models.signals import post_init, post_save, post_delete
+from django.dispatch import receiver
+
+from .models import TelegramUser, BlogPost
+from .feed import invalidate_feed
+from .search import SEARCH_CACHE
+from . import sitemap
+from .user_cache import invalidate as invalidate_user
+
+
+@receiver(post_init, sender=BlogPost)
+def remember_status(sender, instance, **kwargs):
+    # Load ke time ka status (deferred field ho to None; __dict__ se taaki extra query na chale)
+    instance._loaded_status = instance.__dict__.get('status')
+
+
+def _touches_published(instance):
+    # Post PUBLISHED me aaya ya PUBLISHED se nikla (remark -> DRAFT, admin edit)
+    return 'PUBLISHED' in (instance.status, getattr(instance, '_loaded_status', None))
+
+
+@receiver(post_save, sender=BlogPost)
+@receiver(post_delete, sender=BlogPost)
+def invalidate_read_caches(sender, instance, **kwargs):
+    # Sirf published posts search/feed me aate hain; drafts ke save par cache mat udao
+    if _touches_published(instance):
+        SEARCH_CACHE.clear()
+        invalidate_feed()
+
+
+@receiver(post_save, sender=BlogPost)
+def refresh_sitemap(sender, instance, **kwargs):
+    # Single saves (admin panel, remark, edit). Bulk publish/delete moderation.py khud karta hai.
+    # Draft edits sitemap ko chhoote hi nahi; published me aaya/se gaya/edit hua to chunk rebuild
+    if _touches_published(instance):
+        sitemap.refresh_for_posts([instance.id])
+
+
+@receiver(post_save, sender=BlogPost)
+def remember_saved_status(sender, instance, **kwargs):
+    # Upar waale receivers ke baad: agla save isi status se compare ho
+    instance._loaded_status = instance.status
+
+
+@receiver(post_save, sender=TelegramUser)
+@receiver(post_delete, sender=TelegramUser)
+def invalidate_user_cache(sender, instance, **kwargs):
+    invalidate_user(instance.telegram_id)
@@ -0,0 +1,89 @@
+from datetime import timezone as dt_timezone
+
+from decouple import config
+from django.utils.html import escape
+
+from .conf import get_settings
+from .models import BlogPost, ArchivedPost, SitemapChunk
+
+# =====================================================
+# INCREMENTAL SITEMAP
+# =====================================================
+# Har chunk = post ids ki ek fixed range (index * SITEMAP_CHUNK_SIZE se). Publish/delete
+# par sirf us post ka chunk dobara banta hai aur XML DB me save hota hai; /sitemap.xml
+# request par kuch generate nahi hota. Archived posts bhi (same permalink) sitemap me rehte hain.
+
+SITEMAP_CHUNK_SIZE = config('SITEMAP_CHUNK_SIZE', default=5000, cast=int)  # Google limit 50k URLs/file
+
+XML_HEADER = '<?xml version="1.0" encoding="UTF-8"?>\n'
+XMLNS = 'http://www.sitemaps.org/schemas/sitemap/0.9'
+
+
+def chunk_index(post_id):
+    return post_id // SITEMAP_CHUNK_SIZE
+
+
+def permalink(post_id):
+    return f"{get_settings().website_url.rstrip('/')}/p/{post_id}/"
+
+
+def w3c(dt):
+    return dt.astimezone(dt_timezone.utc).strftime('%Y-%m-%dT%H:%M:%S+00:00')
+
+
+def _chunk_entries(index):
+    """Chunk ki range ke [(post_id, lastmod)] - live published + archived. lastmod = aakhri change (edit bhi)."""
+    lo, hi = index * SITEMAP_CHUNK_SIZE, (index + 1) * SITEMAP_CHUNK_SIZE
+    entries = dict(
+        BlogPost.objects.filter(status='PUBLISHED', id__gte=lo, id__lt=hi).values_list('id', 'updated_at')
+    )
+    archived = ArchivedPost.objects.filter(original_id__gte=lo, original_id__lt=hi)
+    for original_id, updated_at, created_at in archived.values_list('original_id', 'updated_at', 'created_at'):
+        entries.setdefault(original_id, updated_at or created_at)
+    return sorted(entries.items())
+
+
+def rebuild_chunk(index):
+    """Ek chunk dobara banao. XML same ho to write nahi. Returns True agar kuch badla."""
+    entries = _chunk_entries(index)
+    if not entries:
+        deleted, _ = SitemapChunk.objects.filter(index=index).delete()
+        return bool(deleted)
+
+    urls = ''.join(
+        f"<url><loc>{escape(permalink(pid))}</loc><lastmod>{w3c(lastmod)}</lastmod></url>\n"
+        for pid, lastmod in entries
+    )
+    xml = f'{XML_HEADER}<urlset xmlns="{XMLNS}">\n{urls}</urlset>\n'
+    current = SitemapChunk.objects.filter(index=index).values_list('xml', flat=True).first()
+    if current == xml:
+        return False
+    SitemapChunk.objects.update_or_create(
+        index=index,
+        defaults={'xml': xml, 'url_count': len(entries)},
+    )
+    return True
+
+
+def refresh_for_posts(post_ids):
+    """Publish/delete ke baad: sirf in posts ke chunks."""
+    return sum(rebuild_chunk(index) for index in sorted({chunk_index(pid) for pid in post_ids}))
+
+
+def rebuild_all():
+    """Poora sitemap reconcile karo (rebuild_sitemap command + cleanup job). Returns changed chunks."""
+    ids = set(BlogPost.objects.filter(status='PUBLISHED').values_list('id', flat=True))
+    ids |= set(ArchivedPost.objects.values_list('original_id', flat=True))
+    indexes = {chunk_index(pid) for pid in ids}
+    indexes |= set(SitemapChunk.objects.values_list('index', flat=True))  # Khaali ho chuke chunks hatane ke liye
+    return sum(rebuild_chunk(index) for index in sorted(indexes))
+
+
+def sitemap_index_xml():
+    # Chunk ka lastmod = jab uska XML aakhri baar badla (delete bhi isme aata hai)
+    base = get_settings().website_url.rstrip('/')
+    items = ''.join(
+        f"<sitemap><loc>{escape(base)}/sitemap-{index}.xml</loc><lastmod>{w3c(lastmod)}</lastmod></sitemap>\n"
+        for index, lastmod in SitemapChunk.objects.order_by('index').values_list('index', 'updated_at')
+    )
+    return f'{XML_HEADER}<sitemapindex xmlns="{XMLNS}">\n{items}</sitemapindex>\n'
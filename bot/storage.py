@@ -0,0 +1,60 @@
+import hashlib
+import os
+
+from django.core.exceptions import ImproperlyConfigured
+from django.core.files.storage import FileSystemStorage
+from whitenoise.storage import CompressedManifestStaticFilesStorage
+
+# =====================================================
+# CONTENT-ADDRESSED MEDIA STORAGE
+# =====================================================
+# `posts/1_photo.jpg` -> `posts/ab/cd/abcd…(sha256).jpg`. Same bytes dobara upload hon
+# (ek hi photo 2 baar, avatar refresh bina change ke) to file sirf ek baar disk par rehti hai.
+# Naam content se banta hai, isliye URL kabhi stale nahi hota -> immutable caching (bot/media.py).
+
+
+def content_name(name, digest):
+    folder = os.path.dirname(name)
+    ext = os.path.splitext(name)[1].lower()
+    return os.path.join(folder, digest[:2], digest[2:4], f"{digest}{ext}")
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    def _save(self, name, content):
+        sha = hashlib.sha256()
+        for chunk in content.chunks():
+            sha.update(chunk)
+        content.seek(0)
+
+        name = content_name(name, sha.hexdigest())
+        if self.exists(name):
+            # Dedupe: same content already stored. mtime taaza karo taaki purana orphan
+            # file naye reference ke saath purge_orphaned_media ke grace window me aa jaaye
+            try:
+                os.utime(self.path(name))
+                return name
+            except FileNotFoundError:
+                pass  # Beech me purge ho gaya: dobara likho
+        return super()._save(name, content)
+
+
+# =====================================================
+# STATIC FILES (build output check)
+# =====================================================
+# css/realm.css git me nahi hai, build.sh ka Tailwind step banata hai. Uske bina bhi
+# collectstatic chal jaata aur DEBUG=False par har page "Missing staticfiles manifest
+# entry" se crash hota. Isliye collectstatic yahin saaf error ke saath ruk jaata hai.
+
+BUILT_STATIC_FILES = ('css/realm.css',)
+TAILWIND_BUILD = './tailwindcss -c tailwind.config.js -i bot/static_src/realm.css -o bot/static/css/realm.css --minify'
+
+
+class BuiltManifestStaticFilesStorage(CompressedManifestStaticFilesStorage):
+    def post_process(self, paths, dry_run=False, **options):
+        missing = [name for name in BUILT_STATIC_FILES if name not in paths]
+        if missing:
+            raise ImproperlyConfigured(
+                f"Compiled static files missing: {', '.join(missing)}. "
+                f"Run the Tailwind step from build.sh first: {TAILWIND_BUILD}"
+            )
+        yield from super().post_process(paths, dry_run, **options)
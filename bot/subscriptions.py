@@ -0,0 +1,80 @@
+import re
+from collections import defaultdict
+
+from decouple import config
+
+from .models import BlogPost, TagSubscription
+
+# =====================================================
+# TAG SUBSCRIPTIONS (/follow, /unfollow + publish fan-out)
+# =====================================================
+# Publish par saare users ko loop nahi: post ke tags -> ek query me subscribers.
+
+MAX_FOLLOWS = config('MAX_FOLLOWS', default=50, cast=int)
+TAG_RE = re.compile(r'#(\w+)')  # render_tags jaisa
+MAX_TAG_LENGTH = 50
+
+
+def normalize_tag(text):
+    """'#Sect' / 'sect' -> 'sect' (invalid ho to None)."""
+    tag = text.strip().lstrip('#').lower()
+    if not tag or len(tag) > MAX_TAG_LENGTH or not re.fullmatch(r'\w+', tag):
+        return None
+    return tag
+
+
+def extract_tags(text):
+    return {tag.lower() for tag in TAG_RE.findall(text or '') if len(tag) <= MAX_TAG_LENGTH}
+
+
+def followed_tags(user_id):
+    return list(TagSubscription.objects.filter(user_id=user_id).order_by('tag').values_list('tag', flat=True))
+
+
+def follow(user_id, tags):
+    """Returns newly followed tags (limit ke andar)."""
+    current = set(followed_tags(user_id))
+    room = max(0, MAX_FOLLOWS - len(current))
+    new = [t for t in dict.fromkeys(tags) if t not in current][:room]
+    TagSubscription.objects.bulk_create(
+        [TagSubscription(user_id=user_id, tag=t) for t in new], ignore_conflicts=True
+    )
+    return new
+
+
+def unfollow(user_id, tags):
+    deleted, _ = TagSubscription.objects.filter(user_id=user_id, tag__in=tags).delete()
+    return deleted
+
+
+def tag_subscribers(post_ids):
+    """
+    Published posts -> [(telegram_id, [(post, matched_tags)])].
+
+    Saare tags ke subscribers ek query me; ek user ko ek hi notification (chahe kitne
+    posts/tags match hon). Author ko apne hi post ki notification nahi jaati, aur
+    blocked/unapproved users ko bhi nahi (purani subscriptions reh gayi hon to bhi).
+    """
+    posts = list(
+        BlogPost.objects.filter(id__in=post_ids, status='PUBLISHED').select_related('author').order_by('created_at')
+    )
+    tags_by_post = {post.id: extract_tags(post.content) for post in posts}
+    all_tags = set().union(*tags_by_post.values()) if tags_by_post else set()
+    if not all_tags:
+        return []
+
+    followers = defaultdict(set)  # tag -> {(user_id, telegram_id)}
+    rows = TagSubscription.objects.filter(tag__in=all_tags, user__is_approved=True).values_list('tag', 'user_id', 'user__telegram_id')
+    for tag, user_id, telegram_id in rows:
+        followers[tag].add((user_id, telegram_id))
+
+    per_user = defaultdict(list)  # telegram_id -> [(post, tags)]
+    for post in posts:
+        matched = defaultdict(list)
+        for tag in sorted(tags_by_post[post.id]):
+            for user_id, telegram_id in followers.get(tag, ()):
+                if user_id != post.author_id:
+                    matched[telegram_id].append(tag)
+        for telegram_id, tags in matched.items():
+            per_user[telegram_id].append((post, tags))
+    return list(per_user.items())
@@ -1,12 +1,34 @@
 import re
+from html import unescape
 from django import template
 from django.utils.safestring import mark_safe
 from django.utils.html import escape
+from django.utils.text import Truncator
+
+from bot.previews import URL_RE, is_image_url
 
 register = template.Library()
 
+def _text(value):
+    # &#x27; me '#' hai, render_tags use hashtag samajh leta hai
+    return escape(value).replace('&#x27;', '&apos;')
+
+def _preview_card(url, preview):
+    # Ek hi line (content div whitespace-pre-wrap hai)
+    # Thumbnail file web process ke MEDIA_ROOT me na ho to card bina image ke
+    image = f'<img src="{preview.image.url}" class="w-full h-40 object-cover" loading="lazy" alt="" onerror="this.remove()">' if preview.image else ''
+    return (
+        f'<a href="{url}" target="_blank" rel="noopener noreferrer" class="block my-2 rounded-lg overflow-hidden border border-gray-200 dark:border-gray-700 hover:bg-gray-50 dark:hover:bg-gray-700">'
+        f'{image}<span class="block p-3">'
+        f'<span class="block text-xs text-gray-500 dark:text-gray-400">{_text(preview.site_name)}</span>'
+        f'<span class="block font-semibold text-gray-900 dark:text-gray-100">{_text(preview.title)}</span>'
+        f'<span class="block text-sm text-gray-600 dark:text-gray-400">{_text(Truncator(preview.description).chars(200))}</span>'
+        f'</span></a>'
+    )
+
 @register.filter(name='render_links')
-def render_links(value):
+def render_links(value, previews=None):
+    # previews: {url: LinkPreview} view ne pehle se DB se nikal ke diye (yahan koi fetch nahi)
     if not value:
         return ""
 
@@ -18,24 +40,25 @@ def render_links(value):
     value = value.replace('&#x27;', "'")
 
     # 2. Logic to find URLS
-    url_pattern = r'(https?://[^\s]+)'
-    
     def replace_logic(match):
         url = match.group(0)
         # Check extensions (Images)
-        if url.lower().endswith(('.png', '.jpg', '.jpeg', '.gif', '.webp')):
+        if is_image_url(url):
             # Return Image Tag
             return f'''
                 <div class="my-1">
                     <img src="{url}" class="w-full h-auto rounded-lg shadow-sm border border-gray-200" loading="lazy" alt="Post Image">
                 </div>
             '''
+        preview = previews.get(unescape(url)) if previews else None
+        if preview:
+            return _preview_card(url, preview)
         else:
             # Return Normal Clickable Link
             return f'<a href="{url}" target="_blank" rel="noopener noreferrer" class="text-blue-600 hover:underline break-all">{url}</a>'
 
     # Regex Replacement
-    return mark_safe(re.sub(url_pattern, replace_logic, value))
+    return mark_safe(URL_RE.sub(replace_logic, value))
 
 @register.filter(name='render_tags')
 def render_tags(value):
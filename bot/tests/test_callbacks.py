@@ -0,0 +1,83 @@
+from django.test import SimpleTestCase
+
+from bot import callbacks
+from bot.callbacks import Route, cb
+
+# Route table run_bot import hone par bharti hai
+import bot.management.commands.run_bot  # noqa: F401
+
+
+class ParseTests(SimpleTestCase):
+    def test_round_trip(self):
+        self.assertEqual(callbacks.parse(cb('viewpost', 42)), ('viewpost', ['42']))
+        self.assertEqual(callbacks.parse(cb('bulkpick', 7, 2)), ('bulkpick', ['7', '2']))
+        self.assertEqual(callbacks.parse(cb('bulkvip')), ('bulkvip', []))
+
+    def test_legacy_format(self):
+        # Purane buttons chat history me "action_arg" format me pade hain
+        self.assertEqual(callbacks.parse('viewpost_42'), ('viewpost', ['42']))
+        self.assertEqual(callbacks.parse('confirm_broadcast'), ('confirm', ['broadcast']))
+
+    def test_unknown_code(self):
+        self.assertEqual(callbacks.parse('1:zz:1'), (None, ['1']))
+
+    def test_too_long(self):
+        with self.assertRaises(ValueError):
+            cb('confirm', 'x' * 80)
+
+
+class RouteArgsTests(SimpleTestCase):
+    def test_every_route_validates_its_args(self):
+        for action, route in callbacks.ROUTES.items():
+            with self.subTest(action=action):
+                if route.args:
+                    with self.assertRaises(ValueError):
+                        route.coerce_args([])
+                if int in route.args:
+                    with self.assertRaises(ValueError):
+                        route.coerce_args(['oops'] * len(route.args))
+
+    def test_target_routes_get_ints(self):
+        for action in ('approve', 'reject', 'admindel', 'remark', 'schedule', 'adminedit'):
+            with self.subTest(action=action):
+                self.assertEqual(callbacks.ROUTES[action].coerce_args(['42']), [42])
+
+    def test_coerce_keeps_extra_args(self):
+        self.assertEqual(Route(None, args=(int,)).coerce_args(['1', '2']), [1, '2'])
+        self.assertEqual(callbacks.ROUTES['bulkpick'].coerce_args(['7', '2']), [7, 2])
+        self.assertEqual(callbacks.ROUTES['confirm'].coerce_args(['broadcast']), ['broadcast'])
+
+    def test_prefetch_routes_need_int_target(self):
+        with self.assertRaises(ValueError):
+            callbacks.route('viewpost', prefetch='post', args=())
+
+
+class FakeQuery:
+    def __init__(self, data, user_id):
+        self.data = data
+        self.from_user = type('U', (), {'id': user_id})()
+        self.edits = []
+
+    async def answer(self):
+        pass
+
+    async def edit_message_text(self, text, **kwargs):
+        self.edits.append(text)
+
+
+class DispatchTests(SimpleTestCase):
+    def press(self, data):
+        from asgiref.sync import async_to_sync
+        from bot.conf import get_settings
+        from bot.management.commands.run_bot import Command
+
+        query = FakeQuery(data, int(get_settings().admin_id or 1))
+        update = type('Update', (), {'callback_query': query, 'effective_user': query.from_user})()
+        with self.assertLogs('bot', 'INFO'):
+            async_to_sync(Command().handle_button)(update, None)
+        return query.edits
+
+    def test_malformed_target_is_answered_not_raised(self):
+        for data in ('1:ap:abc', '1:rj', 'admindel_x', '1:rm:', '1:bk:1'):
+            with self.subTest(data=data):
+                self.assertEqual(self.press(data), ["⚠️ This button is no longer valid."])
@@ -0,0 +1,95 @@
+from dataclasses import replace
+from unittest import mock
+
+from asgiref.sync import sync_to_async
+from django.test import TestCase
+
+from bot import moderation
+from bot.management.commands import run_bot
+from bot.management.commands.run_bot import Command
+from bot.models import TelegramUser, BlogPost
+
+
+class FakeJob:
+    def __init__(self, queue, callback, when, name):
+        self.queue, self.callback, self.when, self.name = queue, callback, when, name
+
+    def schedule_removal(self):
+        self.queue.jobs.remove(self)
+
+
+class FakeJobQueue:
+    """PTB JobQueue ka chhota hissa: run_once + get_jobs_by_name (jobs khud chalate hain)."""
+
+    def __init__(self):
+        self.jobs = []
+
+    def run_once(self, callback, when, name=None):
+        job = FakeJob(self, callback, when, name)
+        self.jobs.append(job)
+        return job
+
+    def get_jobs_by_name(self, name):
+        return [job for job in self.jobs if job.name == name]
+
+
+class DigestTests(TestCase):
+    def setUp(self):
+        settings = replace(run_bot.SETTINGS, admin_id='1', admin_digest_seconds=60, admin_digest_max=3)
+        patcher = mock.patch.object(run_bot, 'SETTINGS', settings)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.command = Command()
+        self.command.outbox = mock.Mock()
+        self.command.digest_post_ids = []
+        self.context = mock.Mock(job_queue=FakeJobQueue())
+        self.lin = TelegramUser.objects.create(telegram_id='101', first_name='Lin')
+
+    async def submit(self, content):
+        post = await BlogPost.objects.acreate(author=self.lin, content=content, status='PENDING')
+        self.command.queue_digest(self.context, post.id)
+        return post
+
+    async def delete(self, post_ids):
+        await sync_to_async(moderation.soft_delete_posts)(post_ids)
+
+    async def run_jobs(self):
+        jobs, self.context.job_queue.jobs = self.context.job_queue.jobs, []
+        for job in jobs:
+            await job.callback(self.context)
+
+    def sent(self):
+        return [c.args[1] for c in self.command.outbox.send.call_args_list]
+
+    async def test_window_coalesces_submissions(self):
+        await self.submit('First scroll')
+        await self.submit('Second scroll')
+        self.assertEqual([(j.when, j.name) for j in self.context.job_queue.jobs], [(60, 'admin_digest')])
+        await self.run_jobs()
+        [text] = self.sent()
+        self.assertIn('New: 2 | Pending: 2', text)
+        self.assertIn('Second scroll', text)
+        self.assertEqual(self.command.digest_post_ids, [])
+
+    async def test_full_batch_flushes_without_waiting(self):
+        for n in range(3):
+            await self.submit(f'Scroll {n}')
+        self.assertEqual([j.when for j in self.context.job_queue.jobs], [0])  # 60s waala job hat gaya
+        await self.run_jobs()
+        self.assertIn('New: 3', self.sent()[0])
+
+    async def test_deleted_before_flush(self):
+        await self.submit('Kept scroll')
+        gone = await self.submit('Deleted scroll')
+        await self.delete([gone.id])
+        await self.run_jobs()
+        [text] = self.sent()
+        self.assertIn('New: 1 | Pending: 1', text)
+        self.assertIn('Kept scroll', text)
+        self.assertNotIn('Deleted scroll', text)
+
+    async def test_nothing_sent_when_all_deleted(self):
+        post = await self.submit('Withdrawn scroll')
+        await self.delete([post.id])
+        await self.run_jobs()
+        self.assertEqual(self.sent(), [])
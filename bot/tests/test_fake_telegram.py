@@ -0,0 +1,76 @@
+import asyncio
+import io
+import json
+import re
+import threading
+import time
+from unittest import IsolatedAsyncioTestCase
+
+from django.core.management import call_command
+from telegram import Bot
+from telegram.error import RetryAfter
+
+from bot.fake_telegram import FakeBotAPI
+from bot.tracing import TracedRequest
+
+
+class FakeTelegramTests(IsolatedAsyncioTestCase):
+    async def bot_for(self, base_url):
+        # run_bot jaisa: TELEGRAM_BASE_URL fake server par, same request class
+        bot = Bot('1:fake', base_url=base_url, request=TracedRequest(), get_updates_request=TracedRequest())
+        await bot.initialize()  # getMe
+        self.addAsyncCleanup(bot.shutdown)
+        return bot
+
+    async def test_round_trip(self):
+        api = FakeBotAPI(port=0).start()
+        self.addCleanup(api.stop)
+        bot = await self.bot_for(api.base_url)
+        self.assertEqual(bot.username, 'fake_realm_bot')
+
+        api.inject_text(42, '/start')
+        [update] = await bot.get_updates(timeout=1)
+        self.assertEqual((update.effective_chat.id, update.message.text), (42, '/start'))
+        sent = await bot.send_message(update.effective_chat.id, 'Welcome')
+        self.assertEqual(sent.text, 'Welcome')
+
+        self.assertEqual(await bot.get_updates(offset=update.update_id + 1, timeout=0), ())
+        report = api.report(0)
+        self.assertEqual(report['replies'], 1)
+        self.assertEqual(report['methods']['sendMessage'], 1)
+
+    async def test_injected_429(self):
+        api = FakeBotAPI(port=0, error_rate=1.0, retry_after=3).start()
+        self.addCleanup(api.stop)
+        bot = await self.bot_for(api.base_url)
+        with self.assertRaises(RetryAfter) as raised:
+            await bot.send_message(42, 'hi')
+        retry_after = raised.exception.retry_after
+        self.assertEqual(getattr(retry_after, 'total_seconds', lambda: retry_after)(), 3)
+        self.assertEqual(api.report(0)['throttled_429'], 1)
+
+    async def test_management_command(self):
+        out = io.StringIO()
+        command = threading.Thread(target=call_command, args=('fake_telegram',), daemon=True, kwargs={
+            'port': 0, 'users': 2, 'rate': 20, 'duration': 0.5, 'drain': 1.0, 'stdout': out,
+        })
+        command.start()
+        for _ in range(50):
+            match = re.search(r'Fake Bot API on (\S+)', out.getvalue())
+            if match:
+                break
+            await asyncio.sleep(0.05)
+        bot = await self.bot_for(match.group(1))
+
+        # Chhota "bot": traffic ke dauraan har update ka jawab (report me replies gine jaate hain).
+        # Drain khatam hone se pehle ruko: stop() ke baad server naye requests serve nahi karta
+        offset, deadline = 0, time.monotonic() + 0.8
+        while time.monotonic() < deadline:
+            for update in await bot.get_updates(offset=offset, timeout=0.2):
+                offset = update.update_id + 1
+                if update.effective_chat:
+                    await bot.send_message(update.effective_chat.id, 'ok')
+        await asyncio.to_thread(command.join, 5)
+        report = json.loads(out.getvalue()[out.getvalue().index('{'):])
+        self.assertGreater(report['updates_injected'], 0)
+        self.assertGreater(report['replies'], 0)
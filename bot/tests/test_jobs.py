@@ -0,0 +1,87 @@
+import tempfile
+from datetime import timedelta
+from unittest import mock
+
+from django.core.cache import caches
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from bot import feed, jobs
+from bot.models import TelegramUser, BlogPost
+from bot.tests.utils import plain_static, file_cache, LOCMEM_CACHE
+
+
+class PurgeTests(TestCase):
+    def setUp(self):
+        self.lin = TelegramUser.objects.create(telegram_id='101', first_name='Lin')
+
+    def aged(self, status, created_days, updated_days):
+        post = BlogPost.objects.create(author=self.lin, content='draft', status=status)
+        now = timezone.now()
+        BlogPost.all_objects.filter(id=post.id).update(
+            created_at=now - timedelta(days=created_days), updated_at=now - timedelta(days=updated_days)
+        )
+        return post
+
+    def test_stale_drafts_use_last_change_not_creation(self):
+        abandoned = self.aged('DRAFT', created_days=60, updated_days=45)
+        returned = self.aged('DRAFT', created_days=60, updated_days=1)  # Admin remark ke saath abhi wapas aaya
+        self.assertEqual(jobs.purge_stale_drafts(days=30), 1)
+        self.assertFalse(BlogPost.all_objects.filter(id=abandoned.id).exists())
+        self.assertTrue(BlogPost.all_objects.filter(id=returned.id).exists())
+
+    def test_save_bumps_updated_at(self):
+        post = self.aged('PENDING', created_days=60, updated_days=60)
+        post = BlogPost.objects.get(id=post.id)
+        post.status = 'DRAFT'
+        post.admin_remark = 'fix typos'
+        post.save()
+        self.assertEqual(jobs.purge_stale_drafts(days=30), 0)
+
+
+@plain_static
+class FeedCacheTests(TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        shared = override_settings(CACHES=file_cache(tmp.name))
+        shared.enable()
+        self.addCleanup(shared.disable)
+        self.lin = TelegramUser.objects.create(telegram_id='101', first_name='Lin')
+
+    def test_warm_feed_fills_the_cache_the_view_reads(self):
+        BlogPost.objects.create(author=self.lin, content='first', status='PUBLISHED')
+        self.assertEqual(feed.warm_feed(), 1)
+        with self.assertNumQueries(0):
+            posts, previews = feed.home_feed()
+        self.assertEqual([p.content for p in posts], ['first'])
+        with self.assertNumQueries(0):
+            response = self.client.get('/', HTTP_HOST='localhost')
+        self.assertContains(response, 'first')
+
+    def test_publish_and_delete_invalidate_feed(self):
+        from bot import moderation
+        post = BlogPost.objects.create(author=self.lin, content='pending scroll', status='PENDING')
+        feed.warm_feed()
+        moderation.publish_posts([post.id])
+        self.assertEqual([p.id for p in feed.home_feed()[0]], [post.id])
+        moderation.soft_delete_posts([post.id])
+        self.assertEqual(feed.home_feed()[0], [])
+
+    def test_invalidation_from_another_process_reaches_the_web(self):
+        post = BlogPost.objects.create(author=self.lin, content='soon gone', status='PUBLISHED')
+        self.assertEqual(len(feed.home_feed()[0]), 1)  # Web worker ka cache bhara
+        bot_cache = caches.create_connection('default')  # Bot process ka alag instance
+        with mock.patch('bot.feed.cache', bot_cache):
+            from bot import moderation
+            moderation.soft_delete_posts([post.id])
+        with self.assertNumQueries(1):  # Cache miss: posts dobara DB se
+            self.assertEqual(feed.home_feed()[0], [])
+
+    @override_settings(CACHES=LOCMEM_CACHE)
+    def test_process_local_cache_disables_feed_cache(self):
+        BlogPost.objects.create(author=self.lin, content='live', status='PUBLISHED')
+        self.assertFalse(feed.cache_enabled())
+        feed.home_feed()
+        with self.assertNumQueries(1):
+            self.assertEqual(len(feed.home_feed()[0]), 1)
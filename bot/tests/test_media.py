@@ -0,0 +1,120 @@
+import os
+import shutil
+import tempfile
+import time
+from datetime import timedelta
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.test import TestCase, AsyncClient, override_settings
+from django.utils import timezone
+
+from bot import jobs
+from bot.models import TelegramUser, BlogPost
+
+
+class MediaTestCase(TestCase):
+    def setUp(self):
+        root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, root)
+        override = override_settings(MEDIA_ROOT=root)
+        override.enable()
+        self.addCleanup(override.disable)
+
+    def age(self, name, hours):
+        # File ko purana dikhao (orphan grace window se bahar)
+        old = time.time() - hours * 3600
+        os.utime(default_storage.path(name), (old, old))
+
+
+class ContentAddressedStorageTests(MediaTestCase):
+    def test_same_bytes_share_one_file(self):
+        a = default_storage.save('posts/one.JPG', ContentFile(b'photo'))
+        b = default_storage.save('posts/two.jpg', ContentFile(b'photo'))
+        self.assertEqual(a, b)
+        self.assertRegex(a, r'^posts/[0-9a-f]{2}/[0-9a-f]{2}/[0-9a-f]{64}\.jpg$')
+
+    def test_reuse_refreshes_mtime(self):
+        name = default_storage.save('posts/one.jpg', ContentFile(b'photo'))
+        self.age(name, 48)
+        default_storage.save('posts/again.jpg', ContentFile(b'photo'))
+        self.assertGreater(default_storage.get_modified_time(name), timezone.now() - timedelta(minutes=1))
+
+
+class PurgeOrphanedMediaTests(MediaTestCase):
+    def test_old_orphan_reused_by_new_upload_survives(self):
+        name = default_storage.save('posts/old.jpg', ContentFile(b'same photo'))
+        self.age(name, jobs.MEDIA_GRACE_HOURS * 2)  # Pehle ka orphan
+        lin = TelegramUser.objects.create(telegram_id='101', first_name='Lin')
+        BlogPost.objects.create(author=lin, content='repost', image=default_storage.save('posts/new.jpg', ContentFile(b'same photo')))
+        self.assertEqual(jobs.purge_orphaned_media(), 0)
+        self.assertTrue(default_storage.exists(name))
+
+    def test_reference_added_after_snapshot_is_respected(self):
+        name = default_storage.save('posts/old.jpg', ContentFile(b'photo'))
+        self.age(name, jobs.MEDIA_GRACE_HOURS * 2)
+        lin = TelegramUser.objects.create(telegram_id='101', first_name='Lin')
+        # Row mtime touch ke bina (jaise kisi aur process ne abhi reference kiya)
+        BlogPost.objects.create(author=lin, content='x', image=name)
+        self.assertTrue(jobs._is_referenced(name))
+
+    def test_old_unreferenced_file_is_removed(self):
+        name = default_storage.save('avatars/gone.jpg', ContentFile(b'avatar'))
+        self.age(name, jobs.MEDIA_GRACE_HOURS * 2)
+        fresh = default_storage.save('avatars/new.jpg', ContentFile(b'new avatar'))
+        self.assertEqual(jobs.purge_orphaned_media(), 1)
+        self.assertFalse(default_storage.exists(name))
+        self.assertTrue(default_storage.exists(fresh))
+
+
+class MediaMiddlewareTests(MediaTestCase):
+    def setUp(self):
+        super().setUp()
+        self.name = default_storage.save('posts/pic.png', ContentFile(b'0123456789'))
+        self.url = f'/media/{self.name}'
+        self.etag = '"%s"' % os.path.splitext(os.path.basename(self.name))[0]
+
+    def get(self, **headers):
+        return self.client.get(self.url, HTTP_HOST='localhost', **headers)
+
+    def test_full_file_with_immutable_cache(self):
+        response = self.get()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b''.join(response.streaming_content), b'0123456789')
+        self.assertEqual(response['ETag'], self.etag)
+        self.assertIn('immutable', response['Cache-Control'])
+
+    def test_if_none_match_list_weak_and_star(self):
+        for header in (self.etag, f'"other", {self.etag}', f'W/{self.etag}', '*'):
+            with self.subTest(header=header):
+                self.assertEqual(self.get(HTTP_IF_NONE_MATCH=header).status_code, 304)
+        # Substring match nahi hona chahiye
+        partial = '"%s"' % self.etag.strip('"')[:10]
+        self.assertEqual(self.get(HTTP_IF_NONE_MATCH=partial).status_code, 200)
+        self.assertEqual(self.get(HTTP_IF_NONE_MATCH=f'"x{self.etag.strip(chr(34))}"').status_code, 200)
+
+    def test_ranges(self):
+        response = self.get(HTTP_RANGE='bytes=2-4')
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response['Content-Range'], 'bytes 2-4/10')
+        self.assertEqual(b''.join(response.streaming_content), b'234')
+        self.assertEqual(self.get(HTTP_RANGE='bytes=50-').status_code, 416)
+        # If-Range purana ETag -> poori file
+        self.assertEqual(self.get(HTTP_RANGE='bytes=2-4', HTTP_IF_RANGE='"stale"').status_code, 200)
+
+    def test_missing_and_traversal(self):
+        self.assertEqual(self.client.get('/media/posts/nope.png', HTTP_HOST='localhost').status_code, 404)
+        self.assertEqual(self.client.get('/media/../settings.py', HTTP_HOST='localhost').status_code, 404)
+
+    def test_async_capable(self):
+        from asgiref.sync import iscoroutinefunction
+        from bot.media import MediaMiddleware
+
+        async def get_response(request):
+            pass
+        self.assertTrue(iscoroutinefunction(MediaMiddleware(get_response)))
+        self.assertFalse(iscoroutinefunction(MediaMiddleware(lambda request: None)))
+
+    async def test_async_stack(self):
+        response = await AsyncClient(HTTP_HOST='localhost').get(self.url, headers={'If-None-Match': self.etag})
+        self.assertEqual(response.status_code, 304)
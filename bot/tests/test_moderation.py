@@ -0,0 +1,48 @@
+from django.test import TestCase
+
+from bot import moderation
+from bot.models import TelegramUser, BlogPost
+
+
+class ModerationTests(TestCase):
+    def setUp(self):
+        self.lin = TelegramUser.objects.create(telegram_id='101', first_name='Lin')
+        self.mu = TelegramUser.objects.create(telegram_id='102', first_name='Mu', post_count=4)
+
+    def post(self, author, content='scroll', status='PENDING'):
+        return BlogPost.objects.create(author=author, content=content, status=status)
+
+    def test_publish_posts_updates_status_flags_and_counts(self):
+        a = self.post(self.lin, 'big news #pinned')
+        b = self.post(self.mu)
+        c = self.post(self.mu)
+        draft = self.post(self.mu, status='DRAFT')
+
+        results = moderation.publish_posts([a.id, b.id, c.id, draft.id])
+
+        self.assertEqual(sorted((u.telegram_id, n) for u, n in results), [('101', 1), ('102', 2)])
+        self.assertEqual(
+            set(BlogPost.objects.filter(status='PUBLISHED').values_list('id', flat=True)), {a.id, b.id, c.id}
+        )
+        self.assertTrue(BlogPost.objects.get(id=a.id).is_pinned)
+        self.assertEqual(TelegramUser.objects.get(id=self.mu.id).post_count, 6)
+        self.assertEqual(BlogPost.objects.get(id=draft.id).status, 'DRAFT')
+
+    def test_publish_twice_counts_once(self):
+        a = self.post(self.lin)
+        moderation.publish_posts([a.id])
+        self.assertEqual(moderation.publish_posts([a.id]), [])
+        self.assertEqual(TelegramUser.objects.get(id=self.lin.id).post_count, 1)
+
+    def test_reject_posts_returns_ids_per_author(self):
+        a = self.post(self.lin)
+        b = self.post(self.mu)
+        c = self.post(self.mu)
+        published = self.post(self.mu, status='PUBLISHED')
+
+        results = moderation.reject_posts([c.id, a.id, b.id, published.id])
+
+        self.assertEqual(sorted((u.telegram_id, ids) for u, ids in results), [('101', [a.id]), ('102', [b.id, c.id])])
+        self.assertEqual(BlogPost.objects.filter(status='REJECTED').count(), 3)
+        self.assertEqual(BlogPost.objects.get(id=published.id).status, 'PUBLISHED')
+        self.assertEqual(moderation.reject_posts([a.id]), [])
@@ -0,0 +1,91 @@
+import asyncio
+from unittest import IsolatedAsyncioTestCase, mock
+
+from telegram.error import NetworkError, Forbidden
+
+from bot.outbox import Outbox
+
+
+class FakeBot:
+    """send_message record karta hai; `failures` me (chat_id, text) -> errors ki list."""
+
+    def __init__(self, failures=None):
+        self.sent = []
+        self.failures = failures or {}
+
+    async def send_message(self, chat_id, text, **kwargs):
+        errors = self.failures.get((chat_id, text))
+        if errors:
+            raise errors.pop(0)
+        self.sent.append((chat_id, text))
+
+
+def make_outbox(**kwargs):
+    return Outbox(global_rate=1000, chat_rate=1000, chat_burst=100, base_backoff=0.05, **kwargs)
+
+
+class OutboxTests(IsolatedAsyncioTestCase):
+    async def test_delivers_in_order_per_chat_despite_retry(self):
+        bot = FakeBot({('1', 'a'): [NetworkError('flaky')]})
+        outbox = make_outbox()
+        outbox.start(bot)
+        for text in ('a', 'b', 'c'):
+            outbox.send(1, text)
+        outbox.send(2, 'x')
+        await outbox.stop(timeout=2)
+        self.assertEqual([t for c, t in bot.sent if c == '1'], ['a', 'b', 'c'])
+        self.assertIn(('2', 'x'), bot.sent)
+        self.assertEqual(outbox.depth(), 0)
+
+    async def test_stop_waits_for_pending_retries(self):
+        bot = FakeBot({('1', 'a'): [NetworkError('down'), NetworkError('down')]})
+        outbox = make_outbox()
+        outbox.start(bot)
+        outbox.send(1, 'a')
+        await asyncio.sleep(0.01)  # Pehla attempt fail ho ke retry schedule ho jaaye
+        await outbox.stop(timeout=2)
+        self.assertEqual(bot.sent, [('1', 'a')])
+
+    async def test_stop_timeout_cancels_retries(self):
+        bot = FakeBot({('1', 'a'): [NetworkError('down')] * 10})
+        outbox = Outbox(global_rate=1000, chat_rate=1000, chat_burst=100, base_backoff=5)
+        outbox.start(bot)
+        outbox.send(1, 'a')
+        await asyncio.sleep(0.01)
+        await outbox.stop(timeout=0.05)
+        self.assertEqual(bot.sent, [])
+        self.assertEqual(outbox.depth(), 1)
+
+    async def test_gives_up_on_forbidden_and_after_max_retries(self):
+        bot = FakeBot({
+            ('1', 'blocked'): [Forbidden('bot was blocked')],
+            ('2', 'flaky'): [NetworkError('down')] * 5,
+        })
+        outbox = make_outbox(max_retries=2)
+        outbox.start(bot)
+        outbox.send(1, 'blocked')
+        outbox.send(1, 'next')
+        outbox.send(2, 'flaky')
+        await outbox.stop(timeout=2)
+        self.assertEqual(bot.sent, [('1', 'next')])
+        self.assertEqual(outbox.depth(), 0)
+
+    async def test_worker_error_releases_the_chat(self):
+        bot = FakeBot()
+        outbox = make_outbox()
+        outbox.start(bot)
+        real_deliver = outbox._deliver
+        calls = []
+
+        async def deliver(msg):
+            calls.append(msg.text)
+            if len(calls) == 1:
+                raise RuntimeError('boom')
+            return await real_deliver(msg)
+
+        with mock.patch.object(outbox, '_deliver', deliver):
+            outbox.send(1, 'a')
+            outbox.send(1, 'b')
+            await asyncio.wait_for(outbox.stop(timeout=2), 1)
+        self.assertEqual(bot.sent, [('1', 'b')])
+        self.assertEqual(outbox.depth(), 0)
@@ -0,0 +1,81 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import SimpleTestCase, override_settings
+
+from bot import ratelimit
+from bot.ratelimit import TokenBucket, KeyedRateLimiter, CacheRateLimiter
+from bot.tests.utils import LOCMEM_CACHE
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class ClockTestCase(SimpleTestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        patcher = mock.patch('bot.ratelimit.time.monotonic', self.clock)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+
+class TokenBucketTests(ClockTestCase):
+    def test_burst_then_refill(self):
+        bucket = TokenBucket(rate=1, capacity=3)
+        self.assertEqual([bucket.try_acquire() for _ in range(4)], [True, True, True, False])
+        self.assertAlmostEqual(bucket.wait_time(), 1.0)
+        self.clock.now += 1
+        self.assertTrue(bucket.try_acquire())
+        self.clock.now += 100
+        self.assertEqual(bucket.wait_time(3), 0.0)  # Capacity se zyada nahi bharta
+        self.assertGreater(bucket.wait_time(4), 0)
+
+
+class KeyedRateLimiterTests(ClockTestCase):
+    def test_limits_are_per_key(self):
+        limiter = KeyedRateLimiter(rate=0.5, capacity=2)
+        self.assertEqual([limiter.allow(1) for _ in range(3)], [True, True, False])
+        self.assertTrue(limiter.allow(2))
+        self.clock.now += 2
+        self.assertTrue(limiter.allow(1))
+
+    def test_idle_keys_are_evicted(self):
+        limiter = KeyedRateLimiter(rate=1, capacity=1, ttl=60, maxsize=4)
+        for key in range(4):
+            limiter.allow(key)
+        self.clock.now += 61
+        limiter.allow('new')
+        self.assertEqual(list(limiter._buckets), ['new'])
+
+    def test_map_never_outgrows_maxsize(self):
+        limiter = KeyedRateLimiter(rate=1, capacity=1, ttl=600, maxsize=10)
+        for key in range(100):
+            self.clock.now += 0.01
+            limiter.allow(key)
+        self.assertLessEqual(len(limiter._buckets), 10)
+
+
+@override_settings(CACHES=LOCMEM_CACHE)
+class CacheRateLimiterTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_fixed_window_limit(self):
+        limiter = CacheRateLimiter('draft', rate=0.1, capacity=3)  # 3 per 30s window
+        with mock.patch('bot.ratelimit.time.time', return_value=3000.0):
+            self.assertEqual([limiter.allow(7) for _ in range(4)], [True, True, True, False])
+            self.assertTrue(limiter.allow(8))
+        with mock.patch('bot.ratelimit.time.time', return_value=3030.0):
+            self.assertTrue(limiter.allow(7))  # Naya window
+
+    def test_make_limiter_backend(self):
+        self.assertIsInstance(ratelimit.make_limiter('cmd', 30, 5), KeyedRateLimiter)
+        with mock.patch('bot.ratelimit.config', return_value='cache'):
+            limiter = ratelimit.make_limiter('cmd', 30, 5)
+        self.assertIsInstance(limiter, CacheRateLimiter)
+        self.assertEqual((limiter.limit, limiter.window), (5, 10))
@@ -0,0 +1,60 @@
+from django.test import TestCase
+
+from bot.tests.utils import plain_static
+
+from bot.models import TelegramUser, BlogPost
+from bot.search import SEARCH_CACHE, search_posts
+
+
+class SearchPostsTests(TestCase):
+    def setUp(self):
+        SEARCH_CACHE.clear()
+        self.lin = TelegramUser.objects.create(telegram_id='101', first_name='Lin', username='lin_dong')
+        self.open = BlogPost.objects.create(author=self.lin, content='Breaking through the fifth gate', status='PUBLISHED')
+        self.hidden = BlogPost.objects.create(
+            author=self.lin, content='Secret sect gossip', status='PUBLISHED', is_anonymous=True
+        )
+
+    def test_content_match(self):
+        results = search_posts('fifth gate')
+        self.assertEqual([r['id'] for r in results], [self.open.id])
+        self.assertEqual(results[0]['author'], 'Lin')
+
+    def test_author_name_does_not_match_anonymous_posts(self):
+        # Naam se search karke anonymous post ka author pata nahi chalna chahiye
+        for query in ('lin', 'lin_dong'):
+            SEARCH_CACHE.clear()
+            ids = [r['id'] for r in search_posts(query)]
+            self.assertIn(self.open.id, ids)
+            self.assertNotIn(self.hidden.id, ids)
+
+    def test_anonymous_post_found_by_content_is_masked(self):
+        results = search_posts('gossip')
+        self.assertEqual([r['id'] for r in results], [self.hidden.id])
+        self.assertEqual((results[0]['author'], results[0]['rank']), ('Hidden Cultivator', '???'))
+
+    def test_drafts_are_not_searchable(self):
+        BlogPost.objects.create(author=self.lin, content='Unfinished fifth gate notes', status='DRAFT')
+        self.assertEqual(len(search_posts('fifth gate')), 1)
+
+    def test_unpublishing_clears_cache(self):
+        self.assertEqual(len(search_posts('fifth gate')), 1)
+        post = BlogPost.objects.get(id=self.open.id)
+        post.status = 'DRAFT'  # Admin remark -> wapas draft
+        post.save()
+        self.assertEqual(search_posts('fifth gate'), [])
+
+    def test_limit_is_capped(self):
+        self.assertEqual(len(search_posts('e', limit=1)), 1)
+        self.assertEqual(search_posts('   '), [])
+
+
+@plain_static
+class FeedFilterTests(TestCase):
+    def test_feed_query_does_not_match_anonymous_author(self):
+        lin = TelegramUser.objects.create(telegram_id='101', first_name='Lin')
+        BlogPost.objects.create(author=lin, content='signed scroll', status='PUBLISHED')
+        BlogPost.objects.create(author=lin, content='masked scroll', status='PUBLISHED', is_anonymous=True)
+        response = self.client.get('/', {'q': 'lin'}, HTTP_HOST='localhost')
+        self.assertContains(response, 'signed scroll')
+        self.assertNotContains(response, 'masked scroll')
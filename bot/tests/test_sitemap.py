@@ -0,0 +1,122 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from bot import jobs, moderation, sitemap, views
+from bot.models import TelegramUser, BlogPost, SitemapChunk
+from bot.tests.utils import plain_static, LOCMEM_CACHE
+
+
+@mock.patch('bot.sitemap.SITEMAP_CHUNK_SIZE', 1000)
+class SitemapChunkTests(TestCase):
+    def setUp(self):
+        self.lin = TelegramUser.objects.create(telegram_id='101', first_name='Lin')
+
+    def post(self, post_id, status='PUBLISHED'):
+        return BlogPost.objects.create(id=post_id, author=self.lin, content=f'scroll {post_id}', status=status)
+
+    def chunk_xml(self, index):
+        return SitemapChunk.objects.filter(index=index).values_list('xml', flat=True).first()
+
+    def test_posts_land_in_their_id_range_chunk(self):
+        self.post(5)
+        self.post(999)
+        self.post(1000)
+        sitemap.rebuild_all()
+        self.assertEqual(list(SitemapChunk.objects.order_by('index').values_list('index', 'url_count')), [(0, 2), (1, 1)])
+        self.assertIn('/p/999/<', self.chunk_xml(0))
+        self.assertNotIn('/p/1000/<', self.chunk_xml(0))
+        index = sitemap.sitemap_index_xml()
+        self.assertIn('/sitemap-0.xml<', index)
+        self.assertIn('/sitemap-1.xml<', index)
+
+    def test_publish_and_soft_delete_refresh_the_chunk(self):
+        post = self.post(7, status='PENDING')
+        self.assertIsNone(self.chunk_xml(0))
+        moderation.publish_posts([post.id])
+        self.assertIn('/p/7/<', self.chunk_xml(0))
+        moderation.soft_delete_posts([post.id])
+        self.assertIsNone(self.chunk_xml(0))  # Khaali chunk hat jata hai
+
+    def test_edit_bumps_lastmod(self):
+        post = self.post(7)
+        BlogPost.objects.filter(id=post.id).update(updated_at=timezone.now() - timedelta(days=10))
+        sitemap.rebuild_all()
+        old_xml = self.chunk_xml(0)
+        post = BlogPost.objects.get(id=post.id)
+        post.content = 'scroll 7, revised'
+        post.save()
+        new_xml = self.chunk_xml(0)
+        self.assertNotEqual(old_xml, new_xml)
+        self.assertIn(f'<lastmod>{sitemap.w3c(BlogPost.objects.get(id=post.id).updated_at)}</lastmod>', new_xml)
+
+    def test_draft_saves_skip_sitemap(self):
+        post = self.post(7, status='DRAFT')
+        post.content = 'still a draft'
+        with self.assertNumQueries(1):  # Sirf UPDATE, koi sitemap query nahi
+            post.save()
+        self.assertFalse(SitemapChunk.objects.exists())
+
+    def test_unpublish_removes_post(self):
+        post = self.post(7)
+        self.post(8)
+        post = BlogPost.objects.get(id=post.id)
+        post.status = 'DRAFT'
+        post.save()
+        xml = self.chunk_xml(0)
+        self.assertNotIn('/p/7/<', xml)
+        self.assertIn('/p/8/<', xml)
+
+    def test_archived_posts_keep_their_url(self):
+        post = self.post(7)
+        BlogPost.objects.filter(id=post.id).update(created_at=timezone.now() - timedelta(days=400))
+        self.assertEqual(jobs.archive_old_posts(days=30), 1)
+        sitemap.rebuild_all()
+        self.assertIn('/p/7/<', self.chunk_xml(0))
+
+
+@plain_static
+@override_settings(CACHES=LOCMEM_CACHE)
+class SitemapViewTests(TestCase):
+    def setUp(self):
+        lin = TelegramUser.objects.create(telegram_id='101', first_name='Lin')
+        self.post = BlogPost.objects.create(author=lin, content='Morning practice', status='PUBLISHED')
+
+    def test_index_chunk_and_permalink(self):
+        index = sitemap.chunk_index(self.post.id)
+        self.assertContains(self.client.get('/sitemap.xml', HTTP_HOST='localhost'), f'/sitemap-{index}.xml')
+        response = self.client.get(f'/sitemap-{index}.xml', HTTP_HOST='localhost')
+        self.assertContains(response, f'/p/{self.post.id}/')
+        response = self.client.get(
+            f'/sitemap-{index}.xml', HTTP_HOST='localhost', HTTP_IF_MODIFIED_SINCE=response['Last-Modified'],
+        )
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(self.client.get('/sitemap-99.xml', HTTP_HOST='localhost').status_code, 404)
+        self.assertContains(self.client.get(f'/p/{self.post.id}/', HTTP_HOST='localhost'), 'Morning practice')
+
+
+@plain_static
+class PermalinkTests(TestCase):
+    def setUp(self):
+        lin = TelegramUser.objects.create(telegram_id='101', first_name='Lin')
+        self.post = BlogPost.objects.create(author=lin, content='Morning practice', status='PUBLISHED')
+        self.url = f'/p/{self.post.id}/'
+
+    def test_conditional_get(self):
+        response = self.client.get(self.url, HTTP_HOST='localhost')
+        self.assertContains(response, 'Morning practice')
+        self.assertIn(f'max-age={views.PERMALINK_CACHE_SECONDS}', response['Cache-Control'])
+        response = self.client.get(self.url, HTTP_HOST='localhost', HTTP_IF_MODIFIED_SINCE=response['Last-Modified'])
+        self.assertEqual(response.status_code, 304)
+
+    def test_edit_and_delete_show_up_immediately(self):
+        first = self.client.get(self.url, HTTP_HOST='localhost')
+        BlogPost.objects.filter(id=self.post.id).update(
+            content='Evening practice', updated_at=timezone.now() + timedelta(seconds=5),
+        )
+        response = self.client.get(self.url, HTTP_HOST='localhost', HTTP_IF_MODIFIED_SINCE=first['Last-Modified'])
+        self.assertContains(response, 'Evening practice')
+        moderation.soft_delete_posts([self.post.id])
+        self.assertEqual(self.client.get(self.url, HTTP_HOST='localhost').status_code, 404)
@@ -0,0 +1,41 @@
+import os
+import tempfile
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management import call_command
+from django.test import SimpleTestCase, override_settings
+
+
+class CollectStaticTests(SimpleTestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.tmp = tmp.name
+        # Sirf bot app ke static files (admin ke files collect/compress karne ka time bachao)
+        collect = override_settings(
+            STATIC_ROOT=os.path.join(self.tmp, 'collected'),
+            INSTALLED_APPS=['django.contrib.staticfiles', 'bot'],
+        )
+        collect.enable()
+        self.addCleanup(collect.disable)
+
+    def collect(self):
+        call_command('collectstatic', interactive=False, verbosity=0)
+
+    @override_settings(STATICFILES_DIRS=[])
+    def test_fails_fast_without_tailwind_build(self):
+        if os.path.exists(os.path.join(settings.BASE_DIR, 'bot', 'static', 'css', 'realm.css')):
+            self.skipTest('realm.css already built in this checkout')
+        with self.assertRaisesRegex(ImproperlyConfigured, 'css/realm.css.*tailwindcss'):
+            self.collect()
+
+    def test_collects_built_css_into_manifest(self):
+        built = os.path.join(self.tmp, 'built')
+        os.makedirs(os.path.join(built, 'css'))
+        with open(os.path.join(built, 'css', 'realm.css'), 'w') as f:
+            f.write('body{margin:0}')
+        with override_settings(STATICFILES_DIRS=[built]):
+            self.collect()
+        with open(os.path.join(self.tmp, 'collected', 'staticfiles.json')) as f:
+            self.assertIn('"css/realm.css"', f.read())
@@ -0,0 +1,89 @@
+from types import SimpleNamespace
+from unittest import mock
+
+from django.test import TestCase
+
+from bot import subscriptions, user_cache
+from bot.management.commands.run_bot import Command
+from bot.models import TelegramUser, BlogPost, TagSubscription
+from bot.tests.utils import FakeMessage
+
+
+class SubscriptionTests(TestCase):
+    def setUp(self):
+        self.lin = TelegramUser.objects.create(telegram_id='101', first_name='Lin', is_approved=True)
+        self.mei = TelegramUser.objects.create(telegram_id='102', first_name='Mei', is_approved=True)
+
+    def publish(self, author, content):
+        return BlogPost.objects.create(author=author, content=content, status='PUBLISHED')
+
+    def test_normalize_tag(self):
+        self.assertEqual(subscriptions.normalize_tag('#Sect'), 'sect')
+        self.assertEqual(subscriptions.normalize_tag('sect'), 'sect')
+        self.assertIsNone(subscriptions.normalize_tag('#'))
+        self.assertIsNone(subscriptions.normalize_tag('two words'))
+
+    def test_one_notification_per_user_across_tags_and_posts(self):
+        subscriptions.follow(self.mei.id, ['sect', 'cultivation'])
+        first = self.publish(self.lin, 'Morning #Sect #cultivation')
+        second = self.publish(self.lin, 'Evening #sect')
+        fanout = subscriptions.tag_subscribers([first.id, second.id])
+        self.assertEqual(len(fanout), 1)
+        telegram_id, matches = fanout[0]
+        self.assertEqual(telegram_id, '102')
+        self.assertEqual([(post.id, tags) for post, tags in matches], [
+            (first.id, ['cultivation', 'sect']),
+            (second.id, ['sect']),
+        ])
+
+    def test_author_not_notified_of_own_post(self):
+        subscriptions.follow(self.lin.id, ['sect'])
+        post = self.publish(self.lin, 'Mine #sect')
+        self.assertEqual(subscriptions.tag_subscribers([post.id]), [])
+
+    def test_blocked_follower_not_notified(self):
+        subscriptions.follow(self.mei.id, ['sect'])
+        TelegramUser.objects.filter(id=self.mei.id).update(is_approved=False)
+        post = self.publish(self.lin, 'News #sect')
+        self.assertEqual(subscriptions.tag_subscribers([post.id]), [])
+
+    def test_unpublished_posts_ignored(self):
+        subscriptions.follow(self.mei.id, ['sect'])
+        draft = BlogPost.objects.create(author=self.lin, content='Draft #sect', status='DRAFT')
+        self.assertEqual(subscriptions.tag_subscribers([draft.id]), [])
+
+    @mock.patch('bot.subscriptions.MAX_FOLLOWS', 3)
+    def test_follow_cap(self):
+        self.assertEqual(subscriptions.follow(self.mei.id, ['a', 'b', 'a']), ['a', 'b'])
+        self.assertEqual(subscriptions.follow(self.mei.id, ['b', 'c', 'd']), ['c'])
+        self.assertEqual(subscriptions.follow(self.mei.id, ['e']), [])
+        self.assertEqual(subscriptions.followed_tags(self.mei.id), ['a', 'b', 'c'])
+
+    def test_unfollow(self):
+        subscriptions.follow(self.mei.id, ['sect', 'cultivation'])
+        self.assertEqual(subscriptions.unfollow(self.mei.id, ['sect', 'unknown']), 1)
+        self.assertEqual(subscriptions.followed_tags(self.mei.id), ['cultivation'])
+        post = self.publish(self.lin, 'Only #sect')
+        self.assertEqual(subscriptions.tag_subscribers([post.id]), [])
+        self.assertEqual(TagSubscription.objects.count(), 1)
+
+
+class FollowCommandTests(TestCase):
+    async def follow(self, telegram_id, *args):
+        message = FakeMessage()
+        update = SimpleNamespace(effective_user=SimpleNamespace(id=telegram_id), message=message)
+        await Command().follow_tags(update, SimpleNamespace(args=list(args)))
+        return message.replies
+
+    async def test_unapproved_user_cannot_follow(self):
+        user = await TelegramUser.objects.acreate(telegram_id='103', first_name='Hu', is_approved=False)
+        user_cache.invalidate(user.telegram_id)
+        self.assertEqual(await self.follow(103, '#sect'), ["🚫 Not approved."])
+        self.assertFalse(await TagSubscription.objects.filter(user=user).aexists())
+
+    async def test_approved_user_follows(self):
+        user = await TelegramUser.objects.acreate(telegram_id='104', first_name='Yan', is_approved=True)
+        user_cache.invalidate(user.telegram_id)
+        replies = await self.follow(104, '#Sect')
+        self.assertIn('#sect', replies[0])
+        self.assertTrue(await TagSubscription.objects.filter(user=user, tag='sect').aexists())
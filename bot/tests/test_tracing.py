@@ -0,0 +1,64 @@
+import asyncio
+import json
+from unittest import mock
+
+from asgiref.sync import sync_to_async
+from django.db import connection
+from django.test import TestCase
+from telegram.request import HTTPXRequest
+
+from bot import tracing
+from bot.models import TelegramUser
+from bot.tracing import traced, TracedRequest
+
+
+async def slow_api_call(*args, **kwargs):
+    await asyncio.sleep(0.02)
+    return 200, b'{"ok": true, "result": true}'
+
+
+class TracingTests(TestCase):
+    def setUp(self):
+        # Test DB connection bot.tracing import hone se pehle bhi khul sakta hai
+        tracing._install_db_wrapper(None, connection)
+        self.request = TracedRequest()
+
+    async def handler(self, fail=False):
+        @traced
+        async def on_follow():
+            await sync_to_async(TelegramUser.objects.count)()
+            await sync_to_async(TelegramUser.objects.filter(first_name='Lin').exists)()
+            await self.request.do_request('https://api.telegram.org/botx/sendMessage', 'POST')
+            if fail:
+                raise RuntimeError('boom')
+        with mock.patch.object(HTTPXRequest, 'do_request', slow_api_call):
+            await on_follow()
+
+    def record(self, logs):
+        self.assertEqual(len(logs.records), 1)
+        return json.loads(logs.records[0].getMessage())
+
+    @mock.patch('bot.tracing.TRACE_SAMPLE_RATE', 1.0)
+    async def test_sampled_handler_logs_db_and_api_time(self):
+        with self.assertLogs('chatpress.trace', 'INFO') as logs:
+            await self.handler()
+        record = self.record(logs)
+        self.assertEqual(record['event'], 'handler')
+        self.assertEqual(record['handler'], 'on_follow')
+        self.assertEqual(record['db_queries'], 2)
+        self.assertGreater(record['db_ms'], 0)
+        self.assertEqual(record['api_calls'], 1)
+        self.assertGreaterEqual(record['api_ms'], 20)
+        self.assertGreaterEqual(record['duration_ms'], record['api_ms'] + record['db_ms'])
+        self.assertIsNone(record['error'])
+
+    @mock.patch('bot.tracing.TRACE_SAMPLE_RATE', 0.0)
+    async def test_unsampled_fast_handler_logs_nothing(self):
+        with self.assertNoLogs('chatpress.trace'):
+            await self.handler()
+
+    @mock.patch('bot.tracing.TRACE_SAMPLE_RATE', 0.0)
+    async def test_failed_handler_always_logged(self):
+        with self.assertLogs('chatpress.trace', 'INFO') as logs, self.assertRaises(RuntimeError):
+            await self.handler(fail=True)
+        self.assertEqual(self.record(logs)['error'], 'RuntimeError')
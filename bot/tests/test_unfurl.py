@@ -0,0 +1,169 @@
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+from datetime import timedelta
+from http.server import ThreadingHTTPServer
+from unittest import mock
+
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
+
+from bot import jobs, unfurl
+from bot.management.commands.unfurl import StubHandler
+from bot.models import TelegramUser, BlogPost, ArchivedPost, LinkPreview
+from bot.unfurl import Unfurler, UnfurlError, resolve_address
+
+_real_getaddrinfo = socket.getaddrinfo
+
+
+def fake_dns(host, *args, **kwargs):
+    # 'stub.test' -> loopback (rebinding / private IP waala naam)
+    return _real_getaddrinfo('127.0.0.1' if host == 'stub.test' else host, *args, **kwargs)
+
+
+class StubSiteTestCase(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), StubHandler)
+        cls.server.daemon_threads = True
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.port = cls.server.server_address[1]
+        cls.base = f"http://127.0.0.1:{cls.port}"
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+        super().tearDownClass()
+
+    def setUp(self):
+        root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, root)
+        override = override_settings(MEDIA_ROOT=root)
+        override.enable()
+        self.addCleanup(override.disable)
+
+    async def fetch(self, url, allow_private):
+        unfurler = Unfurler(concurrency=1, allow_private=allow_private)
+        unfurler.start()
+        try:
+            return await unfurler.unfurl(url)
+        finally:
+            await unfurler.stop()
+
+
+class FetchTests(StubSiteTestCase):
+    async def test_article_with_thumbnail(self):
+        preview = await self.fetch(f"{self.base}/article", allow_private=True)
+        self.assertTrue(preview.ok)
+        self.assertEqual(preview.title, 'The Nine Heavens Manual')
+        self.assertEqual(preview.site_name, 'Stub Sect')
+        self.assertEqual(preview.description, "A cultivator's guide to breaking through.")
+        self.assertTrue(preview.image.name.startswith('previews/'))
+
+    async def test_redirect_and_failures(self):
+        self.assertTrue((await self.fetch(f"{self.base}/redirect", allow_private=True)).ok)
+        for path in ('/file.zip', '/missing'):
+            with self.subTest(path=path):
+                self.assertFalse((await self.fetch(f"{self.base}{path}", allow_private=True)).ok)
+
+    async def test_huge_page_is_truncated(self):
+        preview = await self.fetch(f"{self.base}/huge", allow_private=True)
+        self.assertEqual(preview.title, 'Huge page')
+
+
+@mock.patch('socket.getaddrinfo', fake_dns)
+class SSRFTests(StubSiteTestCase):
+    async def test_loopback_is_blocked_by_default(self):
+        preview = await self.fetch(f"{self.base}/article", allow_private=False)
+        self.assertFalse(preview.ok)
+
+    async def test_hostname_resolving_to_private_ip_is_blocked(self):
+        with self.assertRaises(UnfurlError):
+            await resolve_address('stub.test', 80)
+        preview = await self.fetch(f"http://stub.test:{self.port}/article", allow_private=False)
+        self.assertFalse(preview.ok)
+
+    async def test_connection_goes_to_the_checked_address(self):
+        # Har connection par hostname sirf ek baar resolve (check + connect same IP) -> rebinding ka mauka nahi
+        lookups = []
+
+        def counting_dns(host, *args, **kwargs):
+            lookups.append(host)
+            return fake_dns(host, *args, **kwargs)
+
+        with mock.patch('socket.getaddrinfo', counting_dns):
+            preview = await self.fetch(f"http://stub.test:{self.port}/redirect", allow_private=True)
+        self.assertTrue(preview.ok)
+        # /redirect -> /article -> /thumb.png: stub HTTP/1.0 hai to 3 connections, har ek par ek hi lookup
+        self.assertEqual(lookups, ['stub.test'] * 3)
+
+    async def test_client_transport_is_guarded(self):
+        # Guard na laga ho (dependency upgrade) to loopback page mil jaata; yahan SSRF error hi chahiye
+        unfurler = Unfurler(concurrency=1, allow_private=False)
+        unfurler.start()
+        try:
+            with self.assertRaisesRegex(UnfurlError, 'non-public'):
+                await unfurl.fetch_preview(unfurler._client, f"{self.base}/article")
+        finally:
+            await unfurler.stop()
+
+    async def test_non_http_scheme(self):
+        self.assertFalse((await self.fetch('ftp://example.com/x', allow_private=True)).ok)
+
+
+class ExpirePreviewsTests(TestCase):
+    def setUp(self):
+        lin = TelegramUser.objects.create(telegram_id='101', first_name='Lin')
+        BlogPost.objects.create(author=lin, content='read https://live.example/a', status='PUBLISHED')
+        BlogPost.objects.create(author=lin, content='draft https://draft.example/b', status='DRAFT')
+        ArchivedPost.objects.create(original_id=99, author=lin, content='old https://archived.example/c', created_at=timezone.now())
+
+    def preview(self, url, ok=True, age=timedelta(days=0)):
+        return LinkPreview.objects.create(url=url, ok=ok, title='t', fetched_at=timezone.now() - age)
+
+    def test_expired_previews_in_use_are_refetched_not_deleted(self):
+        old = timedelta(days=unfurl.UNFURL_TTL_DAYS + 1)
+        self.preview('https://live.example/a', age=old)
+        self.preview('https://archived.example/c', age=old)
+        self.preview('https://draft.example/b', age=old)  # Sirf draft me: unused
+        self.preview('https://gone.example/d', age=old)
+        self.preview('https://fresh.example/e')
+
+        deleted, refetch = jobs.expire_previews()
+
+        self.assertEqual(deleted, 2)
+        self.assertEqual(sorted(refetch), ['https://archived.example/c', 'https://live.example/a'])
+        self.assertEqual(
+            sorted(LinkPreview.objects.values_list('url', flat=True)),
+            ['https://archived.example/c', 'https://fresh.example/e', 'https://live.example/a'],
+        )
+
+    def test_failed_previews_are_retried_sooner(self):
+        self.preview('https://live.example/a', ok=False, age=timedelta(hours=unfurl.UNFURL_RETRY_HOURS + 1))
+        self.assertEqual(jobs.expire_previews(), (0, ['https://live.example/a']))
+        LinkPreview.objects.update(fetched_at=timezone.now())
+        self.assertEqual(jobs.expire_previews(), (0, []))
+
+    def test_failed_refresh_keeps_existing_card(self):
+        self.preview('https://live.example/a', age=timedelta(days=40))
+        preview = unfurl.save_preview('https://live.example/a', None)
+        self.assertTrue(preview.ok)
+        self.assertEqual(preview.title, 't')
+        self.assertGreater(preview.fetched_at, timezone.now() - timedelta(minutes=1))
+
+
+class ImportCostTests(SimpleTestCase):
+    def test_setup_and_web_modules_do_not_import_http_client(self):
+        # Web workers / manage.py commands ko httpx, httpcore, anyio ka import time nahi dena
+        code = (
+            "import sys, django; django.setup(); "
+            "import bot.views, bot.jobs, bot.templatetags.blog_filters; "
+            "print(sorted(m for m in ('httpx', 'httpcore', 'anyio') if m in sys.modules))"
+        )
+        out = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True).stdout
+        self.assertEqual(out.strip(), '[]')
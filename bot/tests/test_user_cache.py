@@ -0,0 +1,63 @@
+from types import SimpleNamespace
+from unittest import mock
+
+from asgiref.sync import sync_to_async
+from django.test import TestCase
+
+from bot import moderation, user_cache
+from bot.management.commands.run_bot import Command
+from bot.models import TelegramUser, BlogPost
+from bot.tests.utils import FakeMessage
+
+
+class FakeQuery:
+    async def edit_message_text(self, text, **kwargs):
+        self.text = text
+
+
+class UserCacheTests(TestCase):
+    def setUp(self):
+        user_cache.USER_CACHE.clear()
+        self.addCleanup(user_cache.USER_CACHE.clear)
+        self.lin = TelegramUser.objects.create(telegram_id='101', first_name='Lin')
+
+    def command(self):
+        command = Command()
+        command.outbox = mock.Mock()
+        return command
+
+    async def cached(self):
+        return await sync_to_async(user_cache.get_user)(101)
+
+    def test_hit_skips_db(self):
+        self.assertFalse(user_cache.get_user(101).is_approved)
+        with self.assertNumQueries(0):
+            self.assertEqual(user_cache.get_user('101').first_name, 'Lin')
+
+    def test_save_drops_stale_entry(self):
+        user_cache.get_user(101)
+        self.lin.first_name = 'Lin Feng'
+        self.lin.save()
+        self.assertEqual(user_cache.get_user(101).first_name, 'Lin Feng')
+
+    async def test_approve_and_block(self):
+        await self.cached()
+        lin = await TelegramUser.objects.aget(id=self.lin.id)
+        await self.command().on_user_approve(SimpleNamespace(user=lin, query=FakeQuery()), None)
+        self.assertTrue((await self.cached()).is_approved)
+        await self.command().on_user_block(SimpleNamespace(user=lin, query=FakeQuery()), None)
+        self.assertFalse((await self.cached()).is_approved)
+
+    async def test_anonymous_toggle(self):
+        self.assertFalse((await self.cached()).is_anonymous_mode)
+        update = SimpleNamespace(effective_user=SimpleNamespace(id=101), message=FakeMessage())
+        await self.command().toggle_anon(update, None)
+        self.assertTrue((await self.cached()).is_anonymous_mode)
+        await self.command().toggle_anon(update, None)
+        self.assertFalse((await self.cached()).is_anonymous_mode)
+
+    def test_publish_bumps_post_count(self):
+        self.assertEqual(user_cache.get_user(101).post_count, 0)
+        post = BlogPost.objects.create(author=self.lin, content='scroll', status='PENDING')
+        moderation.publish_posts([post.id])
+        self.assertEqual(user_cache.get_user(101).post_count, 1)
@@ -0,0 +1,35 @@
+from django.test import TestCase, AsyncRequestFactory, override_settings
+
+from bot import feed, views
+from bot.models import TelegramUser, BlogPost
+from bot.tests.utils import plain_static, LOCMEM_CACHE
+
+
+@plain_static
+@override_settings(CACHES=LOCMEM_CACHE)
+class FeedViewTests(TestCase):
+    def setUp(self):
+        feed.invalidate_feed()
+        lin = TelegramUser.objects.create(telegram_id='101', first_name='Lin')
+        BlogPost.objects.create(author=lin, content='Morning practice #cultivation', status='PUBLISHED')
+        BlogPost.objects.create(author=lin, content='Quiet day', status='PUBLISHED')
+        BlogPost.objects.create(author=lin, content='Unsent #cultivation', status='DRAFT')
+
+    def test_sync_views(self):
+        # Default (WSGI) profile par urls sync views lagate hain
+        self.assertContains(self.client.get('/', HTTP_HOST='localhost'), 'Quiet day')
+        response = self.client.get('/tag/cultivation/', HTTP_HOST='localhost')
+        self.assertContains(response, 'Morning practice')
+        self.assertNotContains(response, 'Quiet day')
+        self.assertNotContains(response, 'Unsent')
+
+    async def test_async_variants(self):
+        factory = AsyncRequestFactory()
+        response = await views.home_async(factory.get('/'))
+        self.assertContains(response, 'Quiet day')
+        response = await views.home_async(factory.get('/', {'q': 'morning'}))
+        self.assertContains(response, 'Morning practice')
+        self.assertNotContains(response, 'Quiet day')
+        response = await views.tag_view_async(factory.get('/tag/cultivation/'), 'cultivation')
+        self.assertContains(response, 'Morning practice')
+        self.assertNotContains(response, 'Unsent')
@@ -0,0 +1,27 @@
+from django.conf import settings
+from django.test import override_settings
+
+# Tests me Tailwind build/collectstatic nahi hota, isliye manifest ke bina static URLs
+plain_static = override_settings(STORAGES={
+    **settings.STORAGES,
+    'staticfiles': {'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage'},
+})
+
+
+
+def file_cache(location):
+    # Shared backend: alag processes (bot + web) ke alag cache instances ek hi jagah padhte hain
+    return {'default': {'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache', 'LOCATION': location}}
+
+
+LOCMEM_CACHE = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'bot-tests'}}
+
+
+class FakeMessage:
+    """update.message jaisa: handler ke replies record karta hai."""
+
+    def __init__(self):
+        self.replies = []
+
+    async def reply_text(self, text, **kwargs):
+        self.replies.append(text)
@@ -0,0 +1,107 @@
+import json
+import logging
+import random
+import time
+import functools
+import contextvars
+
+from decouple import config
+from django.db.backends.signals import connection_created
+from telegram.request import HTTPXRequest
+
+# =====================================================
+# HANDLER TRACING (structured JSON log lines)
+# =====================================================
+# Har traced handler ke liye ek line: total time, DB time + query count, Telegram API
+# time + call count, error class. Sab measure hota hai (sasta hai), log sirf sampled /
+# slow / failed calls ka hota hai.
+
+logger = logging.getLogger('chatpress.trace')
+
+TRACE_SAMPLE_RATE = config('TRACE_SAMPLE_RATE', default=0.1, cast=float)
+TRACE_SLOW_MS = config('TRACE_SLOW_MS', default=1000, cast=float)
+
+_current = contextvars.ContextVar('chatpress_trace', default=None)
+
+
+class Trace:
+    __slots__ = ('name', 'db_ms', 'db_queries', 'api_ms', 'api_calls')
+
+    def __init__(self, name):
+        self.name = name
+        self.db_ms = 0.0
+        self.db_queries = 0
+        self.api_ms = 0.0
+        self.api_calls = 0
+
+
+def rename(name):
+    """Current trace ka naam badlo (e.g. handle_button -> button.viewpost)."""
+    trace = _current.get()
+    if trace is not None:
+        trace.name = name
+
+
+def traced(fn):
+    """Async handler decorator. sync_to_async context copy karta hai, isliye ORM time bhi isi trace me judta hai."""
+    @functools.wraps(fn)
+    async def wrapper(*args, **kwargs):
+        trace = Trace(fn.__name__)
+        token = _current.set(trace)
+        start = time.perf_counter()
+        error = None
+        try:
+            return await fn(*args, **kwargs)
+        except Exception as e:
+            error = e.__class__.__name__
+            raise
+        finally:
+            _current.reset(token)
+            duration_ms = (time.perf_counter() - start) * 1000
+            if error or duration_ms >= TRACE_SLOW_MS or random.random() < TRACE_SAMPLE_RATE:
+                logger.info(json.dumps({
+                    'event': 'handler',
+                    'handler': trace.name,
+                    'duration_ms': round(duration_ms, 1),
+                    'db_ms': round(trace.db_ms, 1),
+                    'db_queries': trace.db_queries,
+                    'api_ms': round(trace.api_ms, 1),
+                    'api_calls': trace.api_calls,
+                    'error': error,
+                }))
+    return wrapper
+
+
+# --- DB timing (har connection par execute wrapper) ---
+def _db_wrapper(execute, sql, params, many, context):
+    trace = _current.get()
+    if trace is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        trace.db_ms += (time.perf_counter() - start) * 1000
+        trace.db_queries += 1
+
+
+def _install_db_wrapper(sender, connection, **kwargs):
+    if _db_wrapper not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_db_wrapper)
+
+
+connection_created.connect(_install_db_wrapper)
+
+
+# --- Telegram API timing ---
+class TracedRequest(HTTPXRequest):
+    async def do_request(self, *args, **kwargs):
+        trace = _current.get()
+        if trace is None:
+            return await super().do_request(*args, **kwargs)
+        start = time.perf_counter()
+        try:
+            return await super().do_request(*args, **kwargs)
+        finally:
+            trace.api_ms += (time.perf_counter() - start) * 1000
+            trace.api_calls += 1
@@ -0,0 +1,289 @@
+import asyncio
+import ipaddress
+import logging
+import socket
+from html.parser import HTMLParser
+from urllib.parse import urljoin, urlsplit
+
+from asgiref.sync import sync_to_async
+from decouple import config
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.utils import timezone
+
+from . import metrics
+from .models import BlogPost, LinkPreview
+from .previews import extract_urls
+
+logger = logging.getLogger(__name__)
+
+# =====================================================
+# LINK PREVIEWS (Open Graph unfurl)
+# =====================================================
+# Approve/publish ke baad bot background me post ke links fetch karta hai (title,
+# description, thumbnail) aur LinkPreview table me rakhta hai. Feed kabhi bahar request
+# nahi karta, sirf DB se card render karta hai (templatetags render_links, bot.previews).
+# httpx/httpcore sirf fetch paths me import hote hain: jobs/commands ka startup halka rahe.
+
+UNFURL_TIMEOUT = config('UNFURL_TIMEOUT', default=5, cast=float)
+UNFURL_MAX_BYTES = config('UNFURL_MAX_BYTES', default=512 * 1024, cast=int)  # HTML (sirf <head> chahiye)
+UNFURL_MAX_IMAGE_BYTES = config('UNFURL_MAX_IMAGE_BYTES', default=2 * 1024 * 1024, cast=int)
+UNFURL_CONCURRENCY = config('UNFURL_CONCURRENCY', default=4, cast=int)
+UNFURL_TTL_DAYS = config('UNFURL_TTL_DAYS', default=30, cast=int)  # Iske baad preview dobara fetch
+UNFURL_RETRY_HOURS = config('UNFURL_RETRY_HOURS', default=24, cast=int)  # Failed URL ka dobara try
+# Private/loopback IPs block hain (SSRF). Sirf default hai; Unfurler(allow_private=...) se override
+UNFURL_ALLOW_PRIVATE = config('UNFURL_ALLOW_PRIVATE', default=False, cast=bool)
+
+MAX_REDIRECTS = 3
+USER_AGENT = 'ChatPressBot/1.0 (+link preview)'
+
+HTML_TYPES = {'text/html', 'application/xhtml+xml'}
+# SVG nahi: hamare domain se serve hoke script chala sakta hai
+IMAGE_TYPES = {'image/jpeg': '.jpg', 'image/png': '.png', 'image/gif': '.gif', 'image/webp': '.webp'}
+
+
+class UnfurlError(Exception):
+    pass
+
+
+# --- DB side (sync, sync_to_async se chalte hain) ---
+def pending_urls(post_ids):
+    """Published posts ke woh URLs jinka preview abhi table me nahi hai."""
+    urls = []
+    contents = BlogPost.objects.filter(id__in=post_ids, status='PUBLISHED').values_list('content', flat=True)
+    for content in contents:
+        urls += [url for url in extract_urls(content) if url not in urls]
+    known = set(LinkPreview.objects.filter(url__in=urls).values_list('url', flat=True))
+    return [url for url in urls if url not in known]
+
+
+def save_preview(url, meta, thumbnail=None):
+    # meta None = fetch fail; row phir bhi banti hai taaki UNFURL_RETRY_HOURS tak dobara try na ho
+    if meta is None and LinkPreview.objects.filter(url=url, ok=True).update(fetched_at=timezone.now()):
+        return LinkPreview.objects.get(url=url)  # Refresh fail: purana card rehne do (agle TTL par phir try)
+    defaults = {'ok': meta is not None, 'fetched_at': timezone.now(), 'title': '', 'description': '', 'site_name': '', 'image': None}
+    if meta:
+        defaults.update(
+            title=meta['title'][:300],
+            description=meta['description'][:1000],
+            site_name=meta['site_name'][:100],
+        )
+    if thumbnail:
+        data, ext = thumbnail
+        defaults['image'] = default_storage.save(f"previews/thumb{ext}", ContentFile(data))
+    return LinkPreview.objects.update_or_create(url=url, defaults=defaults)[0]
+
+
+# --- Fetching ---
+def _check_url(url):
+    parts = urlsplit(url)
+    if parts.scheme not in ('http', 'https') or not parts.hostname:
+        raise UnfurlError(f"unsupported URL {url!r}")
+
+
+async def resolve_address(host, port, allow_private=False):
+    """Host -> connect karne layak IP. Koi bhi resolved address non-public ho to UnfurlError."""
+    infos = await asyncio.get_running_loop().getaddrinfo(host, port, type=socket.SOCK_STREAM)
+    if not infos:
+        raise UnfurlError(f"{host} did not resolve")
+    addresses = [info[4][0] for info in infos]
+    if not allow_private:
+        for address in addresses:
+            ip = ipaddress.ip_address(address.split('%')[0])
+            if not ip.is_global:
+                raise UnfurlError(f"{host} resolves to non-public address {ip}")
+    return addresses[0]
+
+
+async def _get(client, url, max_bytes, accept, truncate=False):
+    """GET with manual redirects (har hop par host check) aur size cap. Returns (final_url, content_type, body, charset)."""
+    for _ in range(MAX_REDIRECTS + 1):
+        _check_url(url)
+        async with client.stream('GET', url, headers={'Accept': accept}) as resp:
+            if resp.is_redirect:
+                url = urljoin(url, resp.headers.get('location', ''))
+                continue
+            resp.raise_for_status()
+            ctype = resp.headers.get('content-type', '').split(';')[0].strip().lower()
+            if not truncate and int(resp.headers.get('content-length') or 0) > max_bytes:
+                raise UnfurlError(f"{url} is larger than {max_bytes} bytes")
+
+            body = bytearray()
+            async for chunk in resp.aiter_bytes():
+                body += chunk
+                if len(body) > max_bytes:
+                    if not truncate:
+                        raise UnfurlError(f"{url} is larger than {max_bytes} bytes")
+                    del body[max_bytes:]
+                    break
+            return str(resp.url), ctype, bytes(body), resp.charset_encoding
+    raise UnfurlError(f"too many redirects for {url}")
+
+
+class _StopParsing(Exception):
+    pass
+
+
+class _MetaParser(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.meta = {}
+        self.title = ''
+        self._in_title = False
+
+    def handle_starttag(self, tag, attrs):
+        if tag == 'meta':
+            attrs = dict(attrs)
+            key = (attrs.get('property') or attrs.get('name') or '').lower()
+            if key and attrs.get('content') and key not in self.meta:
+                self.meta[key] = attrs['content'].strip()
+        elif tag == 'title':
+            self._in_title = True
+
+    def handle_endtag(self, tag):
+        if tag == 'title':
+            self._in_title = False
+        elif tag == 'head':
+            raise _StopParsing  # Body parse karne ki zarurat nahi
+
+    def handle_data(self, data):
+        if self._in_title:
+            self.title += data
+
+
+def parse_preview(html, base_url):
+    """HTML -> {'title', 'description', 'site_name', 'image_url'} (ya None agar kuch kaam ka nahi)."""
+    parser = _MetaParser()
+    try:
+        parser.feed(html)
+        parser.close()
+    except _StopParsing:
+        pass
+    meta = parser.meta
+
+    def first(*keys):
+        return next((meta[k] for k in keys if meta.get(k)), '')
+
+    title = first('og:title', 'twitter:title') or ' '.join(parser.title.split())
+    description = first('og:description', 'twitter:description', 'description')
+    if not title and not description:
+        return None
+    image = first('og:image', 'og:image:url', 'twitter:image')
+    return {
+        'title': title,
+        'description': description,
+        'site_name': first('og:site_name') or urlsplit(base_url).hostname or '',
+        'image_url': urljoin(base_url, image) if image else '',
+    }
+
+
+async def fetch_preview(client, url):
+    """URL -> (meta, thumbnail (bytes, ext) | None). Fail par UnfurlError / httpx / OS errors."""
+    final_url, ctype, body, charset = await _get(client, url, UNFURL_MAX_BYTES, 'text/html,application/xhtml+xml', truncate=True)
+    if ctype not in HTML_TYPES:
+        raise UnfurlError(f"{url} is not HTML ({ctype or 'no content-type'})")
+    try:
+        html = body.decode(charset or 'utf-8', errors='replace')
+    except LookupError:  # Ajeeb charset header
+        html = body.decode('utf-8', errors='replace')
+
+    meta = parse_preview(html, final_url)
+    if meta is None:
+        raise UnfurlError(f"{url} has no title/description")
+
+    thumbnail = None
+    if meta['image_url']:
+        # Thumbnail na mile to bhi preview chalega
+        import httpx
+        try:
+            _, itype, data, _ = await _get(client, meta['image_url'], UNFURL_MAX_IMAGE_BYTES, 'image/*')
+            if itype in IMAGE_TYPES and data:
+                thumbnail = (data, IMAGE_TYPES[itype])
+        except (UnfurlError, httpx.HTTPError, OSError) as e:
+            logger.info("Unfurl thumbnail skipped for %s: %s", url, e)
+    return meta, thumbnail
+
+
+class Unfurler:
+    """
+    Background link preview worker pool (Outbox ki tarah run_bot ke event loop par).
+
+    `submit(post_ids)` turant return karta hai; workers ek shared pooled httpx client
+    se URLs fetch karte hain (strict timeouts, size caps) aur result DB me likhte hain.
+    """
+
+    def __init__(self, concurrency=UNFURL_CONCURRENCY, allow_private=UNFURL_ALLOW_PRIVATE):
+        self.concurrency = concurrency
+        self.allow_private = allow_private
+        self._client = None
+        self._queue = None
+        self._workers = []
+        self._inflight = set()
+
+    def start(self):
+        import httpx
+        from .unfurl_transport import GuardedTransport
+
+        self._client = httpx.AsyncClient(
+            transport=GuardedTransport(
+                self.allow_private, max_connections=self.concurrency * 2, max_keepalive_connections=self.concurrency,
+            ),
+            timeout=httpx.Timeout(UNFURL_TIMEOUT, connect=min(3.0, UNFURL_TIMEOUT)),
+            headers={'User-Agent': USER_AGENT},
+            follow_redirects=False,  # Redirects khud follow karte hain (har hop par SSRF check)
+        )
+        self._queue = asyncio.Queue()
+        self._workers = [asyncio.create_task(self._run()) for _ in range(self.concurrency)]
+
+    async def stop(self):
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        if self._client:
+            await self._client.aclose()
+            self._client = None
+
+    def submit(self, post_ids):
+        if self._queue is not None and post_ids:
+            self._queue.put_nowait(list(post_ids))
+
+    def refresh(self, urls):
+        """Expired/failed previews dobara fetch karo (cleanup job se)."""
+        if self._queue is None:
+            return
+        for url in urls:
+            if url not in self._inflight:
+                self._inflight.add(url)
+                self._queue.put_nowait(url)
+
+    async def _run(self):
+        while True:
+            item = await self._queue.get()
+            try:
+                if isinstance(item, list):
+                    # Post ids -> naye URLs, har URL alag queue item (workers me parallel)
+                    for url in await sync_to_async(pending_urls)(item):
+                        if url not in self._inflight:
+                            self._inflight.add(url)
+                            self._queue.put_nowait(url)
+                else:
+                    await self.unfurl(item)
+            except Exception:
+                logger.exception("Unfurl worker error")
+            finally:
+                if isinstance(item, str):
+                    self._inflight.discard(item)
+                self._queue.task_done()
+
+    async def unfurl(self, url):
+        import httpx
+        try:
+            # Per-request timeouts ke upar ek overall deadline (slow drip servers ke liye)
+            meta, thumbnail = await asyncio.wait_for(fetch_preview(self._client, url), UNFURL_TIMEOUT * 2)
+            metrics.incr('unfurl.ok')
+        except (UnfurlError, httpx.HTTPError, OSError, asyncio.TimeoutError) as e:
+            logger.info("Unfurl failed for %s: %s", url, str(e) or e.__class__.__name__)
+            metrics.incr('unfurl.failed')
+            meta, thumbnail = None, None
+        return await sync_to_async(save_preview)(url, meta, thumbnail)
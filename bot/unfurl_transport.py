@@ -0,0 +1,100 @@
+import contextlib
+
+import httpcore
+import httpx
+
+from .unfurl import UnfurlError, resolve_address
+
+# =====================================================
+# SSRF-PINNED HTTP TRANSPORT (sirf bot.unfurl fetch paths import karte hain)
+# =====================================================
+# httpx network backend ka option nahi deta, isliye httpcore ka public
+# AsyncConnectionPool(network_backend=...) khud banate hain aur httpx.AsyncClient ko
+# ek chhota transport adapter dete hain (httpx ke AsyncHTTPTransport jaisa).
+
+
+class GuardedBackend(httpcore.AsyncNetworkBackend):
+    """
+    Har TCP connect se pehle DNS resolve + check, aur connect usi checked IP par.
+
+    Alag se check karke phir httpx ko hostname dene par DNS dobara resolve hota
+    (DNS rebinding). TLS SNI/cert aur Host header phir bhi hostname hi rehte hain.
+    """
+
+    def __init__(self, allow_private=False):
+        self.allow_private = allow_private
+        self._backend = httpcore.AnyIOBackend()
+
+    async def connect_tcp(self, host, port, timeout=None, local_address=None, socket_options=None):
+        address = await resolve_address(host, port, self.allow_private)
+        return await self._backend.connect_tcp(
+            address, port, timeout=timeout, local_address=local_address, socket_options=socket_options
+        )
+
+    async def connect_unix_socket(self, path, timeout=None, socket_options=None):
+        raise UnfurlError("unix sockets are not allowed")
+
+    async def sleep(self, seconds):
+        await self._backend.sleep(seconds)
+
+
+@contextlib.contextmanager
+def _httpx_errors():
+    # httpcore errors -> httpx errors (callers sirf httpx.HTTPError pakadte hain)
+    try:
+        yield
+    except httpcore.TimeoutException as e:
+        raise httpx.TimeoutException(str(e)) from e
+    except (httpcore.NetworkError, httpcore.ProtocolError, httpcore.UnsupportedProtocol, httpcore.ProxyError) as e:
+        raise httpx.TransportError(str(e)) from e
+
+
+class _ResponseStream(httpx.AsyncByteStream):
+    def __init__(self, stream):
+        self._stream = stream
+
+    async def __aiter__(self):
+        with _httpx_errors():
+            async for part in self._stream:
+                yield part
+
+    async def aclose(self):
+        await self._stream.aclose()
+
+
+class GuardedTransport(httpx.AsyncBaseTransport):
+    """httpx transport jiske saare connections GuardedBackend se bante hain (HTTP/1.1, no proxy)."""
+
+    def __init__(self, allow_private=False, max_connections=10, max_keepalive_connections=5):
+        self.network_backend = GuardedBackend(allow_private)
+        self.pool = httpcore.AsyncConnectionPool(
+            ssl_context=httpx.create_ssl_context(),
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            network_backend=self.network_backend,
+        )
+
+    async def handle_async_request(self, request):
+        req = httpcore.Request(
+            method=request.method,
+            url=httpcore.URL(
+                scheme=request.url.raw_scheme,
+                host=request.url.raw_host,
+                port=request.url.port,
+                target=request.url.raw_path,
+            ),
+            headers=request.headers.raw,
+            content=request.stream,
+            extensions=request.extensions,
+        )
+        with _httpx_errors():
+            resp = await self.pool.handle_async_request(req)
+        return httpx.Response(
+            status_code=resp.status,
+            headers=resp.headers,
+            stream=_ResponseStream(resp.stream),
+            extensions=resp.extensions,
+        )
+
+    async def aclose(self):
+        await self.pool.aclose()
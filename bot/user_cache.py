@@ -0,0 +1,53 @@
+from dataclasses import dataclass
+
+from decouple import config
+
+from .cache import TTLCache
+from .models import TelegramUser
+
+# =====================================================
+# TELEGRAM USER CACHE (bot handlers ka hot path)
+# =====================================================
+# Har message par Neon tak round trip na ho: handlers ko jo chahiye (approved, anon,
+# rank) woh yahan se milta hai. Approve/block/anon/post_count change par invalidate.
+
+
+@dataclass(frozen=True)
+class CachedUser:
+    id: int
+    telegram_id: str
+    first_name: str
+    is_approved: bool
+    is_anonymous_mode: bool
+    post_count: int
+    rank: str
+
+
+USER_CACHE = TTLCache(
+    maxsize=config('USER_CACHE_SIZE', default=2048, cast=int),
+    ttl=config('USER_CACHE_TTL', default=300, cast=int),
+)
+
+
+def get_user(telegram_id):
+    """CachedUser for this telegram_id (DB hit only on miss), ya None agar user nahi hai."""
+    key = str(telegram_id)
+    cached = USER_CACHE.get(key)
+    if cached is not None:
+        return cached
+    try:
+        u = TelegramUser.objects.get(telegram_id=key)
+    except TelegramUser.DoesNotExist:
+        return None  # Negative cache nahi: /start ke baad turant dikhna chahiye
+    cached = CachedUser(
+        id=u.id, telegram_id=u.telegram_id, first_name=u.first_name,
+        is_approved=u.is_approved, is_anonymous_mode=u.is_anonymous_mode,
+        post_count=u.post_count, rank=u.get_rank(),
+    )
+    USER_CACHE.set(key, cached)
+    return cached
+
+
+def invalidate(*telegram_ids):
+    for telegram_id in telegram_ids:
+        USER_CACHE.delete(str(telegram_id))
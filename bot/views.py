@@ -1,29 +1,127 @@
+from decouple import config
 from django.shortcuts import render
-from .models import BlogPost
-from django.db.models import Q
+from django.http import JsonResponse, HttpResponse, Http404
+from django.core.paginator import Paginator
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
+from .models import BlogPost, ArchivedPost, SitemapChunk
+from .search import search_posts, match_q, SEARCH_MAX_RESULTS
+from .sitemap import sitemap_index_xml
+from .previews import preview_queryset
+from .feed import home_feed, ahome_feed, feed_queryset
+from core.db_router import read_from_replica
 
+# Permalink pages crawlers ke liye: server par cache nahi (delete/edit turant dikhe),
+# Last-Modified se 304 + chhota Cache-Control
+PERMALINK_CACHE_SECONDS = config('PERMALINK_CACHE_SECONDS', default=60, cast=int)
+SITEMAP_CACHE_SECONDS = config('SITEMAP_CACHE_SECONDS', default=3600, cast=int)
+
+def _tag_queryset(tag_name):
+    # Case insensitive search for tag
+    return BlogPost.objects.filter(
+        status='PUBLISHED', 
+        content__icontains=f"#{tag_name}"
+    ).select_related('author').order_by('-created_at')
+
+# Sync views: default WSGI (gthread) profile. ASGI profile par core/urls.py neeche
+# waale async variants lagata hai (WSGI par async view har request me event loop banata).
+
+@read_from_replica
 def home(request):
-    # Pinned posts sabse upar, fir baaki latest posts
     query = request.GET.get('q') # Search box se text
-    posts = BlogPost.objects.filter(status='PUBLISHED')
+    if not query:
+        # Plain feed: cache se (bot ka warm-up job ise bhara rakhta hai)
+        posts, previews = home_feed()
+    else:
+        # Search in Content or Author Name (anonymous posts sirf content se)
+        posts = list(feed_queryset().filter(match_q(query)))
+        # Link preview cards: sirf DB se, request ke time koi bahar fetch nahi
+        previews = {p.url: p for p in preview_queryset(posts)}
+    return render(request, 'home.html', {'posts': posts, 'query': query, 'previews': previews})
 
-    if query:
-        # Search in Content, Author Name, or Rank
-        posts = posts.filter(
-            Q(content__icontains=query) | 
-            Q(author__first_name__icontains=query) |
-            Q(author__username__icontains=query)
-        )
+@read_from_replica
+def tag_view(request, tag_name):
+    posts = list(_tag_queryset(tag_name))
+    previews = {p.url: p for p in preview_queryset(posts)}
+    return render(request, 'home.html', {'posts': posts, 'current_tag': tag_name, 'previews': previews})
 
-    posts = posts.order_by('-is_pinned', '-created_at')
-    return render(request, 'home.html', {'posts': posts, 'query': query})
+@read_from_replica
+async def home_async(request):
+    query = request.GET.get('q')
+    if not query:
+        posts, previews = await ahome_feed()
+    else:
+        # Async view: template ke andar lazy query nahi chal sakti, isliye yahin list bana lo
+        posts = [post async for post in feed_queryset().filter(match_q(query))]
+        previews = {p.url: p async for p in preview_queryset(posts)}
+    return render(request, 'home.html', {'posts': posts, 'query': query, 'previews': previews})
 
-def tag_view(request, tag_name):
-    # Case insensitive search for tag
-    posts = BlogPost.objects.filter(
-        status='PUBLISHED', 
-        content__icontains=f"#{tag_name}"
-    ).order_by('-created_at')
-    
-    return render(request, 'home.html', {'posts': posts, 'current_tag': tag_name})
+@read_from_replica
+async def tag_view_async(request, tag_name):
+    posts = [post async for post in _tag_queryset(tag_name)]
+    previews = {p.url: p async for p in preview_queryset(posts)}
+    return render(request, 'home.html', {'posts': posts, 'current_tag': tag_name, 'previews': previews})
+
+@read_from_replica
+def search_api(request):
+    # Search-as-you-type: poora page nahi, sirf chhota JSON payload
+    query = request.GET.get('q', '')[:100]
+    try:
+        limit = int(request.GET.get('limit', SEARCH_MAX_RESULTS))
+    except ValueError:
+        limit = SEARCH_MAX_RESULTS
+
+    results = search_posts(query, limit)
+    return JsonResponse({'query': query, 'results': results})
+
+@read_from_replica
+def archive_view(request):
+    # Purane scrolls: alag table, apni pagination (feed ki tarah live refresh nahi)
+    posts = ArchivedPost.objects.select_related('author').order_by('-created_at')
+    page = Paginator(posts, 20).get_page(request.GET.get('page'))
+    previews = {p.url: p for p in preview_queryset(page)}
+    return render(request, 'home.html', {'posts': page, 'page_obj': page, 'archive': True, 'previews': previews})
+
+@read_from_replica
+def post_detail(request, post_id):
+    # Ek post ka permalink: live published post, warna archive me (same id)
+    post = BlogPost.objects.filter(id=post_id, status='PUBLISHED').select_related('author').first()
+    if post is None:
+        post = ArchivedPost.objects.filter(original_id=post_id).select_related('author').first()
+    if post is None:
+        raise Http404("Scroll not found")
+    previews = {p.url: p for p in preview_queryset([post])}
+    # Page tab badalta hai jab post edit ho ya uska preview dobara fetch ho
+    changed = [post.updated_at or post.created_at, *(p.fetched_at for p in previews.values())]
+    last_modified = int(max(changed).timestamp())
+    response = get_conditional_response(request, last_modified=last_modified)
+    if response is None:
+        response = render(request, 'post.html', {'post': post, 'post_id': post_id, 'previews': previews})
+    response['Last-Modified'] = http_date(last_modified)
+    patch_cache_control(response, public=True, max_age=PERMALINK_CACHE_SECONDS)
+    return response
+
+@read_from_replica
+def sitemap_index(request):
+    # Sirf stored chunks ki list: request par koi post query nahi
+    response = HttpResponse(sitemap_index_xml(), content_type='application/xml')
+    patch_cache_control(response, public=True, max_age=SITEMAP_CACHE_SECONDS)
+    return response
+
+@read_from_replica
+def sitemap_chunk(request, index):
+    chunk = SitemapChunk.objects.filter(index=index).only('xml', 'updated_at').first()
+    if chunk is None:
+        raise Http404("No such sitemap")
+    last_modified = int(chunk.updated_at.timestamp())
+    # If-Modified-Since same ho to 304 (crawler dobara poora XML nahi khichta)
+    response = get_conditional_response(request, last_modified=last_modified)
+    if response is None:
+        response = HttpResponse(chunk.xml, content_type='application/xml')
+    response['Last-Modified'] = http_date(last_modified)
+    patch_cache_control(response, public=True, max_age=SITEMAP_CACHE_SECONDS)
+    return response
 
+def robots_txt(request):
+    sitemap_url = request.build_absolute_uri('/sitemap.xml')
+    return HttpResponse(f"User-agent: *\nDisallow: /admin/\nDisallow: /api/\nSitemap: {sitemap_url}\n", content_type='text/plain')
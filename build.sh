@@ -1,5 +1,15 @@
 #!/usr/bin/env bash
 set -o errexit
 pip install -r requirements.txt
+
+# Tailwind: CDN runtime ki jagah purged + minified CSS (standalone CLI, Node nahi chahiye)
+TAILWIND_VERSION=v3.4.17
+if [ ! -x ./tailwindcss ]; then
+  curl -sSLo tailwindcss "https://github.com/tailwindlabs/tailwindcss/releases/download/${TAILWIND_VERSION}/tailwindcss-linux-x64"
+  chmod +x tailwindcss
+fi
+./tailwindcss -c tailwind.config.js -i bot/static_src/realm.css -o bot/static/css/realm.css --minify
+
 python manage.py collectstatic --no-input
 python manage.py migrate
+python manage.py createcachetable  # DB_CACHE=True ke liye (warna kuch nahi karta)
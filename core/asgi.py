@@ -12,5 +12,6 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'core.settings')
+os.environ.setdefault('WEB_PROFILE', 'asgi')  # Async feed views (core/urls.py)
 
 application = get_asgi_application()
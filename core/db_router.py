@@ -0,0 +1,91 @@
+import time
+import functools
+import contextvars
+
+from asgiref.sync import iscoroutinefunction
+from decouple import config
+from django.conf import settings
+from django.core.cache import cache
+
+# =====================================================
+# READ REPLICA ROUTING
+# =====================================================
+# DATABASE_READ_URL set ho to DATABASES['replica'] banta hai. Sirf @read_from_replica
+# waale views (feed/tag/search) wahan se padhte hain; bot, admin, jobs hamesha primary.
+# Kisi bhi write ke baad REPLICA_STICKY_SECONDS tak reads primary par hi rehte hain
+# (replica lag ki wajah se apna naya post gayab na dikhe).
+#
+# Bot aur web alag processes hain: write ka time Django cache me jaata hai, isliye
+# cross-process stickiness ke liye CACHES me shared backend (Redis/DB) chahiye.
+
+REPLICA = 'replica'
+REPLICA_STICKY_SECONDS = config('REPLICA_STICKY_SECONDS', default=5, cast=float)
+LAST_WRITE_KEY = 'db:last_write'
+
+_read_alias = contextvars.ContextVar('chatpress_read_alias', default=None)
+_last_write = 0.0
+
+
+def _mark_write(model):
+    global _last_write
+    # DatabaseCache khud bhi router se write karta hai; usse recursion mat banao
+    if model._meta.app_label == 'django_cache':
+        return
+    now = time.time()
+    if now <= _last_write:
+        return  # Isse naya time pehle hi shared hai
+    _last_write = now
+    # Har write ka time share karo: throttle karte to second ke baaki writes doosre
+    # processes tak na pahunchte aur unki stickiness jaldi khatam ho jaati
+    cache.set(LAST_WRITE_KEY, now, timeout=int(REPLICA_STICKY_SECONDS) + 1)
+
+
+def _pick_alias(shared_last_write):
+    last = max(_last_write, shared_last_write or 0)
+    return 'default' if time.time() - last < REPLICA_STICKY_SECONDS else REPLICA
+
+
+def read_from_replica(view):
+    """View decorator: is request ke reads replica se (agar configured hai aur koi taaza write nahi)."""
+    if iscoroutinefunction(view):
+        @functools.wraps(view)
+        async def async_wrapper(request, *args, **kwargs):
+            if REPLICA not in settings.DATABASES:
+                return await view(request, *args, **kwargs)
+            token = _read_alias.set(_pick_alias(await cache.aget(LAST_WRITE_KEY)))
+            try:
+                return await view(request, *args, **kwargs)
+            finally:
+                _read_alias.reset(token)
+        return async_wrapper
+
+    @functools.wraps(view)
+    def wrapper(request, *args, **kwargs):
+        if REPLICA not in settings.DATABASES:
+            return view(request, *args, **kwargs)
+        token = _read_alias.set(_pick_alias(cache.get(LAST_WRITE_KEY)))
+        try:
+            return view(request, *args, **kwargs)
+        finally:
+            _read_alias.reset(token)
+    return wrapper
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        if model._meta.app_label == 'django_cache':
+            return 'default'  # Cache table replica lag ke saath purana data na de
+        return _read_alias.get()  # None -> default
+
+    def db_for_write(self, model, **hints):
+        _mark_write(model)
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Dono aliases same data hain
+        if {obj1._state.db, obj2._state.db} <= {'default', REPLICA}:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return None
@@ -49,6 +49,7 @@ INSTALLED_APPS = [
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',
+    'bot.media.MediaMiddleware',  # /media/ files, baaki stack se pehle
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -98,6 +99,29 @@ else:
         }
     }
 
+# Optional read replica (Neon read replica, ya local test ke liye doosri sqlite file).
+# Feed/search views wahan se padhte hain, baaki sab primary se (core/db_router.py)
+DATABASE_READ_URL = config('DATABASE_READ_URL', default=None)
+
+if DATABASE_READ_URL:
+    DATABASES['replica'] = dj_database_url.parse(DATABASE_READ_URL, conn_max_age=0)
+    DATABASES['replica']['TEST'] = {'MIRROR': 'default'}
+    DATABASE_ROUTERS = ['core.db_router.ReplicaRouter']
+
+# Gunicorn profile (gunicorn.conf.py). ASGI par feed/tag ke async views lagte hain (core/urls.py)
+WEB_PROFILE = config('WEB_PROFILE', default='wsgi')
+ASYNC_VIEWS = WEB_PROFILE == 'asgi'
+
+# Shared cache: bot aur web dono processes ek hi cache dekhein (feed warm-up, replica
+# stickiness). DB_CACHE=True -> DatabaseCache isi database me (build.sh table banata hai)
+if config('DB_CACHE', default=False, cast=bool):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+            'LOCATION': 'django_cache',
+        }
+    }
+
 
 
 # Password validation
@@ -137,8 +161,36 @@ USE_TZ = True
 STATIC_URL = '/static/'
 
 STATIC_ROOT = os.path.join(BASE_DIR, 'staticfiles')
-# Compression aur Caching ke liye
-STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
+# Compression aur Caching ke liye (hashed names -> WhiteNoise 'immutable' 1 year cache headers,
+# Brotli package installed ho to .br files bhi banti hain)
+STORAGES = {
+    # Uploads sha256 naam se (dedupe + immutable URLs), bot/storage.py
+    'default': {'BACKEND': 'bot.storage.ContentAddressedStorage'},
+    # WhiteNoise manifest storage + check ki Tailwind build (css/realm.css) ho chuka hai
+    'staticfiles': {'BACKEND': 'bot.storage.BuiltManifestStaticFilesStorage'},
+}
+
+# User uploads (avatars/, posts/), bot.media.MediaMiddleware serve karta hai
+MEDIA_URL = '/media/'
+MEDIA_ROOT = config('MEDIA_ROOT', default=os.path.join(BASE_DIR, 'media'))
+
+# Logging: bot ke events + handler traces (JSON lines) console par
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'formatters': {
+        'plain': {'format': '%(asctime)s %(levelname)s %(name)s: %(message)s'},
+        'json': {'format': '%(message)s'},
+    },
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler', 'formatter': 'plain'},
+        'trace': {'class': 'logging.StreamHandler', 'formatter': 'json'},
+    },
+    'loggers': {
+        'bot': {'handlers': ['console'], 'level': config('LOG_LEVEL', default='INFO')},
+        'chatpress.trace': {'handlers': ['trace'], 'level': 'INFO', 'propagate': False},
+    },
+}
 
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.0/ref/settings/#default-auto-field
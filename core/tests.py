@@ -0,0 +1,188 @@
+import time
+from types import SimpleNamespace
+from unittest import mock
+
+from asgiref.sync import async_to_sync
+from django.db import connections
+from django.test import SimpleTestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from core import db_router
+from core.db_router import ReplicaRouter, read_from_replica, LAST_WRITE_KEY, REPLICA
+from bot.models import BlogPost, TelegramUser
+from bot.tests.utils import plain_static, LOCMEM_CACHE
+
+WITH_REPLICA = SimpleNamespace(DATABASES={'default': {}, REPLICA: {}})
+WITHOUT_REPLICA = SimpleNamespace(DATABASES={'default': {}})
+
+
+def databases(fake_settings):
+    # DATABASE_READ_URL set/unset jaisa (router sirf settings.DATABASES ki keys dekhta hai)
+    return mock.patch.object(db_router, 'settings', fake_settings)
+
+
+class FakeSharedCache:
+    """Shared cache ki jagah dict (cross-process write ka simulation)."""
+
+    def __init__(self):
+        self.data = {}
+
+    def get(self, key, default=None):
+        return self.data.get(key, default)
+
+    async def aget(self, key, default=None):
+        return self.data.get(key, default)
+
+    def set(self, key, value, timeout=None):
+        self.data[key] = value
+
+
+class ReplicaRouterTests(SimpleTestCase):
+    def setUp(self):
+        self.router = ReplicaRouter()
+        self.cache = FakeSharedCache()
+        patcher = mock.patch.object(db_router, 'cache', self.cache)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        # Purane writes ka asar na rahe
+        db_router._last_write = 0.0
+
+    def read_alias(self):
+        return self.router.db_for_read(BlogPost)
+
+    @databases(WITH_REPLICA)
+    def test_decorated_view_reads_from_replica(self):
+        seen = []
+        view = read_from_replica(lambda request: seen.append(self.read_alias()))
+        view(None)
+        self.assertEqual(seen, [REPLICA])
+        self.assertIsNone(self.read_alias())  # View ke bahar default (None)
+
+    @databases(WITH_REPLICA)
+    def test_async_view_reads_from_replica(self):
+        seen = []
+
+        async def view(request):
+            seen.append(self.read_alias())
+        async_to_sync(read_from_replica(view))(None)
+        self.assertEqual(seen, [REPLICA])
+        self.assertIsNone(self.read_alias())
+
+    @databases(WITH_REPLICA)
+    def test_sticky_after_local_write(self):
+        self.assertEqual(self.router.db_for_write(BlogPost), 'default')
+        seen = []
+        read_from_replica(lambda request: seen.append(self.read_alias()))(None)
+        self.assertEqual(seen, ['default'])
+
+    @databases(WITH_REPLICA)
+    def test_local_write_sticky_even_if_cache_lost(self):
+        # Cache evict/down ho jaaye to bhi apne process ka write time kaafi hai
+        self.router.db_for_write(BlogPost)
+        self.cache.data.clear()
+        seen = []
+        read_from_replica(lambda request: seen.append(self.read_alias()))(None)
+        self.assertEqual(seen, ['default'])
+
+    @databases(WITH_REPLICA)
+    def test_sticky_after_write_in_other_process(self):
+        # Bot ne abhi likha (shared cache me time), web process ne kuch nahi likha
+        self.cache.set(LAST_WRITE_KEY, time.time())
+        seen = []
+        read_from_replica(lambda request: seen.append(self.read_alias()))(None)
+        self.assertEqual(seen, ['default'])
+
+    @databases(WITH_REPLICA)
+    def test_every_write_is_shared(self):
+        # Ek second me kai writes: aakhri write ka time bhi doosre processes tak jaana chahiye
+        with mock.patch.object(db_router.time, 'time', side_effect=[1000.0, 1000.4, 1000.9]):
+            for _ in range(3):
+                self.router.db_for_write(BlogPost)
+        self.assertEqual(self.cache.get(LAST_WRITE_KEY), 1000.9)
+
+    @databases(WITH_REPLICA)
+    def test_replica_again_after_sticky_window(self):
+        self.router.db_for_write(BlogPost)
+        self.assertEqual(self.cache.get(LAST_WRITE_KEY), db_router._last_write)
+        past = time.time() - db_router.REPLICA_STICKY_SECONDS - 1
+        db_router._last_write = past
+        self.cache.set(LAST_WRITE_KEY, past)
+        seen = []
+        read_from_replica(lambda request: seen.append(self.read_alias()))(None)
+        self.assertEqual(seen, [REPLICA])
+
+    @databases(WITHOUT_REPLICA)
+    def test_no_replica_is_passthrough(self):
+        seen = []
+        view = read_from_replica(lambda request: seen.append(self.read_alias()) or 'ok')
+        self.assertEqual(view(None), 'ok')
+        self.assertEqual(seen, [None])
+        self.assertEqual(self.cache.data, {})  # Cache bhi nahi chhua
+
+    def test_cache_table_never_read_from_replica(self):
+        cache_model = type('CacheEntry', (), {'_meta': type('Meta', (), {'app_label': 'django_cache'})()})
+        token = db_router._read_alias.set(REPLICA)
+        try:
+            self.assertEqual(self.router.db_for_read(cache_model), 'default')
+            self.router.db_for_write(cache_model)
+            self.assertEqual(self.cache.data, {})  # Cache writes stickiness nahi badhate
+        finally:
+            db_router._read_alias.reset(token)
+
+
+@plain_static
+@override_settings(CACHES=LOCMEM_CACHE, DATABASE_ROUTERS=['core.db_router.ReplicaRouter'])
+class TwoDatabaseRoutingTests(TransactionTestCase):
+    """Asli doosra alias (DATABASE_READ_URL + TEST MIRROR jaisa): same test DB par alag connection."""
+
+    @classmethod
+    def setUpClass(cls):
+        # Test DB ban chuka hai: replica alias usi DB par doosra connection (runner ko iska pata nahi,
+        # isliye class attribute me nahi - setup se pehle yahin judta hai)
+        connections.settings[REPLICA] = {**connections['default'].settings_dict, 'TEST': {'MIRROR': 'default'}}
+        cls.databases = {'default', REPLICA}
+        super().setUpClass()
+
+    @classmethod
+    def tearDownClass(cls):
+        connections[REPLICA].close()
+        del connections[REPLICA]
+        del connections.settings[REPLICA]
+        super().tearDownClass()
+
+    def setUp(self):
+        lin = TelegramUser.objects.create(telegram_id='101', first_name='Lin')
+        BlogPost.objects.create(author=lin, content='Morning practice', status='PUBLISHED')
+        self.lin = lin
+
+    def forget_writes(self):
+        db_router._last_write = 0.0
+        db_router.cache.delete(LAST_WRITE_KEY)
+
+    def get_home(self):
+        with CaptureQueriesContext(connections['default']) as primary, \
+                CaptureQueriesContext(connections[REPLICA]) as replica:
+            response = self.client.get('/', HTTP_HOST='localhost')
+        return response, len(primary), len(replica)
+
+    def test_feed_reads_go_to_replica_without_recent_write(self):
+        self.forget_writes()
+        response, primary, replica = self.get_home()
+        self.assertContains(response, 'Morning practice')
+        self.assertEqual(primary, 0)
+        self.assertGreater(replica, 0)
+
+    def test_reads_after_write_go_to_default(self):
+        self.forget_writes()
+        BlogPost.objects.create(author=self.lin, content='Evening practice', status='PUBLISHED')
+        response, primary, replica = self.get_home()
+        self.assertContains(response, 'Evening practice')
+        self.assertGreater(primary, 0)
+        self.assertEqual(replica, 0)
+
+    def test_write_from_other_process_keeps_reads_on_default(self):
+        self.forget_writes()
+        db_router.cache.set(LAST_WRITE_KEY, time.time())  # Bot process ne abhi likha
+        response, primary, replica = self.get_home()
+        self.assertGreater(primary, 0)
+        self.assertEqual(replica, 0)
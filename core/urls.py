@@ -1,10 +1,22 @@
+from django.conf import settings
 from django.contrib import admin
 from django.urls import path
-from bot.views import home, tag_view  # <--- Import view tag_view
+from bot.views import home, tag_view, search_api, archive_view, post_detail, sitemap_index, sitemap_chunk, robots_txt  # <--- Import view tag_view
+from bot.views import home_async, tag_view_async
+
+# ASGI (uvicorn) profile par async feed views, WSGI par sync (wahan async view = har request ek event loop)
+if settings.ASYNC_VIEWS:
+    home, tag_view = home_async, tag_view_async
 
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('', home, name='home'),  # <--- Homepage link
     path('tag/<str:tag_name>/', tag_view, name='tag_view'), # New Route
+    path('api/search/', search_api, name='search_api'),  # Autocomplete JSON
+    path('archive/', archive_view, name='archive'),  # Old scrolls
+    path('p/<int:post_id>/', post_detail, name='post_detail'),  # Permalink (crawlers + sharing)
+    path('sitemap.xml', sitemap_index, name='sitemap_index'),
+    path('sitemap-<int:index>.xml', sitemap_chunk, name='sitemap_chunk'),
+    path('robots.txt', robots_txt, name='robots_txt'),
     # ... static media settings ...
 ]
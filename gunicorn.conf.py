@@ -0,0 +1,39 @@
+import decouple  # `config` naam gunicorn ki apni setting hai, isliye module import
+
+# =====================================================
+# GUNICORN PROFILES (Render web service)
+# =====================================================
+# Start command: `gunicorn` (ye file khud pick hoti hai)
+#   WEB_PROFILE=wsgi -> core.wsgi, gthread workers (default, purana setup)
+#   WEB_PROFILE=asgi -> core.asgi, uvicorn workers (async home/tag_view variants)
+# Render free/starter instance: 0.1-0.5 CPU, 512MB RAM -> kam workers, thoda threads.
+
+WEB_PROFILE = decouple.config('WEB_PROFILE', default='wsgi')
+
+bind = f"0.0.0.0:{decouple.config('PORT', default='8000')}"
+workers = decouple.config('WEB_CONCURRENCY', default=2, cast=int)
+
+if WEB_PROFILE == 'asgi':
+    wsgi_app = 'core.asgi:application'
+    worker_class = 'uvicorn_worker.UvicornWorker'
+else:
+    wsgi_app = 'core.wsgi:application'
+    worker_class = 'gthread'
+    threads = decouple.config('WEB_THREADS', default=4, cast=int)
+
+# Render ka load balancer connections reuse karta hai; idle keepalive usse chhota ho
+# to beech me connection band hota hai aur 502 aata hai
+keepalive = decouple.config('WEB_KEEPALIVE', default=75, cast=int)
+timeout = decouple.config('WEB_TIMEOUT', default=30, cast=int)
+graceful_timeout = 20
+
+# Memory leak / fragmentation se bachne ke liye workers ko time time par recycle karo
+max_requests = decouple.config('WEB_MAX_REQUESTS', default=1000, cast=int)
+max_requests_jitter = 100
+
+# App ek baar load karo, workers fork par memory share karein
+preload_app = True
+# Heartbeat file disk par nahi, RAM me (container disk slow hota hai)
+worker_tmp_dir = '/dev/shm'
+
+accesslog = decouple.config('WEB_ACCESS_LOG', default=None)
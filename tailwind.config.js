@@ -0,0 +1,11 @@
+/** Tailwind build config (build.sh isse purged + minified CSS banata hai) */
+module.exports = {
+  darkMode: 'class',
+  content: [
+    './bot/templates/**/*.html',
+    // render_links / render_tags Python strings me classes likhte hain
+    './bot/templatetags/**/*.py',
+  ],
+  theme: { extend: {} },
+  plugins: [],
+}